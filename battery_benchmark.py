@@ -0,0 +1,713 @@
+"""
+배터리 데이터 처리 벤치마크
+
+battery_data_processor의 처리 단계별 성능을 합성 데이터로 측정합니다.
+
+- 실제 폴더 구조와 같은 합성 PNE/Toyo 데이터셋 생성 (write_pne_tree, write_toyo_tree)
+- 파이프라인 단계별 실행 시간, 최대 RSS, 초당 처리 행 수 측정
+- 저장된 기준 결과(baseline JSON)와 비교
+- CSV 파서 백엔드(pandas / pyarrow / numeric) 로딩 속도 비교
+
+사용법:
+    python battery_benchmark.py --size small
+    python battery_benchmark.py --size medium --save-baseline baseline.json
+    python battery_benchmark.py --size medium --baseline baseline.json
+    python battery_benchmark.py --size medium --compare-csv-backends
+    python battery_benchmark.py --micro
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import battery_data_processor as bdp
+
+
+# ============================================================================
+# 합성 프로파일
+# ============================================================================
+
+def make_profile_frame(n_cycles=2000, points_per_cycle=5000, seed=0):
+    """
+    load_pne_profile_data() 출력 형태의 합성 프로파일 DataFrame 생성
+
+    사이클 길이는 points_per_cycle 주변에서 변하며, 10번째 사이클마다
+    저항 측정 사이클처럼 긴 사이클을 넣고 일부 값은 NaN으로 둡니다.
+    """
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(points_per_cycle // 2, points_per_cycle * 3 // 2, n_cycles)
+    lengths[::10] *= 4
+    n_rows = int(lengths.sum())
+
+    cycle = np.repeat(np.arange(1, n_cycles + 1), lengths)
+    time_s = np.cumsum(rng.uniform(0.5, 1.5, n_rows))
+    current = np.where(rng.random(n_rows) < 0.5, 1500.0, -2000.0) + rng.normal(0, 5, n_rows)
+    current[rng.integers(0, n_rows, n_rows // 10000 + 1)] = np.nan
+
+    return pd.DataFrame({
+        'time_s': time_s,
+        'Voltage_V': rng.uniform(3000, 4400, n_rows),
+        'Current_mA': current,
+        'EndState': rng.choice([0, 64, 78], n_rows),
+        'Cycle': cycle,
+    })
+
+
+# ============================================================================
+# 합성 데이터셋 (PNE / Toyo 폴더 트리)
+# ============================================================================
+
+# 데이터셋 크기 프리셋: 채널 수, 채널당 사이클 수, 스텝당 측정점 수
+DATASET_SIZES = {
+    'small': {'n_channels': 2, 'n_cycles': 60, 'points_per_step': 50},
+    'medium': {'n_channels': 4, 'n_cycles': 400, 'points_per_step': 150},
+    'large': {'n_channels': 8, 'n_cycles': 1000, 'points_per_step': 400},
+}
+
+_DATASET_INFO_FILE = 'dataset.json'
+_PNE_RAW_COLUMNS = 46
+_RPT_EVERY = 50
+_RESISTANCE_EVERY = 200
+_RESISTANCE_POINTS = 10_500
+
+
+def _cycle_kind(cycle):
+    """사이클 번호별 시험 종류 (기본 분류 규칙의 각 카테고리가 나오도록 배치)"""
+    if cycle <= 2:
+        return 'soc'
+    if cycle % _RESISTANCE_EVERY == _RESISTANCE_EVERY // 2:
+        return 'resistance'
+    if cycle % _RPT_EVERY == 0:
+        return 'rpt'
+    return 'aging'
+
+
+def _cycle_steps(kind, capacity, points):
+    """
+    사이클 하나의 스텝 구성 [(Condition, 전류 mA, 측정점 수, 시작/끝 전압 mV, 측정 간격 s)]
+    
+    Condition: 1 충전, 2 방전, 3 휴지
+    """
+    if kind == 'rpt':
+        c, v_low, v_high, dt = 0.2, 2800, 4400, 30
+    elif kind == 'resistance':
+        n = _RESISTANCE_POINTS // 4
+        return [(1, capacity, n, (3600, 3650), 0.1), (3, 0, n, (3650, 3640), 0.1),
+                (2, -capacity, n, (3640, 3590), 0.1), (3, 0, n, (3590, 3600), 0.1)]
+    else:
+        c, v_low, v_high, dt = 2.0, 3400, 4200, 5
+    return [(1, c * capacity, points, (v_low, v_high), dt),
+            (3, 0, points // 5 + 1, (v_high, v_high - 50), dt),
+            (2, -c * capacity, points, (v_high - 50, v_low), dt),
+            (3, 0, points // 5 + 1, (v_low, v_low + 50), dt)]
+
+
+def _pne_channel_rows(capacity, n_cycles, points, rng):
+    """
+    PNE 채널 하나의 SaveData / SaveEndData 원시 행 (정수 배열, 46열)
+    
+    단위는 실제 PNE 파일과 같습니다: 전압 µV, 전류 µA, 용량 µAh,
+    온도 m°C, 스텝 시간 1/100 s, 총 시간은 (일, 하루 내 1/100 s).
+    """
+    profile_parts, end_rows = [], []
+    index, total_cs = 0, 0
+    
+    for cycle in range(1, n_cycles + 1):
+        kind = _cycle_kind(cycle)
+        fade = 1 - 0.0002 * cycle
+        chg_cap = dchg_cap = 0.0
+        
+        for step, (condition, current, n, (v_start, v_end), dt) in enumerate(
+                _cycle_steps(kind, capacity, points), 1):
+            k = np.arange(n)
+            rows = np.zeros((n, _PNE_RAW_COLUMNS), dtype=np.int64)
+            step_cs = (k * dt * 100).astype(np.int64)
+            time_cs = total_cs + step_cs
+            voltage = np.linspace(v_start, v_end, n) + rng.normal(0, 1.0, n)
+            capacity_uah = np.abs(current) * fade * k * dt / 3600 * 1000
+            
+            rows[:, 0] = index + 1 + k
+            rows[:, 2] = condition
+            rows[:, 6] = {'soc': 78, 'rpt': 64}.get(kind, 0)
+            rows[-1, 6] = 64
+            rows[:, 7] = step
+            rows[:, 8] = np.round(voltage * 1000)
+            rows[:, 9] = np.round((current * fade + rng.normal(0, 0.5, n) * (current != 0)) * 1000)
+            rows[:, 10 if condition == 1 else 11] = np.round(capacity_uah) if condition != 3 else 0
+            rows[:, 17] = step_cs
+            rows[:, 18] = time_cs // (100 * 86400)
+            rows[:, 19] = time_cs % (100 * 86400)
+            rows[:, 21] = np.round((25 + rng.normal(0, 0.2, n)) * 1000)
+            rows[:, 27] = cycle
+            profile_parts.append(rows)
+            
+            if condition == 1:
+                chg_cap = capacity_uah[-1]
+            elif condition == 2:
+                dchg_cap = capacity_uah[-1]
+            
+            end = rows[-1].copy()
+            end[20] = 30_000 + rng.integers(0, 500)
+            end[24] = end[21]
+            end[45] = int(rows[:, 8].max())
+            end[14] = int(abs(current) * v_end / 1000) if condition == 1 else 0
+            end[15] = int(abs(current) * v_end / 1000) if condition == 2 else 0
+            end_rows.append(end)
+            
+            index += n
+            total_cs = int(time_cs[-1]) + dt * 100
+        
+        # Condition 8: 사이클 대표 용량 행 (SaveEndData에만 기록)
+        summary = end_rows[-1].copy()
+        summary[2] = 8
+        summary[10] = round(chg_cap)
+        summary[11] = round(dchg_cap)
+        end_rows.append(summary)
+    
+    return np.concatenate(profile_parts), np.array(end_rows)
+
+
+def _write_int_csv(path, rows):
+    """정수 배열을 헤더 없는 CSV로 저장"""
+    pd.DataFrame(rows).to_csv(path, header=False, index=False)
+
+
+def write_pne_tree(root, n_channels=2, n_cycles=60, points_per_step=50, capacity_mAh=4500,
+                   n_files=3, seed=0):
+    """
+    PNE 폴더 트리 생성
+    
+    root/Pattern/, root/M01Ch001[001]/Restore/SaveData0001.csv ... , SaveEndData.csv
+    
+    Returns:
+    --------
+    str : root (경로 이름에 용량을 넣어야 name_capacity()가 인식합니다)
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.join(root, 'Pattern'), exist_ok=True)
+    
+    for channel in range(1, n_channels + 1):
+        restore = os.path.join(root, f'M01Ch{channel:03d}[{channel:03d}]', 'Restore')
+        os.makedirs(restore, exist_ok=True)
+        
+        profile, end = _pne_channel_rows(capacity_mAh, n_cycles, points_per_step, rng)
+        for i, part in enumerate(np.array_split(profile, n_files), 1):
+            _write_int_csv(os.path.join(restore, f'SaveData{i:04d}.csv'), part)
+        _write_int_csv(os.path.join(restore, 'SaveEndData.csv'), end)
+    
+    return root
+
+
+def write_toyo_tree(root, n_channels=2, n_cycles=60, points_per_step=50, capacity_mAh=4500,
+                    seed=0):
+    """
+    Toyo 폴더 트리 생성
+    
+    root/1/capacity.log, root/1/cycle_00001.csv ... (사이클당 파일 하나)
+    """
+    rng = np.random.default_rng(seed)
+    columns = ['Date', 'Time', 'PassTime[Sec]', 'Voltage[V]', 'Current[mA]', 'Temp1[Deg]',
+               'Condition', 'Mode', 'Cycle', 'TotlCycle']
+    
+    for channel in range(1, n_channels + 1):
+        channel_path = os.path.join(root, str(channel))
+        os.makedirs(channel_path, exist_ok=True)
+        summary = []
+        
+        for cycle in range(1, n_cycles + 1):
+            fade = 1 - 0.0002 * cycle
+            parts = []
+            for condition, current, n, (v_start, v_end), dt in _cycle_steps(
+                    _cycle_kind(cycle), capacity_mAh, points_per_step):
+                parts.append(pd.DataFrame({
+                    'PassTime[Sec]': np.arange(n) * dt,
+                    'Voltage[V]': np.round((np.linspace(v_start, v_end, n)
+                                            + rng.normal(0, 1.0, n)) / 1000, 4),
+                    'Current[mA]': np.round(current * fade, 3),
+                    'Temp1[Deg]': np.round(25 + rng.normal(0, 0.2, n), 1),
+                    # Toyo Condition: 0 휴지, 1 충전, 2 방전
+                    'Condition': condition % 3,
+                }))
+            df = pd.concat(parts, ignore_index=True)
+            df.insert(0, 'Date', '2024/01/01')
+            df.insert(1, 'Time', '00:00:00')
+            df['Mode'] = 1
+            df['Cycle'] = 1
+            df['TotlCycle'] = cycle
+            df[columns].to_csv(os.path.join(channel_path, f'cycle_{cycle:05d}.csv'), index=False)
+            
+            summary.append({'TotlCycle': cycle, 'Condition': 2,
+                            'Cap[mAh]': round(capacity_mAh * fade + rng.normal(0, 1), 4),
+                            'Ocv': round(3.45 + rng.normal(0, 0.001), 4),
+                            'PeakTemp[Deg]': round(25 + rng.normal(0, 0.3), 1),
+                            'AveVolt[V]': round(3.7 + rng.normal(0, 0.001), 4)})
+        
+        pd.DataFrame(summary).to_csv(os.path.join(channel_path, 'capacity.log'), index=False)
+    
+    return root
+
+
+def make_dataset(root, size='small', cyclers=('PNE', 'Toyo'), seed=0, **overrides):
+    """
+    벤치마크용 PNE/Toyo 데이터셋 생성 (같은 설정으로 이미 만들어져 있으면 재사용)
+    
+    Parameters:
+    -----------
+    root : str
+        데이터셋 루트 (하위에 사이클러별 폴더 생성)
+    size : str
+        DATASET_SIZES 프리셋 이름
+    cyclers : tuple
+        생성할 사이클러 종류
+    overrides :
+        n_channels, n_cycles, points_per_step, capacity_mAh 덮어쓰기
+    
+    Returns:
+    --------
+    list of str : process_and_combine()에 넘길 경로 리스트
+    """
+    params = {**DATASET_SIZES[size], 'capacity_mAh': 4500, 'seed': seed, **overrides}
+    settings = {'params': params, 'cyclers': list(cyclers)}
+    info_path = os.path.join(root, _DATASET_INFO_FILE)
+    
+    paths = [os.path.join(root, f'BENCH_{cycler}_{params["capacity_mAh"]}mAh') for cycler in cyclers]
+    if os.path.isfile(info_path):
+        with open(info_path, encoding='utf-8') as f:
+            if json.load(f) == settings:
+                return paths
+        shutil.rmtree(root)
+    
+    os.makedirs(root, exist_ok=True)
+    writers = {'PNE': write_pne_tree, 'Toyo': write_toyo_tree}
+    for cycler, path in zip(cyclers, paths):
+        writers[cycler](path, **params)
+    
+    with open(info_path, 'w', encoding='utf-8') as f:
+        json.dump(settings, f, indent=2)
+    return paths
+
+
+# ============================================================================
+# 파이프라인 벤치마크 (실행 시간 / 최대 RSS / 초당 행 수)
+# ============================================================================
+
+def _profile_rows(data):
+    """data의 전체 프로파일 행 수"""
+    rows = 0
+    for channel_data in data['channels'].values():
+        profile = channel_data.get('profile')
+        if isinstance(profile, bdp.CycleList):
+            rows += len(profile.frame)
+        elif isinstance(profile, pd.DataFrame):
+            rows += len(profile)
+        elif isinstance(profile, list):
+            rows += sum(len(cycle) for cycle in profile)
+    return rows
+
+
+def run_pipeline_benchmark(paths, workdir=None, workers=None, toyo_max_cycles=None, quiet=True,
+                           csv_backend=None):
+    """
+    파이프라인 단계별 측정
+    
+    단계: load (process_and_combine), process_all_channels, categorize_all_channels,
+    save_data, load_data
+    
+    Parameters:
+    -----------
+    paths : list of str
+        make_dataset() 등으로 만든 경로 리스트
+    workdir : str, optional
+        save_data 출력 폴더 (None이면 임시 폴더)
+    workers : int, optional
+        process_and_combine()의 workers
+    toyo_max_cycles : int or None
+        Toyo 프로파일 사이클 파일 수 (None이면 전체 이력)
+    quiet : bool
+        True면 파이프라인 출력 숨김
+    csv_backend : str, optional
+        로딩에 사용할 CSV 파서 백엔드 (None이면 현재 설정)
+    
+    Returns:
+    --------
+    pd.DataFrame : stage, wall_s, peak_rss_mb, rows, rows_per_s
+    """
+    cleanup = workdir is None
+    workdir = tempfile.mkdtemp(prefix='bdp_bench_') if workdir is None else workdir
+    os.makedirs(workdir, exist_ok=True)
+    pickle_path = os.path.join(workdir, 'bench.pkl')
+    
+    state = {}
+    stages = [
+        ('load', lambda: state.update(data=bdp.process_and_combine(
+            paths, workers=workers, toyo_max_cycles=toyo_max_cycles))),
+        ('process_all_channels', lambda: bdp.process_all_channels(state['data'])),
+        ('categorize_all_channels', lambda: bdp.categorize_all_channels(state['data'])),
+        ('save_data', lambda: bdp.save_data(state['data'], pickle_path)),
+        ('load_data', lambda: state.update(loaded=bdp.load_data(pickle_path))),
+    ]
+    
+    results = []
+    try:
+        for stage, func in stages:
+            if csv_backend is not None:
+                func = _with_csv_backend(csv_backend, func)
+            output = io.StringIO() if quiet else None
+            with bdp._PeakRssSampler() as rss:
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+                    func()
+                wall_s = time.perf_counter() - start
+            rows = _profile_rows(state['data'])
+            results.append({'stage': stage, 'wall_s': wall_s,
+                            'peak_rss_mb': rss.peak / (1024 * 1024), 'rows': rows,
+                            'rows_per_s': rows / wall_s if wall_s > 0 else float('nan')})
+    finally:
+        if cleanup:
+            shutil.rmtree(workdir, ignore_errors=True)
+    
+    return pd.DataFrame(results, columns=['stage', 'wall_s', 'peak_rss_mb', 'rows', 'rows_per_s'])
+
+
+def _with_csv_backend(backend, func):
+    """func를 지정한 CSV 파서 백엔드로 실행하는 함수로 감싸기"""
+    def run():
+        with bdp.csv_backend(backend):
+            return func()
+    return run
+
+
+# ============================================================================
+# CSV 파서 백엔드 비교
+# ============================================================================
+
+def _frames_equal(data, reference):
+    """두 process_and_combine() 결과의 채널/DataFrame이 같은지"""
+    if list(data['channels']) != list(reference['channels']):
+        return False
+    for key, channel_data in reference['channels'].items():
+        for field in bdp.CHANNEL_FRAME_FIELDS[channel_data['cycler_type']]:
+            expected, actual = channel_data[field], data['channels'][key][field]
+            if expected is None or actual is None:
+                if expected is not actual:
+                    return False
+                continue
+            try:
+                pd.testing.assert_frame_equal(actual, expected)
+            except AssertionError:
+                return False
+    return True
+
+
+def benchmark_csv_backends(paths, backends=None, workers=None, toyo_max_cycles=None, repeat=1):
+    """
+    CSV 파서 백엔드별 process_and_combine() 로딩 시간 비교
+    
+    각 백엔드 결과가 pandas 백엔드 결과와 같은지도 확인합니다.
+    
+    Parameters:
+    -----------
+    paths : list of str
+        데이터 경로 리스트
+    backends : tuple, optional
+        비교할 백엔드 (None이면 bdp.CSV_BACKENDS 전체)
+    workers, toyo_max_cycles :
+        process_and_combine()과 동일
+    repeat : int
+        반복 횟수 (최소 시간 사용)
+    
+    Returns:
+    --------
+    pd.DataFrame : backend, wall_s, bytes_read, mb_per_s, speedup (pandas 대비), matches
+    """
+    backends = tuple(backends or bdp.CSV_BACKENDS)
+    if 'pandas' not in backends:
+        backends = ('pandas',) + backends
+    
+    results, outputs = [], {}
+    for backend in backends:
+        best, bytes_read = None, 0
+        for _ in range(repeat):
+            with bdp.instrument(quiet=True) as report, bdp.csv_backend(backend):
+                start = time.perf_counter()
+                data = bdp.process_and_combine(paths, workers=workers,
+                                               toyo_max_cycles=toyo_max_cycles)
+                wall_s = time.perf_counter() - start
+            best = wall_s if best is None else min(best, wall_s)
+            bytes_read = int(report.summary().set_index('stage').loc['process_battery_data', 'bytes_read'])
+        outputs[backend] = data
+        results.append({'backend': backend, 'wall_s': best, 'bytes_read': bytes_read,
+                        'mb_per_s': bytes_read / (1024 * 1024) / best})
+    
+    df = pd.DataFrame(results)
+    df['speedup'] = df.loc[df['backend'] == 'pandas', 'wall_s'].iloc[0] / df['wall_s']
+    df['matches'] = [_frames_equal(outputs[b], outputs['pandas']) for b in df['backend']]
+    return df
+
+
+def _print_csv_backend_results(results):
+    """CSV 파서 백엔드 비교 결과 출력"""
+    print("=" * 70)
+    print("⏱️  CSV 파서 백엔드 비교 (process_and_combine)")
+    print("=" * 70)
+    for row in results.itertuples():
+        mark = '✅' if row.matches else '❌'
+        print(f"  {mark} {row.backend:<10} {row.wall_s:8.2f}s  {row.mb_per_s:8.1f} MB/s  "
+              f"{row.speedup:5.2f}x")
+    print("=" * 70)
+
+
+def _environment():
+    """기준 결과에 함께 기록할 실행 환경"""
+    return {'python': platform.python_version(), 'pandas': pd.__version__,
+            'numpy': np.__version__, 'machine': platform.machine(),
+            'cpu_count': os.cpu_count()}
+
+
+def save_baseline(results, path, dataset=None):
+    """벤치마크 결과를 기준 결과(JSON)로 저장"""
+    baseline = {'environment': _environment(), 'dataset': dataset,
+                'stages': results.to_dict(orient='records')}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def compare_with_baseline(results, path, tolerance=0.10, min_delta_s=0.05):
+    """
+    기준 결과와 단계별 비교
+    
+    Parameters:
+    -----------
+    results : pd.DataFrame
+        run_pipeline_benchmark() 결과
+    path : str
+        save_baseline()으로 저장한 JSON
+    tolerance : float
+        실행 시간이 이 비율보다 더 늘어나면 'slower'
+    min_delta_s : float
+        이보다 작은 실행 시간 차이는 측정 오차로 보고 'ok'
+    
+    Returns:
+    --------
+    pd.DataFrame : stage별 기준/현재 실행 시간, speedup, RSS 차이, status
+        status: 'ok', 'faster', 'slower', 'rows_mismatch' (처리 행 수가 달라 결과 비교 불가), 'new'
+    """
+    with open(path, encoding='utf-8') as f:
+        baseline = pd.DataFrame(json.load(f)['stages'])
+    
+    merged = results.merge(baseline, on='stage', how='left', suffixes=('', '_base'))
+    merged['speedup'] = merged['wall_s_base'] / merged['wall_s']
+    merged['rss_delta_mb'] = merged['peak_rss_mb'] - merged['peak_rss_mb_base']
+    
+    def status(row):
+        if pd.isna(row['wall_s_base']):
+            return 'new'
+        if row['rows'] != row['rows_base']:
+            return 'rows_mismatch'
+        if abs(row['wall_s'] - row['wall_s_base']) < min_delta_s:
+            return 'ok'
+        if row['wall_s'] > row['wall_s_base'] * (1 + tolerance):
+            return 'slower'
+        if row['wall_s'] < row['wall_s_base'] * (1 - tolerance):
+            return 'faster'
+        return 'ok'
+    
+    merged['status'] = merged.apply(status, axis=1)
+    return merged[['stage', 'wall_s_base', 'wall_s', 'speedup',
+                   'peak_rss_mb_base', 'peak_rss_mb', 'rss_delta_mb', 'status']]
+
+
+def _print_pipeline_results(results, comparison=None):
+    """파이프라인 벤치마크 결과 출력"""
+    print("=" * 70)
+    print("⏱️  파이프라인 단계별 측정")
+    print("=" * 70)
+    for row in results.itertuples():
+        print(f"  {row.stage:<26} {row.wall_s:8.2f}s  {row.peak_rss_mb:8.1f} MB  "
+              f"{row.rows_per_s:12,.0f} 행/s")
+    
+    if comparison is not None:
+        marks = {'ok': '✅', 'faster': '🚀', 'slower': '❌', 'rows_mismatch': '⚠️', 'new': 'ℹ️'}
+        print("-" * 70)
+        print("📊 기준 결과 대비")
+        for row in comparison.itertuples():
+            print(f"  {marks[row.status]} {row.stage:<26} {row.wall_s_base:8.2f}s → {row.wall_s:8.2f}s "
+                  f"({row.speedup:.2f}x, RSS {row.rss_delta_mb:+.1f} MB) {row.status}")
+    print("=" * 70)
+
+
+# ============================================================================
+# 사이클 파생 열 (time_cyc / Capa_cyc / Crate)
+# ============================================================================
+
+def _legacy_cycle_columns(df, mincapa):
+    """이전 process_all_channels의 사이클별 루프 방식 (비교 기준)"""
+    cycle_list = [group.copy() for _, group in df.groupby('Cycle')]
+    for cycle in cycle_list:
+        cycle['time_cyc'] = cycle['time_s'] - cycle['time_s'].iloc[0]
+    for cycle in cycle_list:
+        cycle['Capa_cyc'] = (cycle['Current_mA'] * cycle['time_cyc'].diff().fillna(0) / 3600).cumsum()
+        cycle['Crate'] = cycle['Current_mA'] / mincapa
+    return cycle_list
+
+
+def _vectorized_cycle_columns(df, mincapa):
+    """현재 process_all_channels의 방식 (CycleList + add_cycle_columns)"""
+    cycle_list = bdp.CycleList.from_frame(df)
+    bdp.add_cycle_columns(cycle_list.frame, cycle_list.offsets, mincapa)
+    return cycle_list
+
+
+def benchmark_cycle_columns(n_cycles=2000, points_per_cycle=5000, mincapa=4500.0, repeat=1):
+    """
+    사이클 파생 열 계산: 사이클별 루프 대비 벡터화 방식 비교
+
+    두 방식의 결과가 비트 단위로 같은지 확인한 뒤 실행 시간을 반환합니다.
+
+    Returns:
+    --------
+    dict : {'rows', 'cycles', 'legacy_s', 'vectorized_s', 'speedup'}
+    """
+    df = make_profile_frame(n_cycles, points_per_cycle)
+
+    def timed(func):
+        best, result = None, None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func(df, mincapa)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    legacy_s, legacy = timed(_legacy_cycle_columns)
+    vectorized_s, vectorized = timed(_vectorized_cycle_columns)
+
+    frame = vectorized.frame
+    for column in ['time_cyc', 'Capa_cyc', 'Crate']:
+        expected = np.concatenate([cycle[column].to_numpy() for cycle in legacy])
+        if not np.array_equal(expected, frame[column].to_numpy(), equal_nan=True):
+            raise AssertionError(f"{column} 결과가 사이클별 루프 방식과 다릅니다.")
+
+    return {
+        'rows': len(df),
+        'cycles': len(legacy),
+        'legacy_s': legacy_s,
+        'vectorized_s': vectorized_s,
+        'speedup': legacy_s / vectorized_s,
+    }
+
+
+# ============================================================================
+# 사이클 분류
+# ============================================================================
+
+def benchmark_categorize_cycles(n_cycles=2000, points_per_cycle=5000, mincapa=4500.0):
+    """
+    사이클 분류: DataFrame list 사이클별 분류 대비 CycleList 일괄 분류 비교
+
+    Returns:
+    --------
+    dict : {'rows', 'cycles', 'legacy_s', 'vectorized_s', 'speedup'}
+    """
+    df = make_profile_frame(n_cycles, points_per_cycle)
+    cycle_list = _vectorized_cycle_columns(df, mincapa)
+    legacy_list = [cycle.frame for cycle in cycle_list]
+
+    start = time.perf_counter()
+    expected = bdp.categorize_cycles(legacy_list)
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    categories = bdp.categorize_cycles(cycle_list)
+    vectorized_s = time.perf_counter() - start
+
+    if categories != expected:
+        raise AssertionError("분류 결과가 사이클별 분류와 다릅니다.")
+
+    return {
+        'rows': len(df),
+        'cycles': len(cycle_list),
+        'legacy_s': legacy_s,
+        'vectorized_s': vectorized_s,
+        'speedup': legacy_s / vectorized_s,
+    }
+
+
+def _print_comparison(title, result):
+    """비교 벤치마크 결과 출력"""
+    print("=" * 70)
+    print(f"⏱️  {title}")
+    print("=" * 70)
+    print(f"  행 수: {result['rows']:,}, 사이클 수: {result['cycles']:,}")
+    print(f"  사이클별 루프: {result['legacy_s']:.2f}s")
+    print(f"  벡터화:        {result['vectorized_s']:.2f}s")
+    print(f"  속도 향상:     {result['speedup']:.1f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="배터리 데이터 처리 벤치마크")
+    parser.add_argument('--size', default='small', choices=sorted(DATASET_SIZES),
+                        help="합성 데이터셋 크기")
+    parser.add_argument('--data-root', default=None,
+                        help="데이터셋 폴더 (같은 설정이면 재사용, 없으면 임시 폴더)")
+    parser.add_argument('--workers', type=int, default=None, help="process_and_combine workers")
+    parser.add_argument('--baseline', default=None, help="비교할 기준 결과 JSON")
+    parser.add_argument('--save-baseline', default=None, help="결과를 기준 결과 JSON으로 저장")
+    parser.add_argument('--tolerance', type=float, default=0.10, help="느려짐 판정 비율")
+    parser.add_argument('--csv-backend', default=None, choices=bdp.CSV_BACKENDS,
+                        help="파이프라인 측정에 사용할 CSV 파서 백엔드")
+    parser.add_argument('--compare-csv-backends', action='store_true',
+                        help="CSV 파서 백엔드별 로딩 속도만 비교")
+    parser.add_argument('--micro', action='store_true',
+                        help="사이클 파생 열/분류 비교 벤치마크만 실행")
+    args = parser.parse_args(argv)
+    
+    if args.micro:
+        _print_comparison("사이클 파생 열 (time_cyc / Capa_cyc / Crate)", benchmark_cycle_columns())
+        _print_comparison("사이클 분류 (categorize_cycles)", benchmark_categorize_cycles())
+        return 0
+    
+    data_root = args.data_root or tempfile.mkdtemp(prefix='bdp_dataset_')
+    try:
+        print(f"📁 합성 데이터셋 준비 중 ({args.size}): {data_root}")
+        paths = make_dataset(data_root, args.size)
+        if args.compare_csv_backends:
+            backend_results = benchmark_csv_backends(paths, workers=args.workers)
+        else:
+            results = run_pipeline_benchmark(paths, workers=args.workers,
+                                             csv_backend=args.csv_backend)
+    finally:
+        if args.data_root is None:
+            shutil.rmtree(data_root, ignore_errors=True)
+    
+    if args.compare_csv_backends:
+        _print_csv_backend_results(backend_results)
+        return 0 if backend_results['matches'].all() else 1
+    
+    comparison = None
+    if args.baseline:
+        comparison = compare_with_baseline(results, args.baseline, args.tolerance)
+    _print_pipeline_results(results, comparison)
+    
+    if args.save_baseline:
+        save_baseline(results, args.save_baseline, dataset={'size': args.size, **DATASET_SIZES[args.size]})
+        print(f"💾 기준 결과 저장: {args.save_baseline}")
+    
+    if comparison is not None and (comparison['status'].isin(['slower', 'rows_mismatch'])).any():
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,13 +9,36 @@
 - Cycle list 처리
 - 사이클 분류 및 카테고리화
 - 데이터 통합 및 저장/로드
+- 단계/채널별 계측 리포트 (instrument)
 """
 
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import inspect
+import io
+import json
 import os
 import re
 import pickle
+import shutil
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict, namedtuple
+from collections.abc import MutableMapping
+from functools import partial, wraps
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import pandas as pd
-import numpy as np-
+import numpy as np
 
 
 # ============================================================================
@@ -103,12 +126,494 @@ def find_toyo_channel_folders(path):
     return channel_folders
 
 
+# ============================================================================
+# CSV 파서 백엔드
+# ============================================================================
+
+# 'pandas'  : pandas C 파서 (cp949, on_bad_lines='skip') - 기준 동작
+# 'pyarrow' : pyarrow 멀티스레드 CSV 파서 (ASCII 파일은 cp949 디코딩 생략)
+# 'numeric' : 숫자만 있는 PNE Restore 파일 전용 (디코딩 없이 필요한 열만 변환)
+CSV_BACKENDS = ('pandas', 'pyarrow', 'numeric')
+
+# 기본 백엔드 (환경 변수 BATTERY_CSV_BACKEND로 지정 가능, set_csv_backend로만 변경)
+_csv_settings = {'backend': os.environ.get('BATTERY_CSV_BACKEND', 'pandas')}
+
+# csv_backend() 블록과 worker 호출 동안의 백엔드 (작업/스레드 context별로 따로 유지)
+_csv_backend_override = contextvars.ContextVar('battery_csv_backend', default=None)
+
+# pandas read_csv 기본 결측값 문자열 (pyarrow 파서도 같은 값을 결측으로 처리)
+_PANDAS_NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+                     '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None',
+                     'n/a', 'nan', 'null']
+
+
+def get_csv_backend():
+    """현재 context의 CSV 파서 백엔드 이름 (csv_backend() 블록 밖이면 기본 백엔드)"""
+    return _csv_backend_override.get() or _csv_settings['backend']
+
+
+def _check_csv_backend(name):
+    if name not in CSV_BACKENDS:
+        raise ValueError(f"지원하지 않는 CSV 백엔드: {name} (가능: {', '.join(CSV_BACKENDS)})")
+    if name != 'pandas':
+        _require_pyarrow()
+
+
+def set_csv_backend(name):
+    """
+    기본 CSV 파서 백엔드 변경 ('pandas', 'pyarrow', 'numeric')
+    
+    프로세스 전체의 기본값을 바꿉니다 (CLI/스크립트 시작 시 한 번 호출하는 용도).
+    병렬/비동기 로딩의 worker에는 호출 시점의 백엔드가 인자로 전달됩니다.
+    """
+    _check_csv_backend(name)
+    _csv_settings['backend'] = name
+
+
+@contextlib.contextmanager
+def csv_backend(name):
+    """
+    블록 안에서만 CSV 파서 백엔드 변경
+    
+    ContextVar에 설정하므로 동시에 실행 중인 다른 비동기 작업/스레드의
+    백엔드는 바뀌지 않습니다.
+    """
+    _check_csv_backend(name)
+    token = _csv_backend_override.set(name)
+    try:
+        yield
+    finally:
+        _csv_backend_override.reset(token)
+
+
+def _parser_settings():
+    """worker에 전달할 파서 설정 (CSV 백엔드, 원시 파일 스키마, instrument()의 quiet)"""
+    return get_csv_backend(), CYCLER_SCHEMAS, _quiet.get()
+
+
+def _call_with_parser_settings(settings, func, *args):
+    """
+    worker에서 지정한 파서 설정으로 func 실행 (프로세스 풀은 부모 설정을 물려받지 않음)
+    
+    스키마는 다른 프로세스로 전달된 복사본일 때만 반영합니다 (스레드 worker는 같은
+    객체를 공유하므로 그대로 사용). 백엔드와 quiet는 모듈 전역이 아니라 worker
+    스레드의 context에 호출 동안만 설정합니다 (executor 스레드는 호출한 작업의
+    context를 물려받지 않음).
+    """
+    backend, schemas, quiet = settings
+    if schemas is not CYCLER_SCHEMAS:
+        CYCLER_SCHEMAS.update(schemas)
+    backend_token = _csv_backend_override.set(backend)
+    quiet_token = _quiet.set(quiet)
+    try:
+        return func(*args)
+    finally:
+        _quiet.reset(quiet_token)
+        _csv_backend_override.reset(backend_token)
+
+
+class _ArrowFallback(Exception):
+    """pyarrow 파싱 결과가 pandas와 달라질 수 있어 pandas 파서로 다시 읽어야 함"""
+
+
+def _read_csv_pandas(source, header, names, usecols):
+    """기준 파서: pandas C 파서 (cp949, 잘못된 행은 건너뜀)"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    kwargs = {'header': header}
+    if names is not None:
+        kwargs.update(names=names, usecols=usecols, index_col=False)
+    return pd.read_csv(source, sep=',', skiprows=0, engine='c', encoding='cp949',
+                       on_bad_lines='skip', **kwargs)
+
+
+def _read_csv_arrow(raw, header, names, usecols, numeric, dtypes=None):
+    """
+    pyarrow CSV 파서로 읽고 pandas 파서와 같은 DataFrame으로 변환
+    
+    잘못된 행(열 수 불일치), 빈 입력, 중복/빈 헤더, 앞뒤 공백이 있는 문자열,
+    숫자/문자열/bool 외의 타입 추론 등 pandas와 결과가 달라질 수 있는 경우는
+    _ArrowFallback을 발생시켜 pandas 파서로 다시 읽게 합니다.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.compute as pa_compute
+    
+    if not raw.isascii():
+        if numeric:
+            raise _ArrowFallback("숫자 전용 파일에 ASCII가 아닌 문자")
+        raw = raw.decode('cp949').encode('utf-8')
+    
+    read_options = pa_csv.ReadOptions(use_threads=True, block_size=1 << 24)
+    convert_options = pa_csv.ConvertOptions(null_values=_PANDAS_NA_VALUES,
+                                            strings_can_be_null=True)
+    if names is not None:
+        read_options.column_names = list(names)
+    elif header is None:
+        read_options.autogenerate_column_names = True
+    
+    def column_key(c):
+        return f"f{c}" if names is None and header is None else c
+    
+    if usecols is not None:
+        convert_options.include_columns = [column_key(c) for c in usecols]
+    if dtypes:
+        convert_options.column_types = {column_key(c): pa.type_for_alias(dtype)
+                                         for c, dtype in dtypes.items()}
+    
+    try:
+        table = pa_csv.read_csv(pa.BufferReader(raw), read_options=read_options,
+                                convert_options=convert_options)
+    except (pa.ArrowInvalid, pa.ArrowKeyError) as e:
+        raise _ArrowFallback(str(e)) from e
+    
+    if header is not None and names is None:
+        if len(set(table.column_names)) != len(table.column_names) or '' in table.column_names:
+            raise _ArrowFallback("중복 또는 빈 헤더")
+    
+    columns = {}
+    for name, column in zip(table.column_names, table.columns):
+        kind = column.type
+        if pa.types.is_null(kind):
+            columns[name] = np.full(len(column), np.nan)
+            continue
+        if numeric and not (pa.types.is_integer(kind) or pa.types.is_floating(kind)):
+            raise _ArrowFallback(f"숫자가 아닌 열: {name}")
+        if pa.types.is_string(kind) or pa.types.is_large_string(kind):
+            if pa_compute.any(pa_compute.not_equal(column, pa_compute.utf8_trim_whitespace(column))).as_py():
+                raise _ArrowFallback(f"앞뒤 공백이 있는 문자열 열: {name}")
+        elif not (pa.types.is_integer(kind) or pa.types.is_floating(kind) or pa.types.is_boolean(kind)):
+            raise _ArrowFallback(f"pandas와 다른 타입 추론: {name} ({kind})")
+        columns[name] = column.to_pandas()
+    
+    df = pd.DataFrame(columns)
+    if names is None and header is None:
+        df.columns = [int(name[1:]) for name in df.columns]
+    return df
+
+
+def read_raw_csv(source, header='infer', names=None, usecols=None, numeric=False, backend=None,
+                 dtypes=None):
+    """
+    원시 CSV 파일/bytes를 현재 백엔드로 파싱
+    
+    모든 백엔드의 결과는 pandas 파서(cp949, on_bad_lines='skip')와 같습니다.
+    pyarrow / numeric 백엔드는 잘못된 행 등 결과가 달라질 수 있는 입력을 만나면
+    해당 파일만 pandas 파서로 다시 읽습니다.
+    
+    Parameters:
+    -----------
+    source : str or bytes
+        파일 경로 또는 파일 내용
+    header : 'infer' or None
+        첫 줄이 헤더인지 여부 (pd.read_csv와 같은 의미)
+    names, usecols : list, optional
+        열 이름 지정 시 사용할 열 (pd.read_csv와 같은 의미, index_col=False)
+    usecols : list, optional
+        names가 없을 때는 pyarrow 백엔드가 변환할 열 번호/헤더 이름 (pandas 백엔드는
+        잘못된 행 처리가 달라지므로 전체 열을 읽음 - 호출 측에서 열 선택)
+    numeric : bool
+        숫자만 있는 헤더 없는 파일 (numeric 백엔드 대상)
+    backend : str, optional
+        None이면 get_csv_backend()
+    dtypes : dict, optional
+        {열: dtype 이름} - pyarrow 백엔드의 파싱 dtype (변환할 수 없는 값이 있으면
+        pandas 파서로 다시 읽음, pandas 백엔드는 타입 추론 유지)
+    
+    Returns:
+    --------
+    pd.DataFrame
+    """
+    backend = backend or get_csv_backend()
+    if backend == 'numeric' and not numeric:
+        backend = 'pyarrow'
+    
+    if backend != 'pandas':
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                raw = f.read()
+        else:
+            raw = bytes(source)
+        try:
+            return _read_csv_arrow(raw, header, names, usecols, backend == 'numeric', dtypes)
+        except _ArrowFallback:
+            source = raw
+    
+    return _read_csv_pandas(source, header, names, usecols)
+
+
+# ============================================================================
+# 원시 파일 스키마 (열 위치 / 이름 / 배율 / dtype)
+# ============================================================================
+
+# 원시 열 하나의 선언
+# - source : 헤더 없는 파일은 열 번호, 헤더가 있는 파일은 헤더 이름
+# - name   : 변환 후 열 이름
+# - scale  : 원시 값에 곱할 배율 (0.001 = /1000, 0.01 = /100)
+# - dtype  : 파싱 dtype ('int64' 열에 빈 값이 있으면 pandas와 같이 float64)
+ColumnSpec = namedtuple('ColumnSpec', ['source', 'name', 'scale', 'dtype'], defaults=(1, None))
+
+
+class SchemaLayout(tuple):
+    """
+    원시 파일 레이아웃 하나 (ColumnSpec 튜플 + 판별 조건)
+    
+    fields는 원시 열 수 조건입니다 (헤더 없는 파일은 첫 줄의 필드 수, 헤더가 있는
+    파일은 헤더 열 수). None이면 선언된 원시 열이 모두 있는 파일과 일치합니다.
+    """
+    
+    def __new__(cls, columns, fields=None):
+        layout = super().__new__(cls, columns)
+        layout.fields = None if fields is None else frozenset(
+            [fields] if isinstance(fields, int) else fields)
+        return layout
+    
+    def matches(self, columns):
+        """원시 열 목록(열 번호 또는 헤더 이름)이 이 레이아웃인지"""
+        columns = list(columns)
+        if self.fields is not None and len(columns) not in self.fields:
+            return False
+        present = set(columns)
+        return all(spec.source in present for spec in self)
+
+
+# read_cycler_csv()가 판별한 레이아웃을 기록하는 DataFrame.attrs 키
+_SCHEMA_ATTR = 'cycler_layout'
+
+# 형식별 레이아웃 목록 - 판별 조건(열 수)과 원시 열이 모두 맞는 첫 번째 레이아웃을 사용
+# (헤더 없는 파일은 첫 줄의 열 수, 헤더가 있는 파일은 헤더 이름으로 판별)
+CYCLER_SCHEMAS = {
+    'pne_cycle': [SchemaLayout((
+        ColumnSpec(27, 'Cycle', 1, 'int64'),
+        ColumnSpec(2, 'Condition', 1, 'int64'),
+        ColumnSpec(10, 'ChgCap_mAh', 0.001, 'float64'),
+        ColumnSpec(11, 'DchgCap_mAh', 0.001, 'float64'),
+        ColumnSpec(8, 'OCV_mV', 0.001, 'float64'),
+        ColumnSpec(20, 'imp', 1, 'int64'),
+        ColumnSpec(45, 'VoltageMax_mV', 0.001, 'float64'),
+        ColumnSpec(14, 'ChgPow_mW', 1, 'int64'),
+        ColumnSpec(15, 'DchgPow_mW', 1, 'int64'),
+        ColumnSpec(17, 'Steptime_s', 0.01, 'float64'),
+        ColumnSpec(24, 'Temp_C', 0.001, 'float64'),
+        ColumnSpec(6, 'EndState', 1, 'int64'),
+        ColumnSpec(9, 'Current_mA', 0.001, 'float64'),
+    ))],
+    'pne_profile': [SchemaLayout((
+        ColumnSpec(0, 'index', 1, 'int64'),
+        ColumnSpec(18, 'time_day', 1, 'int64'),
+        ColumnSpec(19, 'time_s', 0.01, 'float64'),
+        ColumnSpec(8, 'Voltage_V', 0.001, 'float64'),
+        ColumnSpec(9, 'Current_mA', 0.001, 'float64'),
+        ColumnSpec(21, 'Temp_C', 0.001, 'float64'),
+        ColumnSpec(10, 'ChgCap_mAh', 0.001, 'float64'),
+        ColumnSpec(11, 'DchgCap_mAh', 0.001, 'float64'),
+        ColumnSpec(2, 'Condition', 1, 'int64'),
+        ColumnSpec(6, 'EndState', 1, 'int64'),
+        ColumnSpec(7, 'step', 1, 'int64'),
+        ColumnSpec(17, 'Steptime_s', 0.01, 'float64'),
+        ColumnSpec(27, 'Cycle', 1, 'int64'),
+    ))],
+    'toyo_cycle': [SchemaLayout((
+        ColumnSpec('TotlCycle', 'Cycle'),
+        ColumnSpec('Condition', 'Condition'),
+        ColumnSpec('Cap[mAh]', 'Capacity_mAh'),
+        ColumnSpec('Ocv', 'OCV_V'),
+        ColumnSpec('PeakTemp[Deg]', 'Temp_C'),
+        ColumnSpec('AveVolt[V]', 'AvgVolt_V'),
+    )), SchemaLayout((
+        ColumnSpec('Total Cycle', 'Cycle'),
+        ColumnSpec('Condition', 'Condition'),
+        ColumnSpec('Capacity[mAh]', 'Capacity_mAh'),
+        ColumnSpec('OCV[V]', 'OCV_V'),
+        ColumnSpec('Peak Temp.[deg]', 'Temp_C'),
+        ColumnSpec('Ave. Volt.[V]', 'AvgVolt_V'),
+    ))],
+    # Toyo 프로파일은 파일마다 있는 열만 사용 (Voltage_V는 PNE와 같은 mV 단위)
+    'toyo_profile': [SchemaLayout((
+        ColumnSpec('PassTime[Sec]', 'Steptime_s'),
+        ColumnSpec('Voltage[V]', 'Voltage_V', 1000),
+        ColumnSpec('Current[mA]', 'Current_mA'),
+        ColumnSpec('Temp1[Deg]', 'Temp_C'),
+        ColumnSpec('Condition', 'Condition'),
+        ColumnSpec('Mode', 'Mode'),
+    ))],
+}
+
+
+def register_schema(fmt, columns, first=True, fields=None):
+    """
+    새 장비 펌웨어의 원시 열 레이아웃 등록 (로더 코드 수정 없이 읽기 가능)
+    
+    Parameters:
+    -----------
+    fmt : str
+        'pne_cycle', 'pne_profile', 'toyo_cycle', 'toyo_profile' 또는 새 형식 이름
+    columns : list
+        ColumnSpec 또는 (source, name[, scale[, dtype]]) 튜플 목록
+    first : bool
+        True면 기존 레이아웃보다 먼저 판별
+    fields : int or collection of int, optional
+        이 레이아웃 파일의 원시 열 수 (헤더 없는 파일은 한 줄의 필드 수).
+        헤더 없는 형식은 열 번호만으로 기존 펌웨어 파일과 구분할 수 없으므로,
+        기존 헤더 없는 레이아웃보다 먼저 판별(first=True)하려면 필요합니다.
+    
+    Raises:
+    -------
+    ValueError : 레이아웃 선언이 잘못되었거나 판별 조건이 없을 때
+    """
+    schema = SchemaLayout((spec if isinstance(spec, ColumnSpec) else ColumnSpec(*spec)
+                           for spec in columns), fields)
+    if not schema:
+        raise ValueError("빈 스키마는 등록할 수 없습니다")
+    if len({type(spec.source) for spec in schema}) != 1:
+        raise ValueError("한 레이아웃의 source는 모두 열 번호이거나 모두 헤더 이름이어야 합니다")
+    if len({spec.name for spec in schema}) != len(schema):
+        raise ValueError("변환 후 열 이름이 중복됩니다")
+    positional = isinstance(schema[0].source, int)
+    if positional and schema.fields is not None and \
+            min(schema.fields) <= max(spec.source for spec in schema):
+        raise ValueError("fields가 선언된 열 번호보다 작습니다")
+    variants = CYCLER_SCHEMAS.setdefault(fmt, [])
+    if positional and first and schema.fields is None and any(
+            isinstance(variant[0].source, int) for variant in variants):
+        raise ValueError(f"{fmt}의 기존 헤더 없는 레이아웃보다 먼저 판별하려면 "
+                         "열 수(fields)를 지정해야 합니다")
+    if first:
+        variants.insert(0, schema)
+    else:
+        variants.append(schema)
+    return schema
+
+
+def _match_schema(fmt, columns):
+    """원시 열 목록(열 번호 또는 헤더 이름)에 맞는 첫 번째 레이아웃 (없으면 None)"""
+    columns = list(columns)
+    for schema in CYCLER_SCHEMAS[fmt]:
+        if schema.matches(columns):
+            return schema
+    return None
+
+
+def _first_line_columns(raw, positional):
+    """
+    첫 줄로 원시 열 목록 추정 (헤더 없는 파일은 열 번호, 있는 파일은 헤더 이름)
+    
+    따옴표 안의 쉼표나 중복/빈 헤더처럼 단순 분할로 pandas와 같은 결과를 보장할
+    수 없으면 None (호출 측에서 전체 열을 읽은 뒤 판별)
+    """
+    end = raw.find(b'\n')
+    line = (raw if end < 0 else raw[:end]).rstrip(b'\r')
+    if not line or b'"' in line:
+        return None
+    if positional:
+        return range(line.count(b',') + 1)
+    fields = line.decode('cp949', errors='replace').split(',')
+    if '' in fields or len(set(fields)) != len(fields):
+        return None
+    return fields
+
+
+def read_cycler_csv(source, fmt, backend=None):
+    """
+    스키마에 선언된 원시 열만 선언된 dtype으로 파싱
+    
+    pyarrow / numeric 백엔드는 첫 줄로 레이아웃을 판별한 뒤 필요한 열만 변환합니다.
+    pandas 백엔드는 usecols를 쓰면 열이 많은 잘못된 행을 건너뛰지 않으므로
+    (기준 동작과 달라짐) 전체 열을 읽고, 열 선택은 apply_schema()에서 합니다.
+    헤더 없는 형식(열 번호)은 숫자 전용 파일로 보고 numeric 백엔드를 사용합니다.
+    필요한 열만 읽은 결과는 열 수로 다시 판별할 수 없으므로 판별된 레이아웃을
+    attrs에 기록해 apply_schema()가 사용합니다.
+    
+    Returns:
+    --------
+    pd.DataFrame : 원시 열 이름(열 번호 또는 헤더 이름)의 DataFrame
+    """
+    positional = isinstance(CYCLER_SCHEMAS[fmt][0][0].source, int)
+    header = None if positional else 'infer'
+    backend = backend or get_csv_backend()
+    if backend == 'pandas':
+        return read_raw_csv(source, header=header, numeric=positional, backend=backend)
+    
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            source = f.read()
+    columns = _first_line_columns(source, positional)
+    schema = _match_schema(fmt, columns) if columns else None
+    if schema is None:
+        return read_raw_csv(source, header=header, numeric=positional, backend=backend)
+    
+    dtypes = {spec.source: spec.dtype for spec in schema if spec.dtype is not None}
+    df = read_raw_csv(source, header=header, usecols=[spec.source for spec in schema],
+                      dtypes=dtypes, numeric=positional, backend=backend)
+    df.attrs[_SCHEMA_ATTR] = schema
+    return df
+
+
+def _scaled_block(df, specs, source=True):
+    """
+    배율이 있는 열을 2차원 배열 하나로 모아 한 번에 변환 ([열, 행] float64 배열)
+    
+    x / 1000과 x * 0.001은 마지막 비트가 다를 수 있으므로, 배율의 역수가 정수이면
+    나눗셈으로 적용합니다 (기존 '/ 1000' 변환과 같은 값).
+    """
+    block = np.empty((len(specs), len(df)), dtype=np.float64)
+    for row, spec in enumerate(specs):
+        column = df[spec.source if source else spec.name]
+        block[row] = column.to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    scales = np.array([spec.scale for spec in specs], dtype=np.float64)
+    divisors = np.round(1 / scales)
+    divide = divisors == 1 / scales
+    if divide.all():
+        block /= divisors[:, None]
+    elif not divide.any():
+        block *= scales[:, None]
+    else:
+        block[divide] /= divisors[divide, None]
+        block[~divide] *= scales[~divide, None]
+    return block
+
+
+def _scale_columns(df, specs):
+    """이름 변환이 끝난 df의 배율 열을 변환 (df를 직접 수정)"""
+    specs = [spec for spec in specs if spec.scale != 1]
+    if specs:
+        block = _scaled_block(df, specs, source=False)
+        for row, spec in enumerate(specs):
+            df[spec.name] = block[row]
+    return df
+
+
+def apply_schema(df, fmt):
+    """
+    원시 DataFrame에서 레이아웃 판별, 열 선택/이름 변환 및 배율 적용
+    
+    배율이 없는 열은 원시 열을 그대로 쓰고 배율 열은 변환된 배열로 바로
+    DataFrame을 만들어, 선택한 열 전체를 복사한 뒤 다시 덮어쓰지 않습니다.
+    
+    Raises:
+    -------
+    ValueError : 등록된 레이아웃 중 원시 열이 모두 있는 것이 없을 때
+    """
+    schema = df.attrs.get(_SCHEMA_ATTR)
+    if schema not in CYCLER_SCHEMAS[fmt]:
+        schema = _match_schema(fmt, df.columns)
+    if schema is None:
+        raise ValueError(f"{fmt} 형식에 맞는 열 레이아웃이 없습니다 (register_schema()로 등록)")
+    scaled = [spec for spec in schema if spec.scale != 1]
+    block = _scaled_block(df, scaled) if scaled else None
+    rows = {spec.name: row for row, spec in enumerate(scaled)}
+    columns = {spec.name: block[rows[spec.name]] if spec.name in rows else df[spec.source]
+               for spec in schema}
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
 # ============================================================================
 # 데이터 로딩 함수
 # ============================================================================
 
-def load_pne_cycle_data(channel_path):
-    """PNE 사이클 데이터 로딩 (SaveEndData.csv)"""
+def load_pne_cycle_data(channel_path, compact=False):
+    """PNE 사이클 데이터 로딩 (SaveEndData.csv, compact=True면 compact_frame 적용)"""
     restore_path = os.path.join(channel_path, "Restore")
     
     if not os.path.isdir(restore_path):
@@ -130,31 +635,18 @@ def load_pne_cycle_data(channel_path):
         if os.stat(file_path).st_size == 0:
             return None
         
-        df = pd.read_csv(file_path, sep=',', skiprows=0, engine='c', 
-                        header=None, encoding='cp949', on_bad_lines='skip')
+        df = read_cycler_csv(file_path, 'pne_cycle')
         
-        df = df[[27, 2, 10, 11, 8, 20, 45, 14, 15, 17, 24, 6, 9]]
-        df.columns = ['Cycle', 'Condition', 'ChgCap_mAh','DchgCap_mAh',
-        'OCV_mV','imp', 'VoltageMax_mV','ChgPow_mW','DchgPow_mW',
-        'Steptime_s', 'Temp_C', 'EndState', 'Current_mA']
-
-        df['Temp_C'] = df['Temp_C'] / 1000
-        df['OCV_mV'] = df['OCV_mV'] / 1000
-        df['Current_mA'] = df['Current_mA'] / 1000
-        df['DchgCap_mAh'] = df['DchgCap_mAh'] / 1000
-        df['ChgCap_mAh'] = df['ChgCap_mAh'] / 1000
-        df['VoltageMax_mV'] = df['VoltageMax_mV'] / 1000
-        df['Steptime_s'] = df['Steptime_s'] / 100
-        
-        return df
+        df = _transform_pne_cycle(df)
+        return compact_frame(df) if compact else df
         
     except Exception as e:
-        print(f"  ❌ PNE 사이클 데이터 로딩 실패: {e}")
+        _log(f"  ❌ PNE 사이클 데이터 로딩 실패: {e}")
         return None
 
 
-def load_pne_profile_data(channel_path):
-    """PNE 프로파일 데이터 로딩 (SaveData*.csv)"""
+def load_pne_profile_data(channel_path, compact=False):
+    """PNE 프로파일 데이터 로딩 (SaveData*.csv, compact=True면 compact_frame 적용)"""
     restore_path = os.path.join(channel_path, "Restore")
     
     if not os.path.isdir(restore_path):
@@ -171,687 +663,6371 @@ def load_pne_profile_data(channel_path):
     for file in csv_files:
         try:
             file_path = os.path.join(restore_path, file)
-            df_temp = pd.read_csv(file_path, sep=',', skiprows=0, engine='c',
-                                 header=None, encoding='cp949', on_bad_lines='skip')
+            df_temp = read_cycler_csv(file_path, 'pne_profile')
             dataframes.append(df_temp)
         except:
             continue
     
     if dataframes:
         df_combined = pd.concat(dataframes, ignore_index=True)
-        df_combined = df_combined[[0, 18, 19, 8, 9, 21, 10, 11, 2, 6,7, 17, 27]]
-        df_combined.columns = ['index', 'time_day', 'time_s', 'Voltage_V', 'Current_mA', 
-                               'Temp_C', 'ChgCap_mAh', 'DchgCap_mAh', 'Condition','EndState' ,'step', 'Steptime_s', 'Cycle']
-        
-        df_combined['Temp_C'] = df_combined['Temp_C'] / 1000
-        df_combined['Current_mA'] = df_combined['Current_mA'] / 1000
-        df_combined['DchgCap_mAh'] = df_combined['DchgCap_mAh'] / 1000
-        df_combined['ChgCap_mAh'] = df_combined['ChgCap_mAh'] / 1000
-        df_combined['Steptime_s'] = df_combined['Steptime_s'] / 100
-        df_combined['time_s'] = (df_combined['time_day'] * 24 * 60 * 60) + df_combined['time_s'] / 100
-        df_combined['time_min'] = df_combined['time_s'] / 60
-        df_combined['time_hour'] = df_combined['time_min'] / 60
-        df_combined['time_day'] = df_combined['time_hour'] / 24
-        df_combined['Voltage_V'] = df_combined['Voltage_V'] / 1000
-        df_combined = df_combined[df_combined['Condition'] != 8]
-        
-        return df_combined
+        df_combined = _transform_pne_profile(df_combined)
+        return compact_frame(df_combined) if compact else df_combined
     else:
         return None
 
 
-def load_toyo_cycle_data(channel_path):
-    """Toyo 사이클 데이터 로딩 (capacity.log)"""
+# PNE 원시 파일에서 사용하는 열 번호 (기본 레이아웃, 변환 함수의 열 이름 순서)
+PNE_CYCLE_RAW_COLUMNS = [spec.source for spec in CYCLER_SCHEMAS['pne_cycle'][-1]]
+PNE_PROFILE_RAW_COLUMNS = [spec.source for spec in CYCLER_SCHEMAS['pne_profile'][-1]]
+
+
+def _transform_pne_cycle(df):
+    """SaveEndData 원시 DataFrame에서 필요한 열 선택 및 단위 변환 (스키마 'pne_cycle')"""
+    return apply_schema(df, 'pne_cycle')
+
+
+def _transform_pne_profile(df_combined):
+    """SaveData 원시 DataFrame에서 필요한 열 선택, 단위 변환 및 Condition 8 제거 (스키마 'pne_profile')"""
+    df_combined = apply_schema(df_combined, 'pne_profile')
+    
+    # time_day: 경과 일수, time_s: 당일 경과 시간 (스키마에서 /100 적용)
+    df_combined['time_s'] = (df_combined['time_day'] * 24 * 60 * 60) + df_combined['time_s']
+    df_combined['time_min'] = df_combined['time_s'] / 60
+    df_combined['time_hour'] = df_combined['time_min'] / 60
+    df_combined['time_day'] = df_combined['time_hour'] / 24
+    df_combined = df_combined[df_combined['Condition'] != 8]
+    
+    return df_combined
+
+
+def load_toyo_cycle_data(channel_path, compact=False):
+    """Toyo 사이클 데이터 로딩 (capacity.log, compact=True면 compact_frame 적용)"""
     capacity_file = os.path.join(channel_path, 'capacity.log')
     
     if not os.path.isfile(capacity_file):
         return None
     
     try:
-        df = pd.read_csv(capacity_file, sep=',', skiprows=0, engine='c', 
-                        encoding='cp949', on_bad_lines='skip')
-        
-        if 'Cap[mAh]' in df.columns:
-            df = df[['TotlCycle', 'Condition', 'Cap[mAh]', 'Ocv', 'PeakTemp[Deg]', 'AveVolt[V]']]
-            df.columns = ['Cycle', 'Condition', 'Capacity_mAh', 'OCV_V', 'Temp_C', 'AvgVolt_V']
-        elif 'Capacity[mAh]' in df.columns:
-            df = df[['Total Cycle', 'Condition', 'Capacity[mAh]', 'OCV[V]', 'Peak Temp.[deg]', 'Ave. Volt.[V]']]
-            df.columns = ['Cycle', 'Condition', 'Capacity_mAh', 'OCV_V', 'Temp_C', 'AvgVolt_V']
-        
-        return df
+        df = _transform_toyo_cycle(read_cycler_csv(capacity_file, 'toyo_cycle'))
+        return compact_frame(df) if compact else df
         
     except Exception as e:
-        print(f"  ❌ Toyo 사이클 데이터 로딩 실패: {e}")
+        _log(f"  ❌ Toyo 사이클 데이터 로딩 실패: {e}")
         return None
 
 
-def load_toyo_profile_data(channel_path, max_cycles=3):
-    """Toyo 프로파일 데이터 로딩 (처음 max_cycles개 사이클만)"""
-    profile_files = []
+def _transform_toyo_cycle(df):
+    """capacity.log 원시 DataFrame의 열 선택 및 이름 변환 (스키마 'toyo_cycle', 헤더 형식별 레이아웃)"""
+    return apply_schema(df, 'toyo_cycle')
+
+
+def load_toyo_profile_data(channel_path, max_cycles=3, compact=False):
+    """
+    Toyo 프로파일 원시 데이터 로딩 (파일명 순 처음 max_cycles개 파일, None이면 전체)
     
+    원시 열 이름/단위를 그대로 이어 붙인 기존 출력입니다 (compact=True면 compact_frame 적용).
+    파이프라인은 사이클 번호와 표준 열 이름이 붙는 load_toyo_profile_history()를 사용합니다.
+    """
     if not os.path.isdir(channel_path):
         return None
     
-    for file in os.listdir(channel_path):
-        if file.endswith('.csv') and 'cycle' in file.lower():
-            profile_files.append(file)
-    
-    profile_files.sort()
-    
+    profile_files = sorted(f for f in os.listdir(channel_path)
+                           if f.endswith('.csv') and 'cycle' in f.lower())
     if not profile_files:
         return None
     
     dataframes = []
     for file in profile_files[:max_cycles]:
         try:
-            file_path = os.path.join(channel_path, file)
-            df_temp = pd.read_csv(file_path, sep=',', skiprows=0, engine='c',
-                                 encoding='cp949', on_bad_lines='skip')
-            dataframes.append(df_temp)
-        except:
+            dataframes.append(read_raw_csv(os.path.join(channel_path, file)))
+        except Exception:
             continue
     
     if dataframes:
-        return pd.concat(dataframes, ignore_index=True)
+        df = pd.concat(dataframes, ignore_index=True)
+        return compact_frame(df) if compact else df
     else:
         return None
 
 
-# ============================================================================
-# 메인 처리 파이프라인
-# ============================================================================
+def _toyo_cycle_selection(max_cycles):
+    """파이프라인의 toyo_max_cycles → load_toyo_profile_history()의 cycles (None이면 전체)"""
+    return None if max_cycles is None else slice(0, max_cycles)
 
-def process_battery_data(paths):
-    """배터리 데이터 처리 파이프라인"""
-    results = []
-    loaded_data = {}
-    
-    print("=" * 70)
-    print("🔋 배터리 데이터 처리 파이프라인 시작")
-    print("=" * 70)
-    
-    for idx, path in enumerate(paths, 1):
-        print(f"\n[{idx}/{len(paths)}] 처리 중: {os.path.basename(path)}")
-        print("-" * 70)
-        
-        info = get_directory_info(path)
-        
-        if not info['exists']:
-            print(f"  ⚠️  경로가 존재하지 않습니다: {path}")
-            results.append(info)
-            continue
-        
-        print(f"  📁 폴더명: {info['folder_name']}")
-        print(f"  🔧 사이클러 타입: {info['cycler_type']}")
-        print(f"  ⚡ 용량: {info['capacity_mAh']} mAh" if info['capacity_mAh'] else "  ⚡ 용량: 정보 없음")
-        
-        if info['cycler_type'] == 'PNE':
-            _process_pne_data(path, info, loaded_data)
-        elif info['cycler_type'] == 'Toyo':
-            _process_toyo_data(path, info, loaded_data)
-        else:
-            print(f"  ❌ 알 수 없는 사이클러 타입")
-        
-        results.append(info)
-    
-    print("\n" + "=" * 70)
-    print("✅ 데이터 처리 완료")
-    print(f"   총 채널 수: {len(loaded_data)}개")
-    print("=" * 70)
-    
-    df_results = pd.DataFrame(results)
-    return df_results, loaded_data
 
+# Toyo 프로파일 원시 열 → 표준 열 이름 (PNE 프로파일과 같은 이름/단위, 기본 레이아웃)
+TOYO_PROFILE_COLUMNS = {spec.source: spec.name for spec in CYCLER_SCHEMAS['toyo_profile'][-1]}
+_TOYO_BATCH_SIZE = 256
+# 파일명에서 얻은 사이클 번호 열 (원시 파일의 'Cycle' 열과 구분)
+_TOYO_CYCLE_TAG = '_file_cycle'
+# 공백만 있는 줄 (앞에 줄바꿈을 붙인 본문 기준, read_csv의 skip_blank_lines와 같은 대상)
+_TOYO_BLANK_LINE = re.compile(rb'\n[ \t\r]*(?=\n|$)')
 
-def _process_pne_data(path, info, loaded_data):
-    """PNE 데이터 처리"""
-    channel_folders = find_pne_channel_folders(path)
-    
-    if not channel_folders:
-        print(f"  ⚠️  PNE 채널 폴더를 찾을 수 없습니다")
-        return
-    
-    print(f"  📊 발견된 채널: {len(channel_folders)}개")
+
+def _toyo_profile_files(channel_path):
+    """
+    Toyo 사이클 프로파일 파일 목록 [(사이클 번호, 파일명)]
     
-    for channel_path in channel_folders:
-        channel_name = os.path.basename(channel_path)
-        print(f"    - {channel_name} 로딩 중...")
-        
-        key = f"{info['folder_name']}_{channel_name}"
-        
-        loaded_data[key] = {
-            'cycler_type': 'PNE',
-            'capacity_mAh': info['capacity_mAh'],
-            'folder_name': info['folder_name'],
-            'channel_name': channel_name,
-            'cycle': None,
-            'cycle_summary': None,
-            'cycle_steps': None,
-            'profile': None
-        }
-        
-        cycle_df = load_pne_cycle_data(channel_path)
-        if cycle_df is not None and not cycle_df.empty:
-            # 전체 데이터 저장 (하위 호환성)
-            loaded_data[key]['cycle'] = cycle_df
-            
-            # Condition == 8: 사이클 대표 용량 (충방전 완료 시점)
-            cycle_summary = cycle_df[cycle_df['Condition'] == 8].copy()
-            loaded_data[key]['cycle_summary'] = cycle_summary
-            
-            # Condition != 8: 스텝별 용량
-            cycle_steps = cycle_df[cycle_df['Condition'] != 8].copy()
-            loaded_data[key]['cycle_steps'] = cycle_steps
-            
-            print(f"      ✓ 사이클 데이터: {len(cycle_df):,}행")
-            print(f"        - 사이클 대표 용량 (Condition==8): {len(cycle_summary):,}행")
-            print(f"        - 스텝별 용량 (Condition!=8): {len(cycle_steps):,}행")
-        else:
-            print(f"      ✗ 사이클 데이터 없음")
-        
-        profile_df = load_pne_profile_data(channel_path)
-        if profile_df is not None and not profile_df.empty:
-            loaded_data[key]['profile'] = profile_df
-            print(f"      ✓ 프로파일 데이터: {len(profile_df):,}행")
-        else:
-            print(f"      ✗ 프로파일 데이터 없음")
+    사이클 번호는 파일명의 마지막 숫자 (없으면 파일 순서)이며,
+    사이클 번호 순으로 정렬합니다 (cycle9 < cycle10).
+    """
+    names = sorted(f for f in os.listdir(channel_path)
+                   if f.endswith('.csv') and 'cycle' in f.lower())
+    files = []
+    for position, name in enumerate(names, 1):
+        digits = re.findall(r'\d+', os.path.splitext(name)[0])
+        files.append((int(digits[-1]) if digits else position, name))
+    files.sort()
+    return files
 
 
-def _process_toyo_data(path, info, loaded_data):
-    """Toyo 데이터 처리"""
-    channel_folders = find_toyo_channel_folders(path)
-    
-    if not channel_folders:
-        print(f"  ⚠️  Toyo 채널 폴더를 찾을 수 없습니다")
-        return
-    
-    print(f"  📊 발견된 채널: {len(channel_folders)}개")
-    
-    for channel_path in channel_folders:
-        channel_name = os.path.basename(channel_path)
-        print(f"    - 채널 {channel_name} 로딩 중...")
-        
-        key = f"{info['folder_name']}_ch{channel_name}"
-        
-        loaded_data[key] = {
-            'cycler_type': 'Toyo',
-            'capacity_mAh': info['capacity_mAh'],
-            'folder_name': info['folder_name'],
-            'channel_name': f"ch{channel_name}",
-            'cycle': None,
-            'profile': None
-        }
-        
-        cycle_df = load_toyo_cycle_data(channel_path)
-        if cycle_df is not None and not cycle_df.empty:
-            loaded_data[key]['cycle'] = cycle_df
-            print(f"      ✓ 사이클 데이터: {len(cycle_df):,}행")
-        else:
-            print(f"      ✗ 사이클 데이터 없음")
-        
-        profile_df = load_toyo_profile_data(channel_path, max_cycles=3)
-        if profile_df is not None and not profile_df.empty:
-            loaded_data[key]['profile'] = profile_df
-            print(f"      ✓ 프로파일 데이터: {len(profile_df):,}행 (처음 3 사이클)")
-        else:
-            print(f"      ✗ 프로파일 데이터 없음")
+def _select_toyo_files(files, cycles):
+    """cycles 조건에 맞는 파일만 선택 (None: 전체, slice: 파일 순서, (시작, 끝): 사이클 번호 범위)"""
+    if cycles is None:
+        return files
+    if isinstance(cycles, slice):
+        return files[cycles]
+    if isinstance(cycles, tuple) and len(cycles) == 2:
+        first, last = cycles
+        return [(c, n) for c, n in files
+                if (first is None or c >= first) and (last is None or c <= last)]
+    wanted = set(cycles)
+    return [(c, n) for c, n in files if c in wanted]
 
 
-# ============================================================================
-# Cycle List 처리
-# ============================================================================
+def _parse_toyo_header(header):
+    """헤더 줄(bytes)을 열 이름 목록으로 변환 (중복 이름은 '_'를 붙여 구분)"""
+    text = header.decode('cp949', errors='replace').strip()
+    names = []
+    for name in text.split(','):
+        name = name.strip().strip('"')
+        while name in names or name == _TOYO_CYCLE_TAG:
+            name += '_'
+        names.append(name)
+    return names
 
-def process_all_channels(data):
-    """모든 채널에 대해 cycle_list 생성 및 처리"""
-    print("="*80)
-    print("🔄 전체 채널 Cycle List 처리")
-    print("="*80)
+
+def _read_toyo_batch(channel_path, batch, backend=None):
+    """
+    Toyo 사이클 파일 묶음을 read_csv 한 번으로 파싱
     
-    for channel_key, channel_data in data['channels'].items():
-        print(f"\n처리 중: {channel_key}")
-        
-        if channel_data['profile'] is None:
-            print("  ⚠️ Profile 데이터 없음 - 건너뜀")
+    각 파일 본문의 줄 앞에 사이클 번호를 붙여 이어 붙인 뒤 파싱하므로,
+    작은 파일마다 read_csv를 호출하는 비용 없이 행마다 사이클이 태깅됩니다.
+    헤더가 다른 파일이 섞여 있으면 헤더가 같은 연속 구간별로 파싱합니다.
+    backend는 호출한 쪽의 CSV 백엔드입니다 (스레드 풀 worker는 호출한 쪽의
+    context를 물려받지 않으므로 명시적으로 전달).
+    
+    Returns:
+    --------
+    list : DataFrame 목록 (파일 순서 유지, 'Cycle' 열 포함)
+    """
+    runs = []
+    for cycle, name in batch:
+        try:
+            with open(os.path.join(channel_path, name), 'rb') as f:
+                raw = f.read()
+        except OSError:
             continue
-        
-        if isinstance(channel_data['profile'], list):
-            print("  ℹ️ 이미 처리됨 - 건너뜀")
+        header, _, body = raw.partition(b'\n')
+        header = header.rstrip(b'\r')
+        # 빈 줄은 read_csv가 건너뛰지만 사이클 번호를 붙이면 값이 없는 행이 되므로 먼저 제거
+        body = _TOYO_BLANK_LINE.sub(b'', b'\n' + body.rstrip(b'\r\n'))[1:]
+        if not body:
             continue
-        
-        df = channel_data['profile']
-        
-        cycle_list = [group.copy() for _, group in df.groupby('Cycle')]
-        
-        for cycle in cycle_list:
-            cycle['time_cyc'] = cycle['time_s'] - cycle['time_s'].iloc[0]
-        
-        if channel_data['cycle'] is not None:
-            df_cycle = channel_data['cycle']
-            
-            if 'DchgCap_mAh' in df_cycle.columns:
-                mincapa = df_cycle['DchgCap_mAh'].iloc[0]
-            elif 'Capacity_mAh' in df_cycle.columns:
-                mincapa = df_cycle['Capacity_mAh'].iloc[0]
-            else:
-                mincapa = channel_data['capacity_mAh'] or 1000
+        prefix = b'%d,' % cycle
+        body = prefix + body.replace(b'\n', b'\n' + prefix)
+        if runs and runs[-1][0] == header:
+            runs[-1][1].append(body)
         else:
-            mincapa = channel_data['capacity_mAh'] or 1000
-        
-        for cycle in cycle_list:
-            cycle['Capa_cyc'] = (cycle['Current_mA'] * cycle['time_cyc'].diff().fillna(0) / 3600).cumsum()
-            cycle['Crate'] = cycle['Current_mA'] / mincapa
-        
-        channel_data['profile'] = cycle_list
-        
-        print(f"  ✅ {len(cycle_list)}개 사이클 처리 완료")
-    
-    print("\n" + "="*80)
-    print("📋 처리 결과")
-    print("="*80)
+            runs.append((header, [body]))
     
-    processed_channels = {k: v['profile'] for k, v in data['channels'].items() if isinstance(v['profile'], list)}
-    total_channels = len(processed_channels)
-    total_cycles = sum(len(cycle_list) for cycle_list in processed_channels.values())
-    
-    print(f"\n처리된 채널 수: {total_channels}개")
-    print(f"총 사이클 수: {total_cycles}개")
+    frames = []
+    for header, bodies in runs:
+        names = [_TOYO_CYCLE_TAG] + _parse_toyo_header(header)
+        specs = _toyo_profile_specs()
+        usecols = [_TOYO_CYCLE_TAG] + [c for c in names[1:] if c in specs]
+        try:
+            parsed = [read_raw_csv(b'\n'.join(bodies), header=None, names=names, usecols=usecols,
+                                   backend=backend)]
+        except Exception:
+            # 파일 하나(인코딩 오류 등) 때문에 묶음 전체를 버리지 않도록 파일별로 다시 파싱
+            parsed = []
+            for body in bodies:
+                try:
+                    parsed.append(read_raw_csv(body, header=None, names=names, usecols=usecols,
+                                               backend=backend))
+                except Exception:
+                    continue
+        frames.extend(df.rename(columns={_TOYO_CYCLE_TAG: 'Cycle'}) for df in parsed)
+    return frames
+
+
+def _concat_preallocated(frames):
+    """
+    DataFrame 목록을 열별로 미리 할당한 배열에 채워 하나로 합치기
     
-    if processed_channels:
-        print(f"\n채널별 사이클 수:")
-        for channel_key, cycle_list in processed_channels.items():
-            print(f"  - {channel_key}: {len(cycle_list)}개")
+    pd.concat처럼 중간 블록을 만들지 않고 전체 행 수만큼 한 번 할당합니다.
+    어떤 프레임에 없는 열은 NaN으로 채웁니다.
+    """
+    columns = list(dict.fromkeys(c for df in frames for c in df.columns))
+    total = sum(len(df) for df in frames)
     
-    print("\n✅ 전체 처리 완료!")
-    print("="*80)
+    arrays = {}
+    for column in columns:
+        dtypes = [df[column].dtype for df in frames if column in df.columns]
+        if any(dtype.kind not in 'biuf' for dtype in dtypes):
+            dtype = np.dtype(object)
+        else:
+            dtype = np.result_type(*dtypes)
+            if len(dtypes) < len(frames) and dtype.kind != 'f':
+                dtype = np.result_type(dtype, np.float64)
+        out = np.empty(total, dtype=dtype)
+        position = 0
+        for df in frames:
+            n = len(df)
+            if column in df.columns:
+                out[position:position + n] = df[column].to_numpy()
+            else:
+                out[position:position + n] = np.nan
+            position += n
+        arrays[column] = out
     
-    return data
+    return pd.DataFrame(arrays, columns=columns)
 
 
-def get_channel_cycle_list(data, channel_index=0):
-    """특정 채널의 cycle_list 가져오기"""
-    channel_keys = list(data['channels'].keys())
+def _toyo_profile_specs():
+    """
+    등록된 'toyo_profile' 레이아웃을 합친 {원시 열 이름: ColumnSpec}
     
-    if channel_index >= len(channel_keys):
-        raise ValueError(f"채널 인덱스 {channel_index}가 범위를 벗어났습니다. (최대: {len(channel_keys)-1})")
+    Toyo 프로파일 파일은 헤더에 있는 열만 사용하므로 레이아웃을 하나로 고르지 않고,
+    같은 원시 열이 여러 레이아웃에 있으면 먼저 판별되는 레이아웃의 선언을 사용합니다.
+    """
+    specs = {}
+    for schema in reversed(CYCLER_SCHEMAS['toyo_profile']):
+        specs.update((spec.source, spec) for spec in schema)
+    return specs
+
+
+def _transform_toyo_profile(df, previous=None):
+    """
+    Toyo 프로파일 원시 열을 PNE 프로파일과 같은 이름/단위로 변환
     
-    channel_key = channel_keys[channel_index]
-    cycle_list = data['channels'][channel_key]['profile']
+    - Voltage_V는 PNE와 같이 mV 단위 (분류 기준값이 mV)
+    - PassTime[Sec]은 스텝마다 0부터 다시 시작하므로, 감소하는 지점을
+      스텝 시작으로 보고 이어 붙여 채널 전체의 연속 시간(time_s)을 만듭니다.
+    - previous=(직전 행 Steptime_s, 직전 행 time_s)가 주어지면 그 뒤에 이어지는
+      행으로 보고 연속 시간을 이어 계산합니다 (follow 모드의 추가 사이클).
+    """
+    specs = [spec for source, spec in _toyo_profile_specs().items() if source in df.columns]
+    df = df.rename(columns={spec.source: spec.name for spec in specs})
+    df = _scale_columns(df, specs)
     
-    print(f"선택된 채널: {channel_key}")
-    print(f"사이클 수: {len(cycle_list) if isinstance(cycle_list, list) else 0}개")
+    if 'Steptime_s' in df.columns and len(df):
+        steptime = df['Steptime_s'].to_numpy(dtype=np.float64)
+        if previous is None:
+            step = np.diff(steptime, prepend=steptime[0])
+            base = steptime[0] if np.isfinite(steptime[0]) else 0.0
+        else:
+            step = np.diff(steptime, prepend=previous[0])
+            base = previous[1]
+        restart = step < 0
+        step[restart] = steptime[restart]
+        step[np.isnan(step)] = 0
+        df['time_s'] = base + np.cumsum(step)
+        df['time_min'] = df['time_s'] / 60
+        df['time_hour'] = df['time_min'] / 60
+        df['time_day'] = df['time_hour'] / 24
     
-    return channel_key, cycle_list
+    return df
 
 
-def get_cycle_summary(data, channel_index=0):
+def load_toyo_profile_history(channel_path, cycles=None, workers=None,
+                              batch_size=_TOYO_BATCH_SIZE, compact=False):
     """
-    특정 채널의 사이클 대표 용량 가져오기 (Condition == 8)
+    Toyo 채널의 전체(또는 일부) 사이클 프로파일 로딩
+    
+    사이클 파일을 batch_size개씩 묶어 스레드로 동시에 읽고, 묶음마다
+    read_csv를 한 번만 호출한 뒤 미리 할당한 배열로 한 번에 합칩니다.
+    모든 행에 파일명에서 얻은 사이클 번호('Cycle')가 붙으므로
+    PNE와 같이 process_all_channels()에 바로 사용할 수 있습니다.
     
     Parameters:
     -----------
-    data : dict
-        process_and_combine()의 출력
-    channel_index : int
-        채널 인덱스 (기본값: 0)
+    channel_path : str
+        Toyo 채널 폴더
+    cycles : None, slice, (시작, 끝) 또는 사이클 번호 목록
+        None이면 전체, slice는 파일 순서 기준, (시작, 끝)은 사이클 번호 범위 (양 끝 포함)
+    workers : int, optional
+        동시에 읽을 스레드 수 (None이면 CPU 수, 최대 8)
+    batch_size : int
+        read_csv 한 번에 파싱할 파일 수
+    compact : bool
+        True면 compact_frame 적용
     
     Returns:
     --------
-    pd.DataFrame : 사이클 대표 용량 DataFrame (Condition == 8)
+    pd.DataFrame or None : 표준 열 이름의 프로파일 (Cycle, Steptime_s, time_s, Voltage_V, ...)
     """
-    channel_keys = list(data['channels'].keys())
+    if not os.path.isdir(channel_path):
+        return None
     
-    if channel_index >= len(channel_keys):
-        raise ValueError(f"채널 인덱스 {channel_index}가 범위를 벗어났습니다. (최대: {len(channel_keys)-1})")
+    files = _select_toyo_files(_toyo_profile_files(channel_path), cycles)
+    if not files:
+        return None
     
-    channel_key = channel_keys[channel_index]
-    cycle_summary = data['channels'][channel_key].get('cycle_summary')
+    batches = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+    if workers is None:
+        workers = min(8, os.cpu_count() or 1)
     
-    if cycle_summary is None:
-        print(f"⚠️ 채널 {channel_key}에 cycle_summary가 없습니다.")
+    backend = get_csv_backend()
+    if workers > 1 and len(batches) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+            results = list(executor.map(partial(_read_toyo_batch, channel_path, backend=backend),
+                                        batches))
     else:
-        print(f"선택된 채널: {channel_key}")
-        print(f"사이클 대표 용량 (Condition==8): {len(cycle_summary)}행")
+        results = [_read_toyo_batch(channel_path, batch, backend) for batch in batches]
     
-    return cycle_summary
+    frames = [df for frames in results for df in frames if len(df)]
+    if not frames:
+        return None
+    
+    df = _transform_toyo_profile(_concat_preallocated(frames))
+    return compact_frame(df) if compact else df
 
 
-def get_cycle_steps(data, channel_index=0):
+# ============================================================================
+# 메모리 절약 dtype (compact 모드)
+# ============================================================================
+
+# 열별 compact dtype 규칙
+#   'code'            : 작은 정수 코드 → 값 범위에 맞는 가장 작은 정수 (uint8 등)
+#   'int32'           : 사이클/행 번호 → int32
+#   ('float32', 자릿수): 측정값 → 해당 소수 자릿수까지 float32로 정확히 표현될 때만 float32
+#   'category'        : 반복되는 문자열 → pandas categorical
+COMPACT_SCHEMA = {
+    'Condition': 'code',
+    'EndState': 'code',
+    'step': 'code',
+    'Cycle': 'int32',
+    'index': 'int32',
+    'imp': 'int32',
+    'ChgPow_mW': 'int32',
+    'DchgPow_mW': 'int32',
+    'Voltage_V': ('float32', 3),
+    'Current_mA': ('float32', 3),
+    'Temp_C': ('float32', 3),
+    'ChgCap_mAh': ('float32', 3),
+    'DchgCap_mAh': ('float32', 3),
+    'OCV_mV': ('float32', 3),
+    'VoltageMax_mV': ('float32', 3),
+    'Steptime_s': ('float32', 2),
+    'Capacity_mAh': ('float32', 4),
+    'OCV_V': ('float32', 4),
+    'AvgVolt_V': ('float32', 4),
+    'category': 'category',
+}
+
+
+def _is_integral(values):
+    """NaN 없이 모두 정수값인지"""
+    if values.dtype.kind in 'iu':
+        return True
+    if values.dtype.kind != 'f':
+        return False
+    return bool(np.isfinite(values).all() and (values == np.round(values)).all())
+
+
+def _compact_column(series, rule):
+    """열 하나를 규칙에 맞게 변환 (정밀도가 부족하면 원래 dtype 유지)"""
+    values = series.to_numpy()
+    
+    if rule == 'category':
+        if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+            return series.astype('category')
+        return series
+    
+    if values.dtype.kind not in 'iuf' or len(values) == 0:
+        return series
+    
+    if rule in ('code', 'int32'):
+        if not _is_integral(values):
+            return series
+        if rule == 'code':
+            return pd.to_numeric(series, downcast='unsigned' if values.min() >= 0 else 'integer')
+        info = np.iinfo(np.int32)
+        if values.min() >= info.min and values.max() <= info.max:
+            return series.astype(np.int32)
+        return series
+    
+    dtype, decimals = rule
+    if values.dtype == np.float32 or values.dtype.kind != 'f':
+        return series
+    as_float32 = values.astype(np.float32)
+    if np.array_equal(np.round(as_float32.astype(np.float64), decimals),
+                      np.round(values, decimals), equal_nan=True):
+        return series.astype(np.float32)
+    return series
+
+
+def compact_frame(df, schema=None, inplace=False):
     """
-    특정 채널의 스텝별 용량 가져오기 (Condition != 8)
+    DataFrame 열을 compact dtype으로 변환
     
     Parameters:
     -----------
-    data : dict
-        process_and_combine()의 출력
-    channel_index : int
-        채널 인덱스 (기본값: 0)
+    df : pd.DataFrame
+        로딩된 사이클/프로파일 DataFrame
+    schema : dict, optional
+        {열 이름: 규칙} (None이면 COMPACT_SCHEMA)
+    inplace : bool
+        True면 df의 열을 직접 교체 (CycleList.frame처럼 참조가 공유된 경우)
     
     Returns:
     --------
-    pd.DataFrame : 스텝별 용량 DataFrame (Condition != 8)
+    pd.DataFrame : 변환된 DataFrame
     """
-    channel_keys = list(data['channels'].keys())
-    
-    if channel_index >= len(channel_keys):
-        raise ValueError(f"채널 인덱스 {channel_index}가 범위를 벗어났습니다. (최대: {len(channel_keys)-1})")
+    if df is None:
+        return None
+    schema = COMPACT_SCHEMA if schema is None else schema
+    if not inplace:
+        df = df.copy(deep=False)
     
-    channel_key = channel_keys[channel_index]
-    cycle_steps = data['channels'][channel_key].get('cycle_steps')
+    for column, rule in schema.items():
+        if column in df.columns:
+            converted = _compact_column(df[column], rule)
+            if converted is not df[column]:
+                df[column] = converted
     
-    if cycle_steps is None:
-        print(f"⚠️ 채널 {channel_key}에 cycle_steps가 없습니다.")
-    else:
-        print(f"선택된 채널: {channel_key}")
-        print(f"스텝별 용량 (Condition!=8): {len(cycle_steps)}행")
+    if not isinstance(df.index, pd.RangeIndex) and df.index.dtype.kind in 'iu' and len(df.index):
+        info = np.iinfo(np.int32)
+        if df.index.min() >= info.min and df.index.max() <= info.max:
+            df.index = df.index.astype(np.int32)
     
-    return cycle_steps
+    return df
 
 
-# ============================================================================
-# 사이클 분류
-# ============================================================================
+def _frame_of(value):
+    """채널 필드 값에서 DataFrame 추출 (CycleList는 frame)"""
+    if isinstance(value, CycleList):
+        return value.frame
+    if isinstance(value, pd.DataFrame):
+        return value
+    return None
 
-def categorize_cycle(cycle_df, cycle_index):
-    """데이터 특성 기반 사이클 분류"""
-    n_points = len(cycle_df)
-    voltage_range = cycle_df['Voltage_V'].max() - cycle_df['Voltage_V'].min()
-    
-    endstate_78_ratio = (cycle_df['EndState'] == 78).sum() / n_points
-    endstate_64_ratio = (cycle_df['EndState'] == 64).sum() / n_points
+
+def memory_report(data):
+    """
+    채널/데이터 타입별 행 수와 행당 메모리 (bytes)
     
-    if 'Crate' in cycle_df.columns:
-        crate_max = cycle_df['Crate'].abs().max()
-    else:
-        crate_max = 0
+    Returns:
+    --------
+    pd.DataFrame : channel, data_type, rows, bytes, bytes_per_row
+    """
+    rows = []
+    for channel_key, channel_data in data['channels'].items():
+        for field in CHANNEL_FRAME_FIELDS.get(channel_data['cycler_type'], ()):
+            df = _frame_of(channel_data.get(field))
+            if df is None or len(df) == 0:
+                continue
+            nbytes = int(df.memory_usage(index=True, deep=True).sum())
+            rows.append({'channel': channel_key, 'data_type': field, 'rows': len(df),
+                         'bytes': nbytes, 'bytes_per_row': nbytes / len(df)})
+    return pd.DataFrame(rows, columns=['channel', 'data_type', 'rows', 'bytes', 'bytes_per_row'])
+
+
+def compact_channels(data, schema=None):
+    """
+    이미 로딩된 모든 채널의 DataFrame을 compact dtype으로 변환
     
-    if n_points > 10000:
-        return 'Resistance_Measurement'
+    Returns:
+    --------
+    pd.DataFrame : 채널/데이터 타입별 변환 전후 행당 bytes 리포트
+    """
+    before = memory_report(data)
     
-    if endstate_78_ratio > 0.5 and cycle_index < 500:
-        return 'SOC_Definition'
+    for channel_key, channel_data in data['channels'].items():
+        for field in CHANNEL_FRAME_FIELDS.get(channel_data['cycler_type'], ()):
+            value = channel_data.get(field)
+            if isinstance(value, CycleList):
+                compact_frame(value.frame, schema, inplace=True)
+                channel_data[field] = value
+            elif isinstance(value, pd.DataFrame):
+                channel_data[field] = compact_frame(value, schema)
     
-    if voltage_range < 1400 and crate_max > 1.5:
-        return 'Accelerated_Aging'
+    after = memory_report(data)
+    report = before.merge(after[['channel', 'data_type', 'bytes', 'bytes_per_row']],
+                          on=['channel', 'data_type'], suffixes=('_before', '_after'))
+    report['reduction_pct'] = (1 - report['bytes_after'] / report['bytes_before']) * 100
     
-    if endstate_64_ratio > 0.90 and voltage_range > 1400:
-        return 'RPT'
+    total_before = report['bytes_before'].sum()
+    total_after = report['bytes_after'].sum()
+    _log("=" * 70)
+    _log("🗜️  compact dtype 변환")
+    _log("=" * 70)
+    for data_type, group in report.groupby('data_type', sort=False):
+        rows = group['rows'].sum()
+        _log(f"  - {data_type}: {group['bytes_before'].sum() / rows:.1f} → "
+              f"{group['bytes_after'].sum() / rows:.1f} bytes/행")
+    if total_before:
+        _log(f"  전체: {total_before / (1024 * 1024):.2f} MB → {total_after / (1024 * 1024):.2f} MB "
+              f"({(1 - total_after / total_before) * 100:.1f}% 감소)")
+    _log("=" * 70)
     
-    return 'Unknown'
+    return report
 
 
-def categorize_cycles(cycle_list):
-    """전체 cycle_list를 분류"""
-    categories = {
-        'Unknown': [],
-        'RPT': [],
-        'SOC_Definition': [],
-        'Resistance_Measurement': [],
-        'Accelerated_Aging': []
-    }
-    
-    for idx, cycle in enumerate(cycle_list):
-        category = categorize_cycle(cycle, idx)
-        categories[category].append(idx)
-    
-    return categories
+# ============================================================================
+# 계측 (단계/채널별 시간, 행 수, 읽은 bytes, 메모리) 및 출력 제어
+# ============================================================================
 
+# 현재 활성화된 계측 설정 (instrument()로 변경)
+# ContextVar이므로 동시에 실행되는 asyncio 작업 / to_thread 호출은 각자의 설정을 가집니다.
+_quiet = contextvars.ContextVar('battery_quiet', default=False)
+_report = contextvars.ContextVar('battery_report', default=None)
+# 실행 중인 단계의 카운터 (채널 기록의 bytes_read를 단계에 합산, 바깥 단계부터)
+_stages = contextvars.ContextVar('battery_stages', default=())
 
-def add_category_labels(cycle_list, categories=None):
-    """각 사이클에 카테고리 라벨을 추가"""
-    if categories is None:
-        categories = categorize_cycles(cycle_list)
-    
-    for category, indices in categories.items():
-        for idx in indices:
-            cycle_list[idx]['category'] = category
-    
-    return categories
 
+def _log(*args, **kwargs):
+    """진행 상황 출력 (quiet 모드에서는 출력하지 않음)"""
+    if not _quiet.get():
+        print(*args, **kwargs)
 
-def print_categorization_report(cycle_list, categories):
-    """분류 결과 리포트 출력"""
-    print("=" * 80)
-    print("📊 사이클 분류 결과")
-    print("=" * 80)
-    print()
-    
-    for category, indices in categories.items():
-        print(f"\n[{category}]")
-        print(f"  총 {len(indices)}개 사이클")
-        
-        if indices:
-            print(f"  사이클 인덱스: {indices[:10]}")
-            if len(indices) > 10:
-                print(f"  ... 외 {len(indices) - 10}개")
-            
-            first_idx = indices[0]
-            cycle = cycle_list[first_idx]
-            
-            print(f"\n  [대표 사이클 {first_idx} 특성]")
-            
-            v_min = cycle['Voltage_V'].min()
-            v_max = cycle['Voltage_V'].max()
-            v_range = v_max - v_min
-            print(f"    - Voltage 범위: {v_min:.0f} ~ {v_max:.0f} mV (범위: {v_range:.0f} mV)")
-            
-            endstate_counts = cycle['EndState'].value_counts()
-            endstate_str = ", ".join([f"{int(k)}({v}회)" for k, v in endstate_counts.head(3).items()])
-            print(f"    - EndState 패턴: {endstate_str}")
-            
-            condition_counts = cycle['Condition'].value_counts()
-            condition_map = {1: '충전', 2: '방전', 3: 'Rest'}
-            condition_str = ", ".join([f"{condition_map.get(k, k)}({v}회)" for k, v in condition_counts.items()])
-            print(f"    - Condition: {condition_str}")
-            
-            if 'Crate' in cycle.columns:
-                crate_abs = cycle['Crate'].abs()
-                print(f"    - C-rate: 평균 {crate_abs.mean():.3f}C, 최대 {crate_abs.max():.3f}C")
-    
-    print("\n" + "=" * 80)
 
+def _current_rss():
+    """현재 프로세스 RSS (bytes, /proc 없으면 None)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
 
-# ============================================================================
-# 채널 카테고리화
-# ============================================================================
 
-def categorize_all_channels(data):
-    """data 객체의 모든 채널에 대해 사이클 카테고리화 수행"""
-    print("="*80)
-    print("🏷️  전체 채널 사이클 카테고리화")
-    print("="*80)
-    
-    for channel_key, channel_data in data['channels'].items():
-        print(f"\n처리 중: {channel_key}")
-        
-        cycle_list = channel_data['profile']
-        
-        if not isinstance(cycle_list, list):
-            print("  ⚠️ Cycle list가 아님 - 건너뜀")
-            continue
-        
-        categories = categorize_cycles(cycle_list)
-        
-        for category, indices in categories.items():
-            for idx in indices:
-                cycle_list[idx]['category'] = category
-        
-        channel_data['cycle_list'] = categories
-        
-        total_cycles = sum(len(indices) for indices in categories.values())
-        print(f"  ✅ {total_cycles}개 사이클 분류 완료")
-        for category, indices in categories.items():
-            if indices:
-                print(f"    - {category}: {len(indices)}개")
+class _PeakRssSampler:
+    """구간 안의 최대 RSS를 백그라운드 스레드로 측정하는 context manager"""
     
-    print("\n" + "="*80)
-    print("📋 카테고리화 결과 요약")
-    print("="*80)
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.start = None
+        self.end = None
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
     
-    processed_channels = [k for k, v in data['channels'].items() if 'cycle_list' in v]
-    total_channels = len(processed_channels)
-    print(f"\n처리된 채널 수: {total_channels}개")
-    
-    total_stats = {
-        'Unknown': 0,
-        'RPT': 0,
-        'SOC_Definition': 0,
-        'Resistance_Measurement': 0,
-        'Accelerated_Aging': 0
-    }
-    
-    for channel_key in processed_channels:
-        categories = data['channels'][channel_key]['cycle_list']
-        for category, indices in categories.items():
-            total_stats[category] += len(indices)
+    def _sample(self):
+        rss = _current_rss()
+        if rss is not None:
+            self.peak = rss if self.peak is None else max(self.peak, rss)
+        return rss
     
-    print("\n전체 카테고리별 사이클 수:")
-    for category, count in total_stats.items():
-        if count > 0:
-            print(f"  - {category}: {count}개")
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
     
-    print("\n✅ 전체 카테고리화 완료!")
-    print("="*80)
+    def __enter__(self):
+        self.start = self._sample()
+        if self.peak is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
     
-    return data
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.end = self._sample()
+        if self.peak is None:
+            # /proc이 없는 환경: 프로세스 전체 최대 RSS로 대체
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.peak = peak if sys.platform == 'darwin' else peak * 1024
+        return False
 
 
-def get_category_cycles(data, channel_index=0, category='RPT'):
-    """특정 채널의 특정 카테고리 사이클 가져오기"""
-    channel_keys = list(data['channels'].keys())
+REPORT_COLUMNS = ['stage', 'channel', 'wall_s', 'rows', 'bytes_read',
+                  'rss_delta_mb', 'peak_rss_mb', 'timestamp']
+
+
+class PipelineReport:
+    """
+    파이프라인 계측 결과
     
-    if channel_index >= len(channel_keys):
-        raise ValueError(f"채널 인덱스 {channel_index}가 범위를 벗어났습니다.")
+    단계(stage) 전체 기록은 channel이 None이고, 채널별 기록은 채널 키를
+    가집니다. hook이 주어지면 기록이 추가될 때마다 hook(record)를 호출합니다.
     
-    channel_key = channel_keys[channel_index]
-    channel_data = data['channels'][channel_key]
+    - wall_s: 실행 시간 (초)
+    - rows: 처리한 행 수 (로딩은 로딩 후 채널의 원시 사이클/프로파일 행 수)
+    - bytes_read: 원시 파일에서 읽은 bytes (로딩 단계)
+    - rss_delta_mb: 시작 대비 종료 시점 RSS 변화 (병렬 로딩은 worker 프로세스 기준)
+    - peak_rss_mb: 구간 중 최대 RSS (단계 기록만)
+    """
     
-    if 'cycle_list' not in channel_data:
-        raise ValueError(f"채널 {channel_key}에 cycle_list가 없습니다.")
+    def __init__(self, hook=None):
+        self.hook = hook
+        self.records = []
     
-    categories = channel_data['cycle_list']
+    def add(self, stage, channel=None, wall_s=0.0, rows=0, bytes_read=0,
+            rss_delta_mb=None, peak_rss_mb=None):
+        record = {'stage': stage, 'channel': channel, 'wall_s': wall_s, 'rows': rows,
+                  'bytes_read': bytes_read, 'rss_delta_mb': rss_delta_mb,
+                  'peak_rss_mb': peak_rss_mb, 'timestamp': time.time()}
+        self.records.append(record)
+        if self.hook is not None:
+            self.hook(record)
+        return record
     
-    if category not in categories:
-        raise ValueError(f"카테고리 '{category}'가 존재하지 않습니다.")
+    def to_dataframe(self):
+        """기록 전체 (1행 = 단계 또는 채널 1개)"""
+        return pd.DataFrame(self.records, columns=REPORT_COLUMNS)
     
-    indices = categories[category]
-    profile = channel_data['profile']
+    def to_json(self, path=None):
+        """기록을 JSON 문자열로 변환 (path가 주어지면 파일로 저장)"""
+        text = json.dumps({'records': self.records}, ensure_ascii=False, indent=2,
+                          default=_json_default)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return text
     
-    return [profile[i] for i in indices]
+    def summary(self):
+        """
+        단계별 합계 (기록 순서)
+        
+        Returns:
+        --------
+        pd.DataFrame : stage, records, channels, wall_s, rows, bytes_read, rows_per_s, peak_rss_mb
+        """
+        df = self.to_dataframe()
+        summary = df.groupby('stage', sort=False).agg(
+            records=('stage', 'size'), channels=('channel', 'count'),
+            wall_s=('wall_s', 'sum'), rows=('rows', 'sum'),
+            bytes_read=('bytes_read', 'sum'), peak_rss_mb=('peak_rss_mb', 'max')).reset_index()
+        summary['rows_per_s'] = summary['rows'] / summary['wall_s'].where(summary['wall_s'] > 0)
+        return summary[['stage', 'records', 'channels', 'wall_s', 'rows', 'bytes_read',
+                        'rows_per_s', 'peak_rss_mb']]
 
 
-# ============================================================================
-# 데이터 통합 및 변환
-# ============================================================================
+@contextlib.contextmanager
+def instrument(quiet=False, hook=None, report=None):
+    """
+    블록 안에서 실행되는 파이프라인 함수의 단계/채널별 계측
+    
+    Parameters:
+    -----------
+    quiet : bool
+        True면 진행 상황 출력을 끔
+    hook : callable, optional
+        기록마다 hook(record: dict) 호출 (외부 메트릭 수집기 연결용)
+    report : PipelineReport, optional
+        이어서 기록할 리포트 (None이면 새로 생성)
+    
+    Example:
+    --------
+    >>> with instrument(quiet=True) as report:
+    ...     data = process_and_combine(paths)
+    ...     data = process_all_channels(data)
+    >>> report.to_dataframe()
+    """
+    report = PipelineReport(hook) if report is None else report
+    quiet_token = _quiet.set(quiet)
+    report_token = _report.set(report)
+    try:
+        yield report
+    finally:
+        _report.reset(report_token)
+        _quiet.reset(quiet_token)
+
 
-def process_and_combine(paths):
-    """paths를 입력받아 데이터 로드 및 통합"""
-    df_results, loaded_data = process_battery_data(paths)
+@contextlib.contextmanager
+def _stage(stage):
+    """
+    단계 하나를 계측 (리포트가 없으면 아무것도 하지 않음)
     
-    cycler_types = {}
-    for channel_data in loaded_data.values():
-        cycler_type = channel_data['cycler_type']
-        cycler_types[cycler_type] = cycler_types.get(cycler_type, 0) + 1
+    블록 안의 채널 기록(_record_channel) rows / bytes_read가 단계 기록에 합산됩니다.
+    """
+    report = _report.get()
+    counters = {'rows': 0, 'bytes_read': 0}
+    if report is None:
+        yield counters
+        return
     
-    result = {
-        'metadata': {
-            'total_channels': len(loaded_data),
-            'total_paths': len(paths),
-            'cycler_types': cycler_types,
-            'paths': paths
-        },
-        'channels': loaded_data
-    }
+    token = _stages.set(_stages.get() + (counters,))
+    with _PeakRssSampler() as rss:
+        start = time.perf_counter()
+        try:
+            yield counters
+        finally:
+            wall_s = time.perf_counter() - start
+            _stages.reset(token)
+    report.add(stage, wall_s=wall_s, rows=counters['rows'], bytes_read=counters['bytes_read'],
+               rss_delta_mb=_mb(rss.end - rss.start) if rss.start is not None else None,
+               peak_rss_mb=_mb(rss.peak))
+
+
+def _timed_stage(stage):
+    """
+    함수 전체를 단계 하나로 계측하는 decorator
     
-    return result
+    단계의 rows / bytes_read는 함수 안에서 기록된 채널 기록의 합입니다.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
 
 
-def combine_to_dataframe(loaded_data):
-    """채널 기반 loaded_data를 통합 DataFrame으로 변환"""
-    all_data = []
+def _record_channel(stage, channel, wall_s, rows=0, bytes_read=0, rss_delta=None):
+    """채널 하나의 계측 기록 추가 (리포트가 없으면 무시)"""
+    report = _report.get()
+    if report is None:
+        return
+    report.add(stage, channel, wall_s=wall_s, rows=rows, bytes_read=bytes_read,
+               rss_delta_mb=_mb(rss_delta))
+    stages = _stages.get()
+    if stages:
+        stages[-1]['rows'] += rows
+        stages[-1]['bytes_read'] += bytes_read
+
+
+def _mb(nbytes):
+    """bytes → MB (None 유지)"""
+    return None if nbytes is None else nbytes / (1024 * 1024)
+
+
+def _timed_call(func, *args):
+    """
+    func(*args) 실행 결과와 실행 시간, RSS 변화 반환 (worker 실행 단위)
     
-    for channel_key, channel_data in loaded_data.items():
-        if channel_data['cycle'] is not None and len(channel_data['cycle']) > 0:
-            df_temp = channel_data['cycle'].copy()
-            df_temp['channel'] = channel_key
-            df_temp['cycler_type'] = channel_data['cycler_type']
-            df_temp['capacity_mAh_meta'] = channel_data['capacity_mAh']
-            df_temp['folder_name'] = channel_data['folder_name']
-            df_temp['data_type'] = 'cycle'
-            all_data.append(df_temp)
-        
-        if channel_data['profile'] is not None and len(channel_data['profile']) > 0:
-            df_temp = channel_data['profile'].copy()
-            df_temp['channel'] = channel_key
-            df_temp['cycler_type'] = channel_data['cycler_type']
-            df_temp['capacity_mAh_meta'] = channel_data['capacity_mAh']
-            df_temp['folder_name'] = channel_data['folder_name']
-            df_temp['data_type'] = 'profile'
-            all_data.append(df_temp)
+    Returns:
+    --------
+    tuple : (결과, 실행 시간 s, RSS 변화 bytes 또는 None)
+    """
+    rss_start = _current_rss()
+    start = time.perf_counter()
+    result = func(*args)
+    wall_s = time.perf_counter() - start
+    rss_end = _current_rss()
+    rss_delta = rss_end - rss_start if rss_start is not None and rss_end is not None else None
+    return result, wall_s, rss_delta
+
+
+def _channel_rows(channel_data):
+    """채널에 로딩된 원시 사이클/프로파일 행 수"""
+    rows = 0
+    for field in ('cycle', 'profile'):
+        value = channel_data.get(field)
+        if isinstance(value, CycleList):
+            rows += len(value.frame)
+        elif isinstance(value, pd.DataFrame):
+            rows += len(value)
+    return rows
+
+
+def _channel_bytes_read(channel_data, loader_args, result, previous_entry=None):
+    """
+    채널 로딩에서 읽은 원시 파일 bytes
     
-    if all_data:
-        combined_df = pd.concat(all_data, ignore_index=True)
-        
-        meta_cols = ['channel', 'cycler_type', 'data_type', 'folder_name']
-        if 'Cycle' in combined_df.columns:
-            meta_cols.append('Cycle')
-        
-        other_cols = [col for col in combined_df.columns if col not in meta_cols]
-        combined_df = combined_df[meta_cols + other_cols]
-        
-        return combined_df
+    증분 모드는 manifest의 읽은 위치(offset) 차이, 전체 로딩은 로딩 대상 파일 크기 합입니다.
+    """
+    if isinstance(result, dict) and 'manifest' in result:
+        files = result['manifest']['files']
+        old_files = ((previous_entry or {}).get('manifest') or {}).get('files') or {}
+        if result.get('reset') or not old_files:
+            return sum(state['offset'] for state in files.values())
+        if channel_data['cycler_type'] == 'Toyo':
+            return 0
+        return sum(max(state['offset'] - old_files.get(name, {}).get('offset', 0), 0)
+                   for name, state in files.items())
+    
+    return sum(os.path.getsize(file_path)
+               for file_path in _channel_source_files(channel_data['cycler_type'], loader_args))
+
+
+def _channel_source_files(cycler_type, loader_args):
+    """전체 로딩에서 채널 로딩 함수가 읽는 원시 파일 경로 목록"""
+    channel_path = loader_args[0]
+    if cycler_type == 'PNE':
+        folder = os.path.join(channel_path, 'Restore')
+        names = [f for f in os.listdir(folder)
+                 if f.endswith('.csv') and ('SaveData' in f or f == 'SaveEndData.csv')] \
+            if os.path.isdir(folder) else []
     else:
-        return pd.DataFrame()
+        folder = channel_path
+        max_cycles = loader_args[2] if len(loader_args) > 2 else 3
+        names = [name for _, name in _toyo_profile_files(channel_path)] \
+            if os.path.isdir(channel_path) else []
+        if max_cycles is not None:
+            names = names[:max_cycles]
+        if os.path.isfile(os.path.join(channel_path, 'capacity.log')):
+            names.append('capacity.log')
+    return [os.path.join(folder, name) for name in names]
 
 
 # ============================================================================
-# 데이터 저장/로드
+# 메인 처리 파이프라인
 # ============================================================================
 
-def _generate_filename_from_metadata(data):
-    """metadata에서 자동으로 파일명 생성"""
-    metadata = data['metadata']
+@_timed_stage('process_battery_data')
+def process_battery_data(paths, workers=None, use_processes=True, previous=None, compact=False,
+                         toyo_max_cycles=3):
+    """
+    배터리 데이터 처리 파이프라인
     
-    cycler_types = sorted(metadata['cycler_types'].keys())
-    cycler_str = '_'.join(cycler_types)
+    Parameters:
+    -----------
+    paths : list of str
+        분석할 경로 리스트
+    workers : int, optional
+        채널 병렬 로딩 worker 수 (None 또는 1: 순차 로딩, -1: CPU 코어 수)
+    use_processes : bool
+        True면 프로세스 풀 사용 (생성 실패 시 스레드 풀로 대체)
+    previous : dict, optional
+        이전 실행의 채널 dict (data['channels']). 주어지면 증분 모드로
+        manifest 이후 추가된 데이터만 파싱하여 병합합니다.
+    compact : bool
+        True면 로딩한 DataFrame에 compact_frame()을 적용 (worker에서 변환)
+    toyo_max_cycles : int or None
+        Toyo 채널에서 읽을 프로파일 사이클 파일 수 (None이면 전체 이력)
     
-    if metadata['paths']:
-        first_path = metadata['paths'][0]
-        folder_name = os.path.basename(first_path.rstrip('/\\'))
-    else:
-        folder_name = 'unknown'
+    Returns:
+    --------
+    tuple : (경로별 정보 DataFrame, 채널별 loaded_data dict)
+    """
+    loaded_data = {}
+    
+    if workers is not None and workers < 1:
+        workers = os.cpu_count() or 1
+    parallel = workers is not None and workers > 1
+    tasks = [] if parallel else None
+    
+    _log("=" * 70)
+    _log("🔋 배터리 데이터 처리 파이프라인 시작" + (" (증분 모드)" if previous is not None else ""))
+    _log("=" * 70)
+    
+    results = _scan_paths(paths, loaded_data, tasks, previous, compact, toyo_max_cycles)
+    
+    if tasks:
+        _load_channels_parallel(tasks, loaded_data, workers, use_processes, previous)
+    
+    _log_pipeline_done(results, loaded_data)
+    
+    df_results = pd.DataFrame(results)
+    return df_results, loaded_data
+
+
+def _scan_paths(paths, loaded_data, tasks, previous=None, compact=False, toyo_max_cycles=3):
+    """
+    경로별 채널 탐색 및 채널 항목 생성 (tasks가 주어지면 로딩 작업만 등록)
+    
+    Returns:
+    --------
+    list : 경로별 정보 dict
+    """
+    results = []
+    for idx, path in enumerate(paths, 1):
+        _log(f"\n[{idx}/{len(paths)}] 처리 중: {os.path.basename(path)}")
+        _log("-" * 70)
+        
+        info = get_directory_info(path)
+        info['failed_channels'] = []
+        
+        if not info['exists']:
+            _log(f"  ⚠️  경로가 존재하지 않습니다: {path}")
+            results.append(info)
+            continue
+        
+        _log(f"  📁 폴더명: {info['folder_name']}")
+        _log(f"  🔧 사이클러 타입: {info['cycler_type']}")
+        _log(f"  ⚡ 용량: {info['capacity_mAh']} mAh" if info['capacity_mAh'] else "  ⚡ 용량: 정보 없음")
+        
+        if info['cycler_type'] == 'PNE':
+            _process_pne_data(path, info, loaded_data, tasks, previous, compact)
+        elif info['cycler_type'] == 'Toyo':
+            _process_toyo_data(path, info, loaded_data, tasks, previous, compact, toyo_max_cycles)
+        else:
+            _log(f"  ❌ 알 수 없는 사이클러 타입")
+        
+        results.append(info)
+    return results
+
+
+def _log_pipeline_done(results, loaded_data):
+    """파이프라인 완료 요약 출력"""
+    _log("\n" + "=" * 70)
+    _log("✅ 데이터 처리 완료")
+    _log(f"   총 채널 수: {len(loaded_data)}개")
+    failed = sum(len(info['failed_channels']) for info in results)
+    if failed:
+        _log(f"   ❌ 로딩 실패 채널 수: {failed}개")
+    _log("=" * 70)
+
+
+def _load_pne_channel(channel_path, compact=False):
+    """PNE 채널 하나의 사이클/프로파일 데이터 로딩 (worker 실행 단위)"""
+    return (load_pne_cycle_data(channel_path, compact=compact),
+            load_pne_profile_data(channel_path, compact=compact))
+
+
+def _load_toyo_channel(channel_path, compact=False, max_cycles=3):
+    """Toyo 채널 하나의 사이클/프로파일 데이터 로딩 (worker 실행 단위)"""
+    return (load_toyo_cycle_data(channel_path, compact=compact),
+            load_toyo_profile_history(channel_path, cycles=_toyo_cycle_selection(max_cycles),
+                                      compact=compact))
+
+
+# 지원하는 사이클러 타입 (build_cycle_panel()의 cycler_type 범주 순서)
+CYCLER_TYPES = ('PNE', 'Toyo')
+
+# 사이클러 타입별 채널 항목의 DataFrame 필드
+CHANNEL_FRAME_FIELDS = {
+    'PNE': ('cycle', 'cycle_summary', 'cycle_steps', 'profile'),
+    'Toyo': ('cycle', 'profile'),
+}
+
+
+def _new_channel_entry(cycler_type, info, channel_name):
+    """채널 키와 비어 있는 채널 항목 생성 (DataFrame 필드는 None)"""
+    if cycler_type == 'Toyo':
+        channel_name = f"ch{channel_name}"
+    key = f"{info['folder_name']}_{channel_name}"
+    
+    entry = {
+        'cycler_type': cycler_type,
+        'capacity_mAh': info['capacity_mAh'],
+        'folder_name': info['folder_name'],
+        'channel_name': channel_name,
+    }
+    entry.update({field: None for field in CHANNEL_FRAME_FIELDS[cycler_type]})
+    return key, entry
+
+
+def _process_pne_data(path, info, loaded_data, tasks=None, previous=None, compact=False):
+    """PNE 데이터 처리 (tasks가 주어지면 로딩 작업만 등록)"""
+    channel_folders = find_pne_channel_folders(path)
+    
+    if not channel_folders:
+        _log(f"  ⚠️  PNE 채널 폴더를 찾을 수 없습니다")
+        return
+    
+    _log(f"  📊 발견된 채널: {len(channel_folders)}개")
+    
+    for channel_path in channel_folders:
+        channel_name = os.path.basename(channel_path)
+        
+        key, loaded_data[key] = _new_channel_entry('PNE', info, channel_name)
+        
+        _dispatch_channel(key, channel_path, info, loaded_data, tasks, previous, (compact,),
+                          f"    - {channel_name} 로딩 중...")
+
+
+def _store_pne_channel(channel_data, result, previous_entry=None):
+    """로딩된 PNE 데이터를 채널 항목에 저장"""
+    cycle_df, profile_df = result
+    
+    if cycle_df is not None and not cycle_df.empty:
+        channel_data.update(_pne_cycle_fields(cycle_df))
+        
+        _log(f"      ✓ 사이클 데이터: {len(cycle_df):,}행")
+        _log(f"        - 사이클 대표 용량 (Condition==8): {len(channel_data['cycle_summary']):,}행")
+        _log(f"        - 스텝별 용량 (Condition!=8): {len(channel_data['cycle_steps']):,}행")
+    else:
+        _log(f"      ✗ 사이클 데이터 없음")
+    
+    if profile_df is not None and not profile_df.empty:
+        channel_data['profile'] = profile_df
+        _log(f"      ✓ 프로파일 데이터: {len(profile_df):,}행")
+    else:
+        _log(f"      ✗ 프로파일 데이터 없음")
+
+
+def _pne_cycle_fields(cycle_df):
+    """PNE 사이클 데이터를 cycle / cycle_summary / cycle_steps 필드로 분리"""
+    return {
+        # 전체 데이터 저장 (하위 호환성)
+        'cycle': cycle_df,
+        # Condition == 8: 사이클 대표 용량 (충방전 완료 시점)
+        'cycle_summary': cycle_df[cycle_df['Condition'] == 8].copy(),
+        # Condition != 8: 스텝별 용량
+        'cycle_steps': cycle_df[cycle_df['Condition'] != 8].copy(),
+    }
+
+
+def _process_toyo_data(path, info, loaded_data, tasks=None, previous=None, compact=False,
+                       max_cycles=3):
+    """Toyo 데이터 처리 (tasks가 주어지면 로딩 작업만 등록)"""
+    channel_folders = find_toyo_channel_folders(path)
+    
+    if not channel_folders:
+        _log(f"  ⚠️  Toyo 채널 폴더를 찾을 수 없습니다")
+        return
+    
+    _log(f"  📊 발견된 채널: {len(channel_folders)}개")
+    
+    for channel_path in channel_folders:
+        channel_name = os.path.basename(channel_path)
+        
+        key, loaded_data[key] = _new_channel_entry('Toyo', info, channel_name)
+        
+        _dispatch_channel(key, channel_path, info, loaded_data, tasks, previous,
+                          (compact, max_cycles), f"    - 채널 {channel_name} 로딩 중...")
+
+
+def _store_toyo_channel(channel_data, result, previous_entry=None):
+    """로딩된 Toyo 데이터를 채널 항목에 저장"""
+    cycle_df, profile_df = result
+    
+    if cycle_df is not None and not cycle_df.empty:
+        channel_data['cycle'] = cycle_df
+        _log(f"      ✓ 사이클 데이터: {len(cycle_df):,}행")
+    else:
+        _log(f"      ✗ 사이클 데이터 없음")
+    
+    if profile_df is not None and not profile_df.empty:
+        channel_data['profile'] = profile_df
+        _log(f"      ✓ 프로파일 데이터: {len(profile_df):,}행 ({profile_df['Cycle'].nunique():,}개 사이클)")
+    else:
+        _log(f"      ✗ 프로파일 데이터 없음")
+
+
+def _report_channel_failure(info, channel_name, error):
+    """채널 로딩 실패를 경로 정보(info['failed_channels'])에 기록"""
+    _log(f"      ❌ {channel_name} 로딩 실패: {error}")
+    info['failed_channels'].append({'channel_name': channel_name, 'error': repr(error)})
+
+
+def _channel_handlers(cycler_type, incremental=False):
+    """사이클러 타입/모드별 (로딩 함수, 저장 함수) 반환"""
+    if incremental:
+        return _INCREMENTAL_CHANNEL_LOADERS[cycler_type]
+    return _CHANNEL_LOADERS[cycler_type]
+
+
+def _dispatch_channel(key, channel_path, info, loaded_data, tasks, previous, options, message):
+    """
+    채널 로딩 작업을 tasks에 등록하거나 즉시 로딩하여 저장
+    
+    options는 로딩 함수의 채널 경로(증분 모드는 manifest) 뒤에 붙는 인자 튜플입니다.
+    """
+    channel_data = loaded_data[key]
+    loader, store = _channel_handlers(channel_data['cycler_type'], previous is not None)
+    
+    previous_entry = previous.get(key) if previous is not None else None
+    if previous is None:
+        loader_args = (channel_path,) + options
+    else:
+        loader_args = (channel_path, (previous_entry or {}).get('manifest')) + options
+    
+    if tasks is not None:
+        tasks.append((key, loader_args, info))
+        return
+    
+    _log(message)
+    try:
+        result, wall_s, rss_delta = _timed_call(loader, *loader_args)
+    except Exception as e:
+        _report_channel_failure(info, channel_data['channel_name'], e)
+        return
+    store(channel_data, result, previous_entry)
+    _record_loaded_channel(key, channel_data, loader_args, result, previous_entry, wall_s, rss_delta)
+
+
+def _record_loaded_channel(key, channel_data, loader_args, result, previous_entry, wall_s, rss_delta):
+    """채널 로딩 계측 기록 (리포트가 있을 때만 읽은 bytes 계산)"""
+    if _report.get() is None:
+        return
+    _record_channel('load_channel', key, wall_s, _channel_rows(channel_data),
+                    _channel_bytes_read(channel_data, loader_args, result, previous_entry),
+                    rss_delta)
+
+
+def _create_executor(workers, use_processes=True):
+    """채널 로딩용 executor 생성 (프로세스 풀 생성 실패 시 스레드 풀로 대체)"""
+    if use_processes:
+        try:
+            return ProcessPoolExecutor(max_workers=workers)
+        except (OSError, NotImplementedError, ImportError) as e:
+            _log(f"  ⚠️  프로세스 풀 생성 실패 - 스레드 풀로 대체: {e}")
+    return ThreadPoolExecutor(max_workers=workers)
+
+
+def _load_channels_parallel(tasks, loaded_data, workers, use_processes=True, previous=None):
+    """
+    등록된 채널 로딩 작업을 병렬 실행
+    
+    결과는 등록 순서대로 수집하므로 loaded_data의 키 순서와 내용은
+    순차 로딩과 동일합니다. 프로세스 풀이 중간에 깨지면 남은 채널은
+    스레드 풀에서 다시 로딩합니다.
+    """
+    _log("\n" + "-" * 70)
+    _log(f"⚙️  채널 병렬 로딩: {len(tasks)}개 채널, worker {workers}개")
+    _log("-" * 70)
+    
+    incremental = previous is not None
+    executor = _create_executor(workers, use_processes)
+    fallback = None
+    
+    def submit(pool, key, loader_args):
+        loader, _ = _channel_handlers(loaded_data[key]['cycler_type'], incremental)
+        loader = partial(_call_with_parser_settings, _parser_settings(), loader)
+        return pool.submit(_timed_call, loader, *loader_args)
+    
+    try:
+        futures = [submit(executor, key, loader_args) for key, loader_args, _ in tasks]
+        
+        for i, (key, loader_args, info) in enumerate(tasks):
+            channel_data = loaded_data[key]
+            _log(f"    - {key}")
+            try:
+                result, wall_s, rss_delta = futures[i].result()
+            except BrokenProcessPool:
+                if fallback is None:
+                    _log("  ⚠️  프로세스 풀 중단 - 남은 채널을 스레드 풀로 재시도")
+                    fallback = ThreadPoolExecutor(max_workers=workers)
+                    for j in range(i, len(tasks)):
+                        futures[j] = submit(fallback, tasks[j][0], tasks[j][1])
+                try:
+                    result, wall_s, rss_delta = futures[i].result()
+                except Exception as e:
+                    _report_channel_failure(info, channel_data['channel_name'], e)
+                    continue
+            except Exception as e:
+                _report_channel_failure(info, channel_data['channel_name'], e)
+                continue
+            
+            _, store = _channel_handlers(channel_data['cycler_type'], incremental)
+            previous_entry = previous.get(key) if incremental else None
+            store(channel_data, result, previous_entry)
+            _record_loaded_channel(key, channel_data, loader_args, result, previous_entry,
+                                   wall_s, rss_delta)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        if fallback is not None:
+            fallback.shutdown(wait=True)
+
+
+# ============================================================================
+# 비동기 API (asyncio)
+# ============================================================================
+
+# 원시 파일 미리 읽기 블록 크기 (bytes)
+_PREFETCH_BLOCK_SIZE = 1 << 20
+
+
+def _prefetch_files(file_paths):
+    """
+    파일을 끝까지 읽고 버림 (OS page cache 적재)
+    
+    NAS 등 느린 저장소에서 다음 채널의 파일 읽기를 현재 채널 파싱과 겹치기 위해
+    사용합니다. 이후 파싱은 page cache에서 읽으므로 I/O 대기가 줄어듭니다.
+    
+    Returns:
+    --------
+    int : 읽은 bytes
+    """
+    nbytes = 0
+    buffer = bytearray(_PREFETCH_BLOCK_SIZE)
+    for file_path in file_paths:
+        try:
+            with open(file_path, 'rb', buffering=0) as f:
+                while True:
+                    n = f.readinto(buffer)
+                    if not n:
+                        break
+                    nbytes += n
+        except OSError:
+            continue
+    return nbytes
+
+
+def _prefetch_channel(cycler_type, loader_args):
+    """채널 로딩 함수가 읽을 원시 파일 미리 읽기 (파일 탐색 포함, 스레드 실행 단위)"""
+    return _prefetch_files(_channel_source_files(cycler_type, loader_args))
+
+
+async def _notify_channel(on_channel, key, channel_data, error):
+    """채널 완료 콜백 호출 (코루틴 함수도 허용)"""
+    if on_channel is None:
+        return
+    result = on_channel(key, channel_data, error)
+    if asyncio.iscoroutine(result) or isinstance(result, asyncio.Future):
+        await result
+
+
+async def aload_channel(channel_path, cycler_type, compact=False, toyo_max_cycles=3, executor=None):
+    """
+    채널 하나를 비동기로 로딩 (파일 미리 읽기 → executor에서 파싱)
+    
+    Parameters:
+    -----------
+    channel_path : str
+        채널 폴더 경로
+    cycler_type : str
+        'PNE' 또는 'Toyo'
+    executor : concurrent.futures.Executor, optional
+        파싱을 실행할 executor (None이면 이벤트 루프 기본 스레드 풀)
+    
+    Returns:
+    --------
+    tuple : (사이클 DataFrame, 프로파일 DataFrame) - _load_pne_channel / _load_toyo_channel과 동일
+    """
+    loop = asyncio.get_running_loop()
+    loader, _ = _channel_handlers(cycler_type)
+    loader_args = (channel_path, compact) if cycler_type == 'PNE' else \
+        (channel_path, compact, toyo_max_cycles)
+    
+    await asyncio.to_thread(_prefetch_channel, cycler_type, loader_args)
+    return await loop.run_in_executor(executor, _call_with_parser_settings, _parser_settings(),
+                                      loader, *loader_args)
+
+
+async def aprocess_battery_data(paths, workers=None, use_processes=True, previous=None,
+                                compact=False, toyo_max_cycles=3, io_concurrency=4,
+                                on_channel=None, executor=None):
+    """
+    process_battery_data()의 비동기 버전 (이벤트 루프를 막지 않음)
+    
+    채널 탐색과 파일 미리 읽기는 스레드에서, CSV 파싱은 executor에서 실행하여
+    다음 채널의 파일 I/O가 현재 채널의 파싱과 겹치도록 합니다. 결과(채널 키 순서,
+    내용, 실패 기록)는 동기 경로와 같습니다.
+    
+    작업이 취소되면 아직 시작하지 않은 채널 로딩은 취소되고 CancelledError가
+    전파됩니다 (이미 실행 중인 파싱은 executor에서 끝까지 실행됨).
+    
+    Parameters:
+    -----------
+    paths, previous, compact, toyo_max_cycles :
+        process_battery_data()와 동일
+    workers : int, optional
+        동시에 파싱할 채널 수 (process_battery_data()와 같이 None 또는 1: 한 채널씩,
+        -1: CPU 코어 수). 한 채널씩 파싱해도 파싱은 executor에서 실행되고
+        다음 채널의 미리 읽기와 겹칩니다.
+    use_processes : bool
+        executor를 만들 때 프로세스 풀 사용 여부 (실패 시 스레드 풀)
+    io_concurrency : int
+        동시에 미리 읽을 채널 수
+    on_channel : callable, optional
+        채널마다 완료 시 on_channel(key, channel_data, error) 호출 (성공 시 error는 None,
+        코루틴 함수 가능)
+    executor : concurrent.futures.Executor, optional
+        파싱 executor (주어지면 종료하지 않음)
+    
+    Returns:
+    --------
+    tuple : (경로별 정보 DataFrame, 채널별 loaded_data dict)
+    """
+    loop = asyncio.get_running_loop()
+    if workers is None:
+        workers = 1
+    elif workers < 1:
+        workers = os.cpu_count() or 1
+    incremental = previous is not None
+    
+    with _stage('process_battery_data'):
+        _log("=" * 70)
+        _log("🔋 배터리 데이터 처리 파이프라인 시작 (비동기" + (", 증분 모드)" if incremental else ")"))
+        _log("=" * 70)
+        
+        loaded_data, tasks = {}, []
+        results = await asyncio.to_thread(_scan_paths, paths, loaded_data, tasks, previous,
+                                          compact, toyo_max_cycles)
+        
+        own_executor = executor is None
+        if own_executor:
+            executor = _create_executor(workers, use_processes)
+        pools = {'parse': executor, 'fallback': None}
+        io_limit = asyncio.Semaphore(io_concurrency)
+        parse_limit = asyncio.Semaphore(workers)
+        # 미리 읽기가 파싱보다 너무 앞서가지 않도록 (page cache에서 밀려나지 않게)
+        ahead_limit = asyncio.Semaphore(workers + io_concurrency)
+        errors = {}
+        
+        async def parse(loader, loader_args):
+            loader = partial(_call_with_parser_settings, _parser_settings(), loader)
+            try:
+                return await loop.run_in_executor(pools['parse'], _timed_call, loader, *loader_args)
+            except BrokenProcessPool:
+                if pools['fallback'] is None:
+                    _log("  ⚠️  프로세스 풀 중단 - 남은 채널을 스레드 풀로 재시도")
+                    pools['fallback'] = ThreadPoolExecutor(max_workers=workers)
+                pools['parse'] = pools['fallback']
+                return await loop.run_in_executor(pools['parse'], _timed_call, loader, *loader_args)
+        
+        async def load(key, loader_args):
+            channel_data = loaded_data[key]
+            loader, store = _channel_handlers(channel_data['cycler_type'], incremental)
+            async with ahead_limit:
+                if not incremental:
+                    # 증분 모드는 파일 끝부분만 읽으므로 미리 읽지 않음
+                    async with io_limit:
+                        await asyncio.to_thread(_prefetch_channel, channel_data['cycler_type'],
+                                                loader_args)
+                async with parse_limit:
+                    try:
+                        result, wall_s, rss_delta = await parse(loader, loader_args)
+                    except Exception as e:
+                        errors[key] = e
+                        await _notify_channel(on_channel, key, channel_data, e)
+                        return
+            
+            _log(f"    - {key}")
+            previous_entry = previous.get(key) if incremental else None
+            store(channel_data, result, previous_entry)
+            _record_loaded_channel(key, channel_data, loader_args, result, previous_entry,
+                                   wall_s, rss_delta)
+            await _notify_channel(on_channel, key, channel_data, None)
+        
+        _log("\n" + "-" * 70)
+        _log(f"⚙️  채널 비동기 로딩: {len(tasks)}개 채널, 파싱 {workers}개 / 미리 읽기 {io_concurrency}개")
+        _log("-" * 70)
+        
+        futures = [asyncio.ensure_future(load(key, loader_args)) for key, loader_args, _ in tasks]
+        try:
+            await asyncio.gather(*futures)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            if own_executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+            if pools['fallback'] is not None:
+                pools['fallback'].shutdown(wait=False, cancel_futures=True)
+        
+        # 실패 기록은 동기 경로와 같은 채널 순서로
+        for key, _, info in tasks:
+            if key in errors:
+                _report_channel_failure(info, loaded_data[key]['channel_name'], errors[key])
+        
+        _log_pipeline_done(results, loaded_data)
+    
+    return pd.DataFrame(results), loaded_data
+
+
+async def aprocess_and_combine(paths, workers=None, use_processes=True, compact=False,
+                               toyo_max_cycles=3, io_concurrency=4, on_channel=None,
+                               executor=None):
+    """process_and_combine()의 비동기 버전 (인자는 aprocess_battery_data() 참고)"""
+    df_results, loaded_data = await aprocess_battery_data(
+        paths, workers=workers, use_processes=use_processes, compact=compact,
+        toyo_max_cycles=toyo_max_cycles, io_concurrency=io_concurrency,
+        on_channel=on_channel, executor=executor)
+    
+    return _build_combined_result(paths, loaded_data)
+
+
+async def aprocess_and_combine_incremental(paths, previous=None, workers=None, use_processes=True,
+                                           compact=False, toyo_max_cycles=3, io_concurrency=4,
+                                           on_channel=None, executor=None):
+    """process_and_combine_incremental()의 비동기 버전"""
+    if isinstance(previous, str):
+        previous = await asyncio.to_thread(load_data, previous)
+    previous_channels = previous['channels'] if previous is not None else {}
+    
+    df_results, loaded_data = await aprocess_battery_data(
+        paths, workers=workers, use_processes=use_processes, previous=previous_channels,
+        compact=compact, toyo_max_cycles=toyo_max_cycles, io_concurrency=io_concurrency,
+        on_channel=on_channel, executor=executor)
+    
+    return _build_combined_result(paths, loaded_data)
+
+
+# ============================================================================
+# 증분 로딩 (파일 manifest 기반)
+# ============================================================================
+
+# 프로파일 처리 단계에서 추가되는 파생 열 (증분 병합 시 원본 프레임 복원용)
+_DERIVED_PROFILE_COLUMNS = ['time_cyc', 'Capa_cyc', 'Crate', 'category']
+
+
+def _file_state(file_path):
+    """파일 크기/수정 시각"""
+    st = os.stat(file_path)
+    return {'size': st.st_size, 'mtime': st.st_mtime}
+
+
+def _read_csv_tail(file_path, fmt, offset=0, size=None):
+    """
+    offset 이후에 추가된 완결된 행만 스키마 fmt의 원시 열로 파싱 (read_cycler_csv())
+    
+    마지막 줄바꿈 이후의 미완성 행은 읽지 않고 다음 실행으로 넘깁니다.
+    
+    Returns:
+    --------
+    tuple : (원시 DataFrame 또는 None, 다음 실행의 시작 offset)
+    """
+    if size is None:
+        size = os.path.getsize(file_path)
+    
+    with open(file_path, 'rb') as f:
+        f.seek(offset)
+        chunk = f.read(size - offset)
+    
+    end = chunk.rfind(b'\n') + 1
+    if end == 0:
+        return None, offset
+    
+    try:
+        df = read_cycler_csv(chunk[:end], fmt)
+    except pd.errors.EmptyDataError:
+        df = None
+    return df, offset + end
+
+
+def _pne_restore_files(restore_path):
+    """Restore 폴더의 (SaveEndData 파일명, 정렬된 SaveData 파일명 리스트)"""
+    csv_files = [f for f in os.listdir(restore_path) if f.endswith('.csv')]
+    end_data_file = next((f for f in csv_files if 'SaveEndData' in f), None)
+    profile_files = sorted(f for f in csv_files if 'SaveData' in f and 'SaveEndData' not in f)
+    return end_data_file, profile_files
+
+
+def _is_append_only(old_files, states, ordered_names):
+    """
+    이전 manifest 대비 파일 변경이 '추가 전용'인지 검사
+    
+    기존 파일이 사라지거나 줄어들었거나, 마지막 파일이 아닌 기존 파일이
+    커졌거나, 새 파일이 기존 파일보다 앞에 정렬되면 False (전체 재파싱 필요)
+    """
+    old_names = [name for name in ordered_names if name in old_files]
+    if len(old_names) != len(old_files):
+        return False
+    if old_names != ordered_names[:len(old_names)]:
+        return False
+    
+    for i, name in enumerate(old_names):
+        old, new = old_files[name], states[name]
+        if new['size'] < old['offset']:
+            return False
+        unchanged = new['size'] == old['size'] and new['mtime'] == old['mtime']
+        if not unchanged and new['size'] == old['size']:
+            return False
+        if not unchanged and i < len(old_names) - 1:
+            return False
+    return True
+
+
+def _load_pne_channel_delta(channel_path, manifest=None, compact=False):
+    """
+    이전 manifest 이후 추가된 PNE 데이터만 파싱 (worker 실행 단위)
+    
+    새 SaveData*.csv 파일과 기존 파일/SaveEndData.csv의 추가된 끝부분만
+    읽습니다. 원시 행 번호(index)는 manifest의 누적 행 수부터 이어집니다.
+    
+    Returns:
+    --------
+    dict : {'reset': 전체 재파싱 여부, 'cycle': 신규 사이클 행,
+            'profile': 신규 프로파일 행, 'manifest': 갱신된 manifest}
+    """
+    restore_path = os.path.join(channel_path, "Restore")
+    delta = {'reset': True, 'cycle': None, 'profile': None,
+             'manifest': {'channel_path': channel_path, 'files': {}}}
+    
+    if not os.path.isdir(restore_path):
+        return delta
+    
+    end_data_file, profile_files = _pne_restore_files(restore_path)
+    old_files = (manifest or {}).get('files', {})
+    states = {name: _file_state(os.path.join(restore_path, name))
+              for name in profile_files + ([end_data_file] if end_data_file else [])}
+    
+    old_profile = {k: v for k, v in old_files.items() if 'SaveEndData' not in k}
+    old_end = {k: v for k, v in old_files.items() if 'SaveEndData' in k}
+    reset = manifest is None or not (
+        _is_append_only(old_profile, states, profile_files)
+        and _is_append_only(old_end, states, [end_data_file] if end_data_file else []))
+    if reset:
+        old_files = {}
+    delta['reset'] = reset
+    files = delta['manifest']['files']
+    
+    def read_delta(name):
+        old = old_files.get(name, {'offset': 0, 'rows': 0})
+        state = states[name]
+        if name in old_files and state['size'] == old['size'] and state['mtime'] == old['mtime']:
+            files[name] = dict(old)
+            return None
+        fmt = 'pne_cycle' if name == end_data_file else 'pne_profile'
+        df, offset = _read_csv_tail(os.path.join(restore_path, name), fmt, old['offset'],
+                                    state['size'])
+        rows = old['rows'] + (len(df) if df is not None else 0)
+        files[name] = {**state, 'offset': offset, 'rows': rows}
+        return df
+    
+    if end_data_file:
+        base_rows = old_files.get(end_data_file, {'rows': 0})['rows']
+        df = read_delta(end_data_file)
+        if df is not None and not df.empty:
+            df.index = pd.RangeIndex(base_rows, base_rows + len(df))
+            delta['cycle'] = _transform_pne_cycle(df)
+            if compact:
+                delta['cycle'] = compact_frame(delta['cycle'])
+    
+    base_rows = sum(old_files[name]['rows'] for name in profile_files if name in old_files)
+    dataframes = [df for df in (read_delta(name) for name in profile_files) if df is not None]
+    if dataframes:
+        df = pd.concat(dataframes, ignore_index=True)
+        df.index = pd.RangeIndex(base_rows, base_rows + len(df))
+        delta['profile'] = _transform_pne_profile(df)
+        if compact:
+            delta['profile'] = compact_frame(delta['profile'])
+    
+    return delta
+
+
+def _merge_pne_channel(channel_data, delta, previous_entry=None):
+    """증분 파싱 결과를 이전 채널 데이터에 병합"""
+    channel_data['manifest'] = delta['manifest']
+    
+    if delta['reset'] or previous_entry is None:
+        if previous_entry is not None:
+            _log(f"      ↻ 파일 구성이 변경되어 전체 재파싱")
+        _store_pne_channel(channel_data, (delta['cycle'], delta['profile']))
+        return
+    
+    new_cycle, new_profile = delta['cycle'], delta['profile']
+    has_cycle = new_cycle is not None and not new_cycle.empty
+    has_profile = new_profile is not None and not new_profile.empty
+    
+    if not has_cycle and not has_profile:
+        # 변경 없음: 처리/분류 결과까지 그대로 유지
+        for field, value in previous_entry.items():
+            if field != 'manifest':
+                channel_data[field] = value
+        _log(f"      = 변경 없음 - 이전 데이터 유지")
+        return
+    
+    for field in ('cycle', 'cycle_summary', 'cycle_steps'):
+        channel_data[field] = previous_entry.get(field)
+    if has_cycle:
+        channel_data['cycle'] = _append_rows(channel_data['cycle'], new_cycle)
+        channel_data['cycle_summary'] = _append_rows(
+            channel_data['cycle_summary'], new_cycle[new_cycle['Condition'] == 8])
+        channel_data['cycle_steps'] = _append_rows(
+            channel_data['cycle_steps'], new_cycle[new_cycle['Condition'] != 8])
+        _log(f"      ✓ 신규 사이클 데이터: {len(new_cycle):,}행 (누적 {len(channel_data['cycle']):,}행)")
+    
+    if has_profile:
+        channel_data['profile'] = _append_rows(
+            _raw_profile_frame(previous_entry.get('profile')), new_profile)
+        _log(f"      ✓ 신규 프로파일 데이터: {len(new_profile):,}행 (누적 {len(channel_data['profile']):,}행)")
+    else:
+        channel_data['profile'] = previous_entry.get('profile')
+        if 'cycle_list' in previous_entry:
+            channel_data['cycle_list'] = previous_entry['cycle_list']
+
+
+def _append_rows(base, new_rows):
+    """기존 DataFrame 뒤에 신규 행 추가"""
+    if base is None or base.empty:
+        return new_rows.copy()
+    return pd.concat([base, new_rows])
+
+
+def _raw_profile_frame(profile):
+    """
+    처리된 프로파일(cycle list)을 원본 형태의 단일 DataFrame으로 복원
+    
+    프로파일에 새 행이 추가되면 사이클 분할/분류는 다시 수행해야 하므로
+    파생 열을 제거한 원본 프레임으로 되돌립니다.
+    """
+    if not isinstance(profile, list):
+        return profile
+    if not profile:
+        return None
+    df = profile.frame if isinstance(profile, CycleList) else pd.concat(profile)
+    return df.drop(columns=[c for c in _DERIVED_PROFILE_COLUMNS if c in df.columns])
+
+
+def _load_toyo_channel_delta(channel_path, manifest=None, compact=False, max_cycles=3):
+    """
+    Toyo 채널 증분 로딩 (worker 실행 단위)
+    
+    capacity.log와 로딩 대상 프로파일 파일이 모두 그대로면 파싱을 건너뛰고,
+    하나라도 바뀌면 채널 전체를 다시 로딩합니다.
+    """
+    files = {}
+    if os.path.isdir(channel_path):
+        names = ['capacity.log'] if os.path.isfile(os.path.join(channel_path, 'capacity.log')) else []
+        profile_files = [name for _, name in _toyo_profile_files(channel_path)]
+        if max_cycles is not None:
+            profile_files = profile_files[:max_cycles]
+        for name in names + profile_files:
+            state = _file_state(os.path.join(channel_path, name))
+            files[name] = {**state, 'offset': state['size'], 'rows': None}
+    
+    new_manifest = {'channel_path': channel_path, 'files': files}
+    old_files = (manifest or {}).get('files')
+    if old_files is not None and all(
+            name in old_files and old_files[name]['size'] == state['size']
+            and old_files[name]['mtime'] == state['mtime']
+            for name, state in files.items()) and len(old_files) == len(files):
+        return {'reset': False, 'result': None, 'manifest': new_manifest}
+    
+    return {'reset': True, 'result': _load_toyo_channel(channel_path, compact, max_cycles),
+            'manifest': new_manifest}
+
+
+def _merge_toyo_channel(channel_data, delta, previous_entry=None):
+    """Toyo 증분 로딩 결과 반영 (변경 없으면 이전 데이터 유지)"""
+    channel_data['manifest'] = delta['manifest']
+    
+    if delta['result'] is None and previous_entry is not None:
+        for field, value in previous_entry.items():
+            if field != 'manifest':
+                channel_data[field] = value
+        _log(f"      = 변경 없음 - 이전 데이터 유지")
+        return
+    
+    _store_toyo_channel(channel_data, delta['result'] or (None, None))
+
+
+# 사이클러 타입별 (로딩 함수, 저장 함수)
+_CHANNEL_LOADERS = {
+    'PNE': (_load_pne_channel, _store_pne_channel),
+    'Toyo': (_load_toyo_channel, _store_toyo_channel),
+}
+
+_INCREMENTAL_CHANNEL_LOADERS = {
+    'PNE': (_load_pne_channel_delta, _merge_pne_channel),
+    'Toyo': (_load_toyo_channel_delta, _merge_toyo_channel),
+}
+
+
+# ============================================================================
+# 결과 캐시 (content-addressed)
+# ============================================================================
+
+# 캐시 항목 형식 버전 (파생 계산 방식이 바뀌면 올려서 이전 항목을 무효화)
+_RESULT_CACHE_VERSION = 1
+
+# 캐시 디렉토리 (환경 변수 BATTERY_RESULT_CACHE로 기본값 지정 가능, 없으면 캐시 사용 안 함)
+_cache_settings = {'cache': None, 'directory': os.environ.get('BATTERY_RESULT_CACHE')}
+
+# 단계별 키에 사용하는 입력 열 (결과가 의존하는 열만 해시)
+_PROCESS_KEY_COLUMNS = ('Cycle', 'time_s', 'Current_mA')
+_CATEGORY_KEY_COLUMNS = ('Voltage_V', 'EndState', 'Crate')
+
+
+class ResultCache:
+    """
+    파생 단계 결과의 디스크 캐시 (크기 제한 LRU)
+    
+    항목은 directory/<키>.pkl 파일 하나이며, 키는 입력 데이터 내용과 단계
+    파라미터의 해시입니다. 읽을 때마다 파일 mtime을 갱신하고, 전체 크기가
+    max_mb를 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다.
+    """
+    
+    def __init__(self, directory, max_mb=1024):
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+    
+    def __repr__(self):
+        return (f"ResultCache({self.directory!r}, {len(self._entries())}개 항목, "
+                f"{_mb(self.size_bytes()):.1f}/{_mb(self.max_bytes):.0f} MB, "
+                f"hit {self.hits} / miss {self.misses})")
+    
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+    
+    def _entries(self):
+        """(마지막 사용 시각, 크기, 경로) 목록"""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith('.pkl'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+    
+    def size_bytes(self):
+        """캐시 항목 전체 크기 (bytes)"""
+        return sum(size for _, size, _ in self._entries())
+    
+    def get(self, key):
+        """키에 해당하는 결과 (없거나 읽을 수 없으면 None)"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            # 쓰다 만 파일이나 호환되지 않는 항목은 삭제하고 다시 계산
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            self.misses += 1
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        self.hits += 1
+        return value
+    
+    def put(self, key, value):
+        """결과 저장 (임시 파일에 쓴 뒤 교체하므로 동시에 읽는 쪽은 완성된 파일만 봄)"""
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+        self._evict()
+    
+    def _evict(self):
+        """전체 크기가 max_bytes 이하가 될 때까지 오래된 항목 삭제"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+    
+    def clear(self):
+        """모든 캐시 항목 삭제"""
+        for _, _, path in self._entries():
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+
+def get_result_cache():
+    """현재 결과 캐시 (설정되지 않았으면 None)"""
+    if _cache_settings['cache'] is None and _cache_settings['directory']:
+        _cache_settings['cache'] = ResultCache(_cache_settings['directory'])
+    return _cache_settings['cache']
+
+
+def set_result_cache(cache, max_mb=1024):
+    """
+    process_all_channels / categorize_all_channels가 사용할 결과 캐시 지정
+    
+    cache는 ResultCache, 캐시 디렉토리 경로, 또는 None(캐시 사용 안 함)입니다.
+    """
+    if isinstance(cache, (str, os.PathLike)):
+        cache = ResultCache(os.fspath(cache), max_mb)
+    _cache_settings['cache'] = cache
+    _cache_settings['directory'] = cache.directory if cache is not None else None
+    return cache
+
+
+@contextlib.contextmanager
+def result_cache(cache, max_mb=1024):
+    """블록 안에서만 결과 캐시 사용 (ResultCache 또는 디렉토리 경로)"""
+    previous = dict(_cache_settings)
+    try:
+        yield set_result_cache(cache, max_mb)
+    finally:
+        _cache_settings.update(previous)
+
+
+def _cache_key(stage, params, frame, columns, *arrays):
+    """
+    단계 이름/파라미터와 입력 열 내용의 SHA-256 키
+    
+    columns 중 frame에 없는 열도 키에 표시하여 열 구성이 다르면 다른 키가 됩니다.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps([stage, _RESULT_CACHE_VERSION, params],
+                             default=_json_default).encode())
+    for column in columns:
+        if column not in frame.columns:
+            hasher.update(f"|{column}:-".encode())
+            continue
+        values = frame[column].to_numpy()
+        hasher.update(f"|{column}:{values.dtype}:{len(values)}".encode())
+        if values.dtype == object:
+            values = pd.util.hash_array(values)
+        hasher.update(np.ascontiguousarray(values))
+    for values in arrays:
+        hasher.update(np.ascontiguousarray(values))
+    return hasher.hexdigest()
+
+
+# ============================================================================
+# Cycle List 처리
+# ============================================================================
+
+class _CycleIndexer:
+    """CycleView의 loc / iloc / at / iat (읽기는 사이클 구간 슬라이스, 대입은 부모 프레임에 반영)"""
+    __slots__ = ('_view', '_name')
+    
+    def __init__(self, view, name):
+        self._view = view
+        self._name = name
+    
+    def __getitem__(self, key):
+        return getattr(self._view.frame, self._name)[key]
+    
+    def __setitem__(self, key, value):
+        self._view._assign(self._name, key, value)
+
+
+class CycleView:
+    """
+    cycle list의 사이클 하나
+    
+    프로파일 프레임의 [start, stop) 행 구간을 복사 없이 참조합니다.
+    지원하는 인터페이스:
+    - 열 접근/대입: cycle['Voltage_V'], cycle['category'] = ... (없는 열은 전체 프레임에 생성)
+    - cycle.loc / iloc / at / iat: 읽기, 그리고 대입 (pandas와 같은 의미로 사이클
+      구간에 적용한 뒤 부모 프레임의 해당 행에 반영, 행 추가는 불가)
+    - len(), in, iter (열 이름), columns
+    - 그 밖의 DataFrame 속성/메서드: 행 구간 슬라이스(self.frame)로 위임하며 결과는
+      새 객체입니다. inplace=True 및 update / insert / pop 같은 제자리 변경은
+      copy-on-write에서 부모 프레임에 반영되지 않으므로 TypeError를 냅니다.
+    
+    self.frame 자체를 수정한 결과도 부모 프레임에 반영되지 않습니다.
+    """
+    __slots__ = ('_frame', 'start', 'stop')
+    
+    # 반환값 없이 자기 자신을 바꾸는 DataFrame 메서드
+    _INPLACE_METHODS = frozenset(['update', 'insert', 'pop'])
+    
+    def __init__(self, frame, start, stop):
+        self._frame = frame
+        self.start = int(start)
+        self.stop = int(stop)
+    
+    @property
+    def frame(self):
+        """사이클 구간의 DataFrame (복사 없는 슬라이스)"""
+        return self._frame.iloc[self.start:self.stop]
+    
+    @property
+    def columns(self):
+        return self._frame.columns
+    
+    @property
+    def loc(self):
+        return _CycleIndexer(self, 'loc')
+    
+    @property
+    def iloc(self):
+        return _CycleIndexer(self, 'iloc')
+    
+    @property
+    def at(self):
+        return _CycleIndexer(self, 'at')
+    
+    @property
+    def iat(self):
+        return _CycleIndexer(self, 'iat')
+    
+    def __len__(self):
+        return self.stop - self.start
+    
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._frame[key].iloc[self.start:self.stop]
+        return self.frame[key]
+    
+    def __setitem__(self, column, value):
+        """사이클 구간의 열 값 설정 (없는 열은 전체 프레임에 결측값으로 생성)"""
+        frame = self._frame
+        if column not in frame.columns:
+            dtype = pd.Series([value]).dtype if np.isscalar(value) else np.asarray(value).dtype
+            if dtype.kind in 'iub':
+                dtype = np.float64
+            frame[column] = pd.Series(index=frame.index, dtype=dtype)
+        frame.iloc[self.start:self.stop, frame.columns.get_loc(column)] = value
+    
+    def _assign(self, indexer, key, value):
+        """
+        loc / iloc / at / iat 대입을 사이클 구간 복사본에 적용한 뒤 바뀐 열만 부모 프레임에 반영
+        
+        구간 안에서 dtype이 넓어진 열(int → float 등)은 부모 프레임 열 전체를 같은 dtype으로 바꿉니다.
+        """
+        frame = self._frame
+        current = frame.iloc[self.start:self.stop]
+        segment = current.copy()
+        getattr(segment, indexer)[key] = value
+        if not segment.index.equals(current.index):
+            raise ValueError("CycleView로는 행을 추가할 수 없습니다 (CycleList.frame을 직접 수정하세요)")
+        
+        for column in segment.columns:
+            values = segment[column]
+            if column not in frame.columns:
+                self[column] = values.to_numpy()
+                continue
+            if values.dtype == current[column].dtype and values.equals(current[column]):
+                continue
+            if values.dtype != frame[column].dtype:
+                try:
+                    dtype = np.result_type(frame[column].dtype, values.dtype)
+                except TypeError:
+                    dtype = object
+                frame[column] = frame[column].astype(dtype)
+            frame.iloc[self.start:self.stop, frame.columns.get_loc(column)] = values.to_numpy()
+    
+    def __contains__(self, column):
+        return column in self._frame.columns
+    
+    def __iter__(self):
+        return iter(self._frame.columns)
+    
+    def __getattr__(self, name):
+        if name.startswith('__') or name in CycleView.__slots__:
+            raise AttributeError(name)
+        if name in CycleView._INPLACE_METHODS:
+            raise TypeError(f"CycleView.{name}()는 부모 프레임에 반영되지 않습니다 "
+                            "(열/loc/iloc 대입을 사용하세요)")
+        attr = getattr(self.frame, name)
+        if not inspect.ismethod(attr):
+            return attr
+        
+        @wraps(attr)
+        def method(*args, **kwargs):
+            if kwargs.get('inplace'):
+                raise TypeError(f"CycleView.{name}(inplace=True)는 부모 프레임에 반영되지 않습니다 "
+                                "(결과를 새 DataFrame으로 받거나 열/loc/iloc 대입을 사용하세요)")
+            return attr(*args, **kwargs)
+        return method
+    
+    def __repr__(self):
+        return repr(self.frame)
+
+
+class CycleList(list):
+    """
+    프로파일 프레임 하나와 사이클 경계 배열로 구성된 cycle list
+    
+    list의 각 항목은 CycleView입니다. frame은 Cycle 순으로 연속 정렬된
+    프로파일 전체이고, 사이클 i는 frame의 offsets[i]:offsets[i+1] 행입니다.
+    """
+    __slots__ = ('frame', 'offsets', 'cycle_numbers')
+    
+    def __init__(self, frame, offsets, cycle_numbers=None):
+        offsets = np.asarray(offsets, dtype=np.int64)
+        super().__init__(CycleView(frame, start, stop)
+                         for start, stop in zip(offsets[:-1], offsets[1:]))
+        self.frame = frame
+        self.offsets = offsets
+        self.cycle_numbers = cycle_numbers
+    
+    @classmethod
+    def from_frame(cls, df, column='Cycle'):
+        """
+        프로파일 DataFrame을 column 값 기준으로 분할 (groupby와 같은 사이클 구성)
+        
+        이미 Cycle 순으로 정렬된 프레임은 재배열하지 않으며, 원본 프레임에
+        열이 추가되지 않도록 얕은 복사본을 사용합니다.
+        """
+        if df[column].isna().any():
+            df = df[df[column].notna()]
+        if not df[column].is_monotonic_increasing:
+            df = df.sort_values(column, kind='stable')
+        frame = df.copy(deep=False)
+        
+        values = frame[column].to_numpy()
+        if len(values) == 0:
+            return cls(frame, [0], values[:0])
+        
+        starts = np.flatnonzero(values[1:] != values[:-1]) + 1
+        offsets = np.concatenate(([0], starts, [len(values)]))
+        return cls(frame, offsets, values[offsets[:-1]])
+
+
+def _segmented_cumsum(values, offsets):
+    """
+    offsets로 구분된 구간별 누적합 (NaN은 건너뛰고 NaN 위치 유지)
+    
+    구간마다 Series.cumsum()과 같은 순서로 더하도록, 길이가 비슷한 구간끼리
+    (2의 거듭제곱 단위) 2차원 배열로 모아 행 방향 np.cumsum을 한 번에 수행합니다.
+    패딩은 구간 길이 합의 2배를 넘지 않습니다.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    nan_mask = np.isnan(values)
+    filled = np.where(nan_mask, 0.0, values)
+    out = np.empty_like(filled)
+    
+    starts = offsets[:-1]
+    lengths = np.diff(offsets)
+    if len(lengths) == 0:
+        return out
+    
+    size_class = np.ceil(np.log2(np.maximum(lengths, 1))).astype(np.int64)
+    for cls in np.unique(size_class):
+        sel = np.flatnonzero(size_class == cls)
+        width = lengths[sel].max()
+        positions = np.arange(width)
+        valid = positions[None, :] < lengths[sel][:, None]
+        rows = (starts[sel][:, None] + positions[None, :])[valid]
+        
+        block = np.zeros(valid.shape)
+        block[valid] = filled[rows]
+        np.cumsum(block, axis=1, out=block)
+        out[rows] = block[valid]
+    
+    out[nan_mask] = np.nan
+    return out
+
+
+def add_cycle_columns(frame, offsets, mincapa):
+    """
+    프로파일 프레임에 사이클 파생 열(time_cyc, Capa_cyc, Crate) 추가
+    
+    모든 사이클을 한 번에 계산하며, 사이클별로
+        time_cyc = time_s - time_s.iloc[0]
+        Capa_cyc = (Current_mA * time_cyc.diff().fillna(0) / 3600).cumsum()
+        Crate = Current_mA / mincapa
+    를 계산한 것과 같은 값을 만듭니다.
+    
+    Parameters:
+    -----------
+    frame : pd.DataFrame
+        Cycle 순으로 연속 정렬된 프로파일 (CycleList.frame)
+    offsets : np.ndarray
+        사이클 경계 (사이클 i = offsets[i]:offsets[i+1] 행)
+    mincapa : float
+        C-rate 기준 용량 (mAh)
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    starts = offsets[:-1]
+    lengths = np.diff(offsets)
+    
+    time_s = frame['time_s'].to_numpy(dtype=np.float64)
+    time_cyc = time_s - np.repeat(time_s[starts], lengths)
+    
+    time_diff = np.empty_like(time_cyc)
+    time_diff[1:] = time_cyc[1:] - time_cyc[:-1]
+    time_diff[starts] = 0.0
+    time_diff[np.isnan(time_diff)] = 0.0
+    
+    current = frame['Current_mA'].to_numpy(dtype=np.float64)
+    
+    frame['time_cyc'] = time_cyc
+    frame['Capa_cyc'] = _segmented_cumsum(current * time_diff / 3600, offsets)
+    frame['Crate'] = frame['Current_mA'] / mincapa
+    
+    return frame
+
+
+def _channel_mincapa(df_cycle, capacity_mAh):
+    """C-rate 기준 용량: 첫 사이클 방전/측정 용량 (없으면 폴더명 용량, 그것도 없으면 1000)"""
+    if df_cycle is not None:
+        if 'DchgCap_mAh' in df_cycle.columns:
+            return df_cycle['DchgCap_mAh'].iloc[0]
+        if 'Capacity_mAh' in df_cycle.columns:
+            return df_cycle['Capacity_mAh'].iloc[0]
+    return capacity_mAh or 1000
+
+
+def _cycle_order(df, column='Cycle'):
+    """
+    CycleList.from_frame과 같은 행 순서 (column 결측 제외, 안정 정렬)의 위치 배열
+    
+    이미 정렬되어 있고 결측이 없으면 None
+    """
+    values = df[column]
+    valid = values.notna().to_numpy()
+    if valid.all() and values.is_monotonic_increasing:
+        return None
+    positions = np.flatnonzero(valid)
+    return positions[np.argsort(values.to_numpy()[positions], kind='stable')]
+
+
+def _build_cycle_list(df, mincapa, cache=None):
+    """
+    프로파일 DataFrame을 CycleList로 분할하고 파생 열 추가
+    
+    cache가 있으면 행 순서/사이클 경계/파생 열을 (입력 열 내용, mincapa) 키로
+    저장해 두고, 같은 입력이면 정렬과 누적 계산 없이 복원합니다.
+    
+    Returns:
+    --------
+    tuple : (CycleList, 캐시 사용 여부)
+    """
+    key = None
+    if cache is not None:
+        key = _cache_key('cycle_columns', [float(mincapa)], df, _PROCESS_KEY_COLUMNS)
+        cached = cache.get(key)
+        if cached is not None:
+            order = cached['order']
+            frame = (df if order is None else df.take(order)).copy(deep=False)
+            for column, values in cached['columns'].items():
+                frame[column] = values
+            return CycleList(frame, cached['offsets'], cached['cycle_numbers']), True
+    
+    # 사이클별 DataFrame 복사 없이 하나의 프레임 + 사이클 경계(offsets)로 분할
+    order = _cycle_order(df)
+    cycle_list = CycleList.from_frame(df if order is None else df.take(order))
+    add_cycle_columns(cycle_list.frame, cycle_list.offsets, mincapa)
+    
+    if key is not None:
+        cache.put(key, {
+            'order': order,
+            'offsets': cycle_list.offsets,
+            'cycle_numbers': cycle_list.cycle_numbers,
+            'columns': {column: cycle_list.frame[column].to_numpy()
+                        for column in ('time_cyc', 'Capa_cyc', 'Crate')},
+        })
+    return cycle_list, False
+
+
+@_timed_stage('process_all_channels')
+def process_all_channels(data):
+    """
+    모든 채널에 대해 cycle_list 생성 및 처리
+    
+    결과 캐시(set_result_cache / result_cache)가 설정되어 있으면 내용이 같은
+    프로파일은 캐시된 사이클 분할/파생 열을 사용합니다.
+    """
+    _log("="*80)
+    _log("🔄 전체 채널 Cycle List 처리")
+    _log("="*80)
+    
+    cache = get_result_cache()
+    
+    for channel_key, channel_data in data['channels'].items():
+        _log(f"\n처리 중: {channel_key}")
+        
+        if channel_data['profile'] is None:
+            _log("  ⚠️ Profile 데이터 없음 - 건너뜀")
+            continue
+        
+        if isinstance(channel_data['profile'], list):
+            _log("  ℹ️ 이미 처리됨 - 건너뜀")
+            continue
+        
+        df = channel_data['profile']
+        start = time.perf_counter()
+        
+        mincapa = _channel_mincapa(channel_data['cycle'], channel_data['capacity_mAh'])
+        cycle_list, cached = _build_cycle_list(df, mincapa, cache)
+        
+        channel_data['profile'] = cycle_list
+        _record_channel('process_channel', channel_key, time.perf_counter() - start,
+                        rows=len(cycle_list.frame))
+        
+        if cached:
+            _log(f"  ♻️ 캐시에서 {len(cycle_list)}개 사이클 복원")
+        else:
+            _log(f"  ✅ {len(cycle_list)}개 사이클 처리 완료")
+    
+    _log("\n" + "="*80)
+    _log("📋 처리 결과")
+    _log("="*80)
+    
+    processed_channels = {k: len(v['profile']) for k, v in data['channels'].items() if isinstance(v['profile'], list)}
+    total_channels = len(processed_channels)
+    total_cycles = sum(processed_channels.values())
+    
+    _log(f"\n처리된 채널 수: {total_channels}개")
+    _log(f"총 사이클 수: {total_cycles}개")
+    
+    if processed_channels:
+        _log(f"\n채널별 사이클 수:")
+        for channel_key, n_cycles in processed_channels.items():
+            _log(f"  - {channel_key}: {n_cycles}개")
+    
+    _log("\n✅ 전체 처리 완료!")
+    _log("="*80)
+    
+    return data
+
+
+def _channel_key_at(data, channel_index):
+    """channel_index번째 채널 키 (전체 키 목록을 만들지 않음, 음수 인덱스 허용)"""
+    n_channels = len(data['channels'])
+    if channel_index >= n_channels or channel_index < -n_channels:
+        raise ValueError(f"채널 인덱스 {channel_index}가 범위를 벗어났습니다. (최대: {n_channels-1})")
+    return next(islice(iter(data['channels']), channel_index % n_channels, None))
+
+
+def get_channel_cycle_list(data, channel_index=0):
+    """특정 채널의 cycle_list 가져오기"""
+    channel_key = _channel_key_at(data, channel_index)
+    cycle_list = data['channels'][channel_key]['profile']
+    
+    _log(f"선택된 채널: {channel_key}")
+    _log(f"사이클 수: {len(cycle_list) if isinstance(cycle_list, list) else 0}개")
+    
+    return channel_key, cycle_list
+
+
+def get_cycle_summary(data, channel_index=0):
+    """
+    특정 채널의 사이클 대표 용량 가져오기 (Condition == 8)
+    
+    Parameters:
+    -----------
+    data : dict
+        process_and_combine()의 출력
+    channel_index : int
+        채널 인덱스 (기본값: 0)
+    
+    Returns:
+    --------
+    pd.DataFrame : 사이클 대표 용량 DataFrame (Condition == 8)
+    """
+    channel_key = _channel_key_at(data, channel_index)
+    cycle_summary = data['channels'][channel_key].get('cycle_summary')
+    
+    if cycle_summary is None:
+        _log(f"⚠️ 채널 {channel_key}에 cycle_summary가 없습니다.")
+    else:
+        _log(f"선택된 채널: {channel_key}")
+        _log(f"사이클 대표 용량 (Condition==8): {len(cycle_summary)}행")
+    
+    return cycle_summary
+
+
+def get_cycle_steps(data, channel_index=0):
+    """
+    특정 채널의 스텝별 용량 가져오기 (Condition != 8)
+    
+    Parameters:
+    -----------
+    data : dict
+        process_and_combine()의 출력
+    channel_index : int
+        채널 인덱스 (기본값: 0)
+    
+    Returns:
+    --------
+    pd.DataFrame : 스텝별 용량 DataFrame (Condition != 8)
+    """
+    channel_key = _channel_key_at(data, channel_index)
+    cycle_steps = data['channels'][channel_key].get('cycle_steps')
+    
+    if cycle_steps is None:
+        _log(f"⚠️ 채널 {channel_key}에 cycle_steps가 없습니다.")
+    else:
+        _log(f"선택된 채널: {channel_key}")
+        _log(f"스텝별 용량 (Condition!=8): {len(cycle_steps)}행")
+    
+    return cycle_steps
+
+
+# ============================================================================
+# 사이클 분류
+# ============================================================================
+
+# 분류 카테고리 (결과 dict의 키 순서)
+CYCLE_CATEGORIES = ('Unknown', 'RPT', 'SOC_Definition', 'Resistance_Measurement', 'Accelerated_Aging')
+
+# 기본 분류 규칙 (위에서부터 먼저 만족하는 규칙의 카테고리, 모두 불만족이면 'Unknown')
+# 조건: (특성, 연산자, 기준값) - 특성은 compute_cycle_features()의 열
+DEFAULT_CATEGORY_RULES = [
+    {'category': 'Resistance_Measurement', 'conditions': [('n_points', '>', 10000)]},
+    {'category': 'SOC_Definition', 'conditions': [('endstate_78_ratio', '>', 0.5),
+                                                  ('cycle_index', '<', 500)]},
+    {'category': 'Accelerated_Aging', 'conditions': [('voltage_range', '<', 1400),
+                                                     ('crate_max', '>', 1.5)]},
+    {'category': 'RPT', 'conditions': [('endstate_64_ratio', '>', 0.90),
+                                       ('voltage_range', '>', 1400)]},
+]
+
+_RULE_OPERATORS = {
+    '>': np.greater, '>=': np.greater_equal,
+    '<': np.less, '<=': np.less_equal,
+    '==': np.equal, '!=': np.not_equal,
+}
+
+CYCLE_FEATURE_COLUMNS = ['cycle_index', 'n_points', 'voltage_range',
+                         'endstate_78_ratio', 'endstate_64_ratio', 'crate_max']
+
+
+def _normalize_rules(rules=None):
+    """
+    분류 규칙을 [{'category', 'conditions'}] 형태로 정리
+    
+    rules는 DEFAULT_CATEGORY_RULES 형식의 list 또는 'category', 'feature',
+    'op', 'value' 열을 가진 규칙 테이블(DataFrame)입니다. 테이블은 카테고리가
+    처음 등장한 순서가 우선순위이며, 같은 카테고리의 행은 AND로 묶입니다.
+    """
+    if rules is None:
+        return DEFAULT_CATEGORY_RULES
+    
+    if isinstance(rules, pd.DataFrame):
+        normalized = []
+        for category, group in rules.groupby('category', sort=False):
+            normalized.append({
+                'category': category,
+                'conditions': list(zip(group['feature'], group['op'], group['value']))
+            })
+        rules = normalized
+    
+    for rule in rules:
+        for feature, op, _ in rule['conditions']:
+            if op not in _RULE_OPERATORS:
+                raise ValueError(f"지원하지 않는 연산자입니다: {op}")
+    return rules
+
+
+def _category_names(rules):
+    """결과 dict에 사용할 카테고리 순서 (기본 카테고리 + 규칙에만 있는 카테고리)"""
+    names = list(CYCLE_CATEGORIES)
+    for rule in rules:
+        if rule['category'] not in names:
+            names.append(rule['category'])
+    return names
+
+
+def _cycle_features(cycle_df, cycle_index):
+    """사이클 하나의 분류 특성"""
+    n_points = len(cycle_df)
+    voltage_range = cycle_df['Voltage_V'].max() - cycle_df['Voltage_V'].min()
+    
+    # Toyo 프로파일에는 EndState가 없음 (비율 0)
+    if 'EndState' in cycle_df.columns:
+        endstate_78_ratio = (cycle_df['EndState'] == 78).sum() / n_points
+        endstate_64_ratio = (cycle_df['EndState'] == 64).sum() / n_points
+    else:
+        endstate_78_ratio = endstate_64_ratio = 0.0
+    
+    if 'Crate' in cycle_df.columns:
+        crate_max = cycle_df['Crate'].abs().max()
+    else:
+        crate_max = 0
+    
+    return {
+        'cycle_index': cycle_index,
+        'n_points': n_points,
+        'voltage_range': voltage_range,
+        'endstate_78_ratio': endstate_78_ratio,
+        'endstate_64_ratio': endstate_64_ratio,
+        'crate_max': crate_max,
+    }
+
+
+def compute_cycle_features(cycle_list):
+    """
+    cycle list 전체의 분류 특성 계산
+    
+    CycleList는 사이클 경계(offsets)에 대한 reduceat으로 모든 사이클을
+    한 번에 집계하고, DataFrame list는 사이클별로 계산합니다.
+    
+    Returns:
+    --------
+    pd.DataFrame : 사이클당 1행 (CYCLE_FEATURE_COLUMNS)
+    """
+    if not isinstance(cycle_list, CycleList):
+        return pd.DataFrame([_cycle_features(cycle, idx) for idx, cycle in enumerate(cycle_list)],
+                            columns=CYCLE_FEATURE_COLUMNS)
+    
+    frame = cycle_list.frame
+    starts = cycle_list.offsets[:-1]
+    n_points = np.diff(cycle_list.offsets)
+    if len(n_points) == 0:
+        return pd.DataFrame(columns=CYCLE_FEATURE_COLUMNS)
+    
+    voltage = frame['Voltage_V'].to_numpy(dtype=np.float64)
+    if 'EndState' in frame.columns:
+        endstate = frame['EndState'].to_numpy()
+    else:
+        endstate = np.zeros(len(frame), dtype=np.int8)
+    
+    if 'Crate' in frame.columns:
+        crate_max = np.fmax.reduceat(np.abs(frame['Crate'].to_numpy(dtype=np.float64)), starts)
+    else:
+        crate_max = np.zeros(len(starts))
+    
+    return pd.DataFrame({
+        'cycle_index': np.arange(len(starts)),
+        'n_points': n_points,
+        'voltage_range': np.fmax.reduceat(voltage, starts) - np.fmin.reduceat(voltage, starts),
+        'endstate_78_ratio': np.add.reduceat((endstate == 78).astype(np.int64), starts) / n_points,
+        'endstate_64_ratio': np.add.reduceat((endstate == 64).astype(np.int64), starts) / n_points,
+        'crate_max': crate_max,
+    })
+
+
+def classify_cycle_features(features, rules=None):
+    """
+    특성 테이블에 분류 규칙을 벡터 마스크로 적용
+    
+    Parameters:
+    -----------
+    features : pd.DataFrame
+        compute_cycle_features() 결과 (여러 채널을 이어 붙인 테이블도 가능)
+    rules : list or pd.DataFrame, optional
+        분류 규칙 (None이면 DEFAULT_CATEGORY_RULES)
+    
+    Returns:
+    --------
+    np.ndarray : 사이클별 카테고리 이름 (object 배열)
+    """
+    rules = _normalize_rules(rules)
+    labels = np.full(len(features), 'Unknown', dtype=object)
+    unassigned = np.ones(len(features), dtype=bool)
+    
+    for rule in rules:
+        mask = unassigned.copy()
+        for feature, op, value in rule['conditions']:
+            mask &= _RULE_OPERATORS[op](features[feature].to_numpy(), value)
+        labels[mask] = rule['category']
+        unassigned &= ~mask
+    
+    return labels
+
+
+def _categories_from_labels(labels, names):
+    """사이클별 라벨 배열을 {카테고리: [사이클 인덱스]} dict로 변환"""
+    return {name: np.flatnonzero(labels == name).tolist() for name in names}
+
+
+def categorize_cycle(cycle_df, cycle_index, rules=None):
+    """데이터 특성 기반 사이클 분류"""
+    features = pd.DataFrame([_cycle_features(cycle_df, cycle_index)])
+    return classify_cycle_features(features, rules)[0]
+
+
+def categorize_cycles(cycle_list, rules=None):
+    """전체 cycle_list를 분류"""
+    rules = _normalize_rules(rules)
+    labels = classify_cycle_features(compute_cycle_features(cycle_list), rules)
+    return _categories_from_labels(labels, _category_names(rules))
+
+
+def _apply_category_labels(cycle_list, labels):
+    """사이클별 라벨을 'category' 열로 기록 (CycleList는 프레임 전체를 한 번에)"""
+    if isinstance(cycle_list, CycleList):
+        lengths = np.diff(cycle_list.offsets)
+        cycle_list.frame['category'] = np.repeat(labels, lengths)
+        return
+    for cycle, label in zip(cycle_list, labels):
+        cycle['category'] = label
+
+
+def add_category_labels(cycle_list, categories=None):
+    """각 사이클에 카테고리 라벨을 추가"""
+    if categories is None:
+        categories = categorize_cycles(cycle_list)
+    
+    for category, indices in categories.items():
+        for idx in indices:
+            cycle_list[idx]['category'] = category
+    
+    return categories
+
+
+def print_categorization_report(cycle_list, categories):
+    """분류 결과 리포트 출력"""
+    print("=" * 80)
+    print("📊 사이클 분류 결과")
+    print("=" * 80)
+    print()
+    
+    for category, indices in categories.items():
+        print(f"\n[{category}]")
+        print(f"  총 {len(indices)}개 사이클")
+        
+        if indices:
+            print(f"  사이클 인덱스: {indices[:10]}")
+            if len(indices) > 10:
+                print(f"  ... 외 {len(indices) - 10}개")
+            
+            first_idx = indices[0]
+            cycle = cycle_list[first_idx]
+            
+            print(f"\n  [대표 사이클 {first_idx} 특성]")
+            
+            v_min = cycle['Voltage_V'].min()
+            v_max = cycle['Voltage_V'].max()
+            v_range = v_max - v_min
+            print(f"    - Voltage 범위: {v_min:.0f} ~ {v_max:.0f} mV (범위: {v_range:.0f} mV)")
+            
+            endstate_counts = cycle['EndState'].value_counts()
+            endstate_str = ", ".join([f"{int(k)}({v}회)" for k, v in endstate_counts.head(3).items()])
+            print(f"    - EndState 패턴: {endstate_str}")
+            
+            condition_counts = cycle['Condition'].value_counts()
+            condition_map = {1: '충전', 2: '방전', 3: 'Rest'}
+            condition_str = ", ".join([f"{condition_map.get(k, k)}({v}회)" for k, v in condition_counts.items()])
+            print(f"    - Condition: {condition_str}")
+            
+            if 'Crate' in cycle.columns:
+                crate_abs = cycle['Crate'].abs()
+                print(f"    - C-rate: 평균 {crate_abs.mean():.3f}C, 최대 {crate_abs.max():.3f}C")
+    
+    print("\n" + "=" * 80)
+
+
+# ============================================================================
+# 채널 카테고리화
+# ============================================================================
+
+def classify_all_cycles(data, rules=None):
+    """
+    모든 채널의 모든 사이클을 한 번에 분류
+    
+    채널별 특성 테이블을 하나로 이어 붙인 뒤 분류 규칙을 한 번만 적용합니다.
+    
+    Returns:
+    --------
+    pd.DataFrame : 사이클당 1행 (channel, Cycle, CYCLE_FEATURE_COLUMNS, category)
+    """
+    tables = []
+    for channel_key, channel_data in data['channels'].items():
+        cycle_list = channel_data['profile']
+        if not isinstance(cycle_list, list):
+            continue
+        
+        features = compute_cycle_features(cycle_list)
+        features.insert(0, 'channel', channel_key)
+        if isinstance(cycle_list, CycleList):
+            features.insert(1, 'Cycle', cycle_list.cycle_numbers)
+        else:
+            features.insert(1, 'Cycle', [cycle['Cycle'].iloc[0] for cycle in cycle_list])
+        tables.append(features)
+    
+    if not tables:
+        return pd.DataFrame(columns=['channel', 'Cycle'] + CYCLE_FEATURE_COLUMNS + ['category'])
+    
+    fleet = pd.concat(tables, ignore_index=True)
+    fleet['category'] = classify_cycle_features(fleet, rules)
+    return fleet
+
+
+def _cached_category_labels(data, rules):
+    """
+    결과 캐시에 있는 채널별 사이클 라벨
+    
+    Returns:
+    --------
+    tuple : ({채널: 라벨 배열} (캐시 hit), {채널: 캐시 키} (CycleList 채널 전체))
+    """
+    cache = get_result_cache()
+    labels_by_channel, cache_keys = {}, {}
+    if cache is None:
+        return labels_by_channel, cache_keys
+    
+    for channel_key, channel_data in data['channels'].items():
+        cycle_list = channel_data['profile']
+        if not isinstance(cycle_list, CycleList) or len(cycle_list) == 0:
+            continue
+        cache_keys[channel_key] = _cache_key('categories', rules, cycle_list.frame,
+                                             _CATEGORY_KEY_COLUMNS, cycle_list.offsets)
+        labels = cache.get(cache_keys[channel_key])
+        if labels is not None:
+            labels_by_channel[channel_key] = labels
+    return labels_by_channel, cache_keys
+
+
+@_timed_stage('categorize_all_channels')
+def categorize_all_channels(data, rules=None):
+    """
+    data 객체의 모든 채널에 대해 사이클 카테고리화 수행
+    
+    Parameters:
+    -----------
+    data : dict
+        process_all_channels()의 출력
+    rules : list or pd.DataFrame, optional
+        분류 규칙 (None이면 DEFAULT_CATEGORY_RULES, 형식은 _normalize_rules 참고)
+    
+    결과 캐시가 설정되어 있으면 (분류 입력 열, 사이클 경계, 규칙)이 같은
+    채널은 특성 계산 없이 캐시된 라벨을 사용합니다.
+    """
+    _log("="*80)
+    _log("🏷️  전체 채널 사이클 카테고리화")
+    _log("="*80)
+    
+    rules = _normalize_rules(rules)
+    names = _category_names(rules)
+    labels_by_channel, cache_keys = _cached_category_labels(data, rules)
+    
+    pending = {channel_key: channel_data for channel_key, channel_data in data['channels'].items()
+               if channel_key not in labels_by_channel}
+    fleet = classify_all_cycles({'channels': pending}, rules)
+    cache = get_result_cache()
+    for channel_key, group in fleet.groupby('channel', sort=False):
+        labels_by_channel[channel_key] = group['category'].to_numpy()
+        if channel_key in cache_keys:
+            cache.put(cache_keys[channel_key], labels_by_channel[channel_key])
+    
+    for channel_key, channel_data in data['channels'].items():
+        _log(f"\n처리 중: {channel_key}")
+        
+        cycle_list = channel_data['profile']
+        
+        if not isinstance(cycle_list, list):
+            _log("  ⚠️ Cycle list가 아님 - 건너뜀")
+            continue
+        
+        start = time.perf_counter()
+        labels = labels_by_channel.get(channel_key, np.array([], dtype=object))
+        categories = _categories_from_labels(labels, names)
+        _apply_category_labels(cycle_list, labels)
+        
+        channel_data['cycle_list'] = categories
+        _record_channel('categorize_channel', channel_key, time.perf_counter() - start,
+                        rows=len(cycle_list.frame) if isinstance(cycle_list, CycleList)
+                        else sum(len(cycle) for cycle in cycle_list))
+        
+        total_cycles = sum(len(indices) for indices in categories.values())
+        _log(f"  ✅ {total_cycles}개 사이클 분류 완료")
+        for category, indices in categories.items():
+            if indices:
+                _log(f"    - {category}: {len(indices)}개")
+    
+    _log("\n" + "="*80)
+    _log("📋 카테고리화 결과 요약")
+    _log("="*80)
+    
+    processed_channels = [k for k, v in data['channels'].items() if 'cycle_list' in v]
+    total_channels = len(processed_channels)
+    _log(f"\n처리된 채널 수: {total_channels}개")
+    
+    total_stats = {name: 0 for name in names}
+    
+    for channel_key in processed_channels:
+        categories = data['channels'][channel_key]['cycle_list']
+        for category, indices in categories.items():
+            total_stats[category] = total_stats.get(category, 0) + len(indices)
+    
+    _log("\n전체 카테고리별 사이클 수:")
+    for category, count in total_stats.items():
+        if count > 0:
+            _log(f"  - {category}: {count}개")
+    
+    _log("\n✅ 전체 카테고리화 완료!")
+    _log("="*80)
+    
+    return data
+
+
+def get_category_cycles(data, channel_index=0, category='RPT'):
+    """특정 채널의 특정 카테고리 사이클 가져오기"""
+    channel_key = _channel_key_at(data, channel_index)
+    channel_data = data['channels'][channel_key]
+    
+    if 'cycle_list' not in channel_data:
+        raise ValueError(f"채널 {channel_key}에 cycle_list가 없습니다.")
+    
+    categories = channel_data['cycle_list']
+    
+    if category not in categories:
+        raise ValueError(f"카테고리 '{category}'가 존재하지 않습니다.")
+    
+    indices = categories[category]
+    profile = channel_data['profile']
+    
+    return [profile[i] for i in indices]
+
+
+# ============================================================================
+# 미분 용량 분석 (dQ/dV, dV/dQ)
+# ============================================================================
+
+_DQDV_DIRECTIONS = ('charge', 'discharge')
+# 충방전 구분 전류 기준 (mA, 절댓값이 이하면 휴지)
+_DQDV_CURRENT_EPS = 1e-6
+
+
+def _category_rows(cycle_list, indices):
+    """사이클 인덱스 목록에 해당하는 frame 행 위치 (사이클 순서)"""
+    offsets = cycle_list.offsets
+    starts = offsets[indices]
+    lengths = offsets[indices + 1] - starts
+    total = int(lengths.sum())
+    shift = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return np.arange(total) + shift, lengths
+
+
+def _dqdv_segments(channel_key, cycle_list, indices, directions):
+    """
+    채널 하나의 선택 사이클에서 충전/방전 구간 추출
+    
+    Returns:
+    --------
+    list : [(curves DataFrame, 전압 mV, 누적 용량 mAh, 구간 길이)] (방향별)
+    """
+    frame = cycle_list.frame
+    indices = np.asarray(indices, dtype=np.int64)
+    rows, lengths = _category_rows(cycle_list, indices)
+    voltage = frame['Voltage_V'].to_numpy(dtype=np.float64)[rows]
+    current = frame['Current_mA'].to_numpy(dtype=np.float64)[rows]
+    time_cyc = frame['time_cyc'].to_numpy(dtype=np.float64)[rows]
+    
+    cycle_of_row = np.repeat(np.arange(len(indices)), lengths)
+    time_diff = np.diff(time_cyc, prepend=np.nan)
+    time_diff[np.r_[True, cycle_of_row[1:] != cycle_of_row[:-1]]] = 0.0
+    time_diff[np.isnan(time_diff)] = 0.0
+    dq = np.abs(current) * time_diff / 3600
+    
+    segments = []
+    for direction in directions:
+        mask = current > _DQDV_CURRENT_EPS if direction == 'charge' else current < -_DQDV_CURRENT_EPS
+        mask &= ~np.isnan(voltage)
+        cycles = cycle_of_row[mask]
+        counts = np.bincount(cycles, minlength=len(indices))
+        # 2점 미만 구간은 곡선을 만들 수 없음
+        valid = counts >= 2
+        keep = valid[cycles]
+        cycles, seg_voltage, seg_dq = cycles[keep], voltage[mask][keep], dq[mask][keep]
+        seg_lengths = counts[valid]
+        
+        seg_starts = np.cumsum(seg_lengths) - seg_lengths
+        offsets = np.append(seg_starts, len(seg_dq))
+        capacity = _segmented_cumsum(seg_dq, offsets) if len(seg_dq) else seg_dq
+        # 구간 첫 점의 용량을 0으로
+        capacity = capacity - np.repeat(capacity[seg_starts], seg_lengths) if len(seg_dq) else capacity
+        
+        curve_indices = indices[valid]
+        curves = pd.DataFrame({
+            'channel': channel_key,
+            'cycle_index': curve_indices,
+            'Cycle': np.asarray(cycle_list.cycle_numbers)[curve_indices],
+            'direction': direction,
+        })
+        segments.append((curves, seg_voltage, capacity, seg_lengths))
+    return segments
+
+
+def _batched_interp(x, y, lengths, grid):
+    """
+    여러 구간의 y(x)를 공통 grid에 한 번의 np.interp로 보간
+    
+    구간마다 x를 (구간 번호 × 간격)만큼 밀어 하나의 증가 배열로 만들고,
+    grid도 같은 간격으로 밀어 (구간 수 × grid) 점을 한 번에 계산합니다.
+    x는 구간 안에서 비감소여야 하며, 구간의 x 범위 밖은 NaN입니다.
+    
+    Returns:
+    --------
+    np.ndarray : (구간 수, len(grid))
+    """
+    n_segments = len(lengths)
+    if n_segments == 0:
+        return np.empty((0, len(grid)))
+    
+    starts = np.cumsum(lengths) - lengths
+    x_min = np.minimum.reduceat(x, starts)
+    x_max = np.maximum.reduceat(x, starts)
+    base = min(float(x.min()), float(grid[0]))
+    spacing = max(float(x.max()), float(grid[-1])) - base + 1.0
+    
+    segment_ids = np.repeat(np.arange(n_segments), lengths)
+    shifted_x = (x - base) + segment_ids * spacing
+    shifted_grid = (grid - base)[None, :] + (np.arange(n_segments) * spacing)[:, None]
+    
+    out = np.interp(shifted_grid.ravel(), shifted_x, y).reshape(n_segments, len(grid))
+    out[(grid[None, :] < x_min[:, None]) | (grid[None, :] > x_max[:, None])] = np.nan
+    return out
+
+
+def _moving_average(values, window):
+    """
+    행별 중심 이동 평균 (window 안에 NaN이 있으면 NaN)
+    
+    values : (곡선 수, grid 점 수)
+    """
+    if window <= 1:
+        return values
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    pad = ((0, 0), (1, 0))
+    sums = np.cumsum(np.pad(filled, pad), axis=1)
+    counts = np.cumsum(np.pad(valid.astype(np.int64), pad), axis=1)
+    
+    out = np.full(values.shape, np.nan)
+    half = window // 2
+    n = values.shape[1]
+    if n < window:
+        return out
+    window_sum = sums[:, window:] - sums[:, :-window]
+    window_count = counts[:, window:] - counts[:, :-window]
+    mean = np.where(window_count == window, window_sum / window, np.nan)
+    out[:, half:half + mean.shape[1]] = mean
+    return out
+
+
+def _monotone_envelope(values, lengths, decreasing=False):
+    """구간별 누적 최대 (decreasing=True면 누적 최소) - 잡음으로 인한 역행 제거"""
+    if len(values) == 0:
+        return values
+    starts = np.cumsum(lengths) - lengths
+    spacing = np.nanmax(values) - np.nanmin(values) + 1.0
+    segment_ids = np.repeat(np.arange(len(lengths)), lengths)
+    sign = -1.0 if decreasing else 1.0
+    shifted = sign * values + segment_ids * spacing
+    return sign * (np.maximum.accumulate(shifted) - segment_ids * spacing)
+
+
+# dQ/dV 곡선 계산에 쓰는 프로파일 열 (누적 용량은 전류와 time_cyc로 계산)
+_DQDV_INPUT_COLUMNS = ('Voltage_V', 'Current_mA', 'time_cyc')
+
+
+def _dqdv_channel_signature(cycle_list, indices):
+    """캐시 유효성 확인용 키 (선택 사이클, 사이클 경계, 입력 열 내용의 해시)"""
+    return _cache_key('dqdv', [int(i) for i in indices], cycle_list.frame, _DQDV_INPUT_COLUMNS,
+                      cycle_list.offsets)
+
+
+def _dqdv_extent(parts):
+    """채널 구간들의 (최소 전압, 최대 전압, 최대 누적 용량) - 구간이 없으면 None"""
+    voltages = [v for _, v, _, _ in parts if len(v)]
+    if not voltages:
+        return None
+    capacities = [q for _, _, q, _ in parts if len(q)]
+    return (min(float(np.nanmin(v)) for v in voltages),
+            max(float(np.nanmax(v)) for v in voltages),
+            max(float(np.nanmax(q)) for q in capacities))
+
+
+def compute_dqdv(data, category='RPT', voltage_step=5.0, capacity_points=500, smooth=5,
+                 voltage_range=None, capacity_range=None, directions=_DQDV_DIRECTIONS,
+                 use_cache=True):
+    """
+    모든 채널의 카테고리 사이클에 대해 dQ/dV와 dV/dQ를 한 번에 계산
+    
+    사이클별 충전/방전 구간을 공통 전압 grid(dQ/dV)와 공통 용량 grid(dV/dQ)에
+    한 번의 보간으로 올린 뒤, (곡선 수 × grid) 2차원 배열에서 이동 평균과
+    np.gradient로 미분합니다. 채널별 결과는 channel_data['dqdv']에 캐시되며,
+    설정, 사이클 선택, 입력 열 내용이 같고 캐시의 grid가 이번 호출의 공통 grid와
+    같으면 다시 계산하지 않습니다 (grid 범위를 자동으로 정하면 채널 구성에 따라
+    grid가 달라지므로 grid가 다른 캐시는 다시 계산).
+    
+    Parameters:
+    -----------
+    data : dict
+        categorize_all_channels()의 출력 (profile은 CycleList, time_cyc 필요)
+    category : str
+        대상 카테고리 (기본 'RPT')
+    voltage_step : float
+        전압 grid 간격 (mV, Voltage_V 열 단위)
+    capacity_points : int
+        용량 grid 점 수
+    smooth : int
+        이동 평균 창 크기 (grid 점 수, 1이면 사용 안 함)
+    voltage_range, capacity_range : tuple, optional
+        grid 범위 (None이면 대상 데이터 전체 범위)
+    directions : tuple
+        'charge', 'discharge' 중 계산할 방향
+    use_cache : bool
+        False면 캐시를 무시하고 다시 계산
+    
+    Returns:
+    --------
+    dict :
+        'curves' : pd.DataFrame (channel, cycle_index, Cycle, direction) - 배열의 행 순서
+        'voltage_mV' : 전압 grid, 'Q_mAh' / 'dQdV' : (곡선 수, 전압 grid)
+        'capacity_mAh' : 용량 grid, 'V_mV' / 'dVdQ' : (곡선 수, 용량 grid)
+    """
+    directions = tuple(directions)
+    selections = {}
+    for channel_key, channel_data in data['channels'].items():
+        cycle_list = channel_data.get('profile')
+        categories = channel_data.get('cycle_list') or {}
+        if isinstance(cycle_list, CycleList) and categories.get(category):
+            selections[channel_key] = (cycle_list, list(categories[category]))
+    
+    params = {'category': category, 'voltage_step': voltage_step,
+              'capacity_points': capacity_points, 'smooth': smooth,
+              'voltage_range': voltage_range, 'capacity_range': capacity_range,
+              'directions': list(directions)}
+    
+    signatures = {key: _dqdv_channel_signature(*selections[key]) for key in selections}
+    
+    def cached(channel_key):
+        cache = data['channels'][channel_key].get('dqdv') if use_cache else None
+        return (cache is not None and 'extent' in cache and cache['params'] == params
+                and cache['signature'] == signatures[channel_key])
+    
+    segments = {key: _dqdv_segments(key, *selections[key], directions)
+                for key in selections if not cached(key)}
+    extents = {key: _dqdv_extent(parts) for key, parts in segments.items()}
+    for key in selections:
+        if key not in segments:
+            extents[key] = data['channels'][key]['dqdv']['extent']
+    grids = _dqdv_grids([extent for extent in extents.values() if extent is not None],
+                        voltage_step, capacity_points, voltage_range, capacity_range)
+    
+    # 다른 grid(다른 채널 구성의 호출)로 계산된 캐시는 이번 grid로 다시 계산
+    for key in selections:
+        cache = data['channels'][key].get('dqdv')
+        if key not in segments and not (np.array_equal(cache['voltage_mV'], grids[0])
+                                        and np.array_equal(cache['capacity_mAh'], grids[1])):
+            segments[key] = _dqdv_segments(key, *selections[key], directions)
+    
+    if segments:
+        _compute_dqdv_batch(data, segments, grids, smooth, params, signatures, extents)
+    
+    return _collect_dqdv(data, selections, grids)
+
+
+def _dqdv_grids(extents, voltage_step, capacity_points, voltage_range, capacity_range):
+    """전체 채널의 전압/용량 범위(_dqdv_extent 목록)로 공통 grid 생성"""
+    if voltage_range is None:
+        if extents:
+            v_min = min(extent[0] for extent in extents)
+            v_max = max(extent[1] for extent in extents)
+            voltage_range = (np.floor(v_min / voltage_step) * voltage_step,
+                             np.ceil(v_max / voltage_step) * voltage_step)
+        else:
+            voltage_range = (0.0, voltage_step)
+    if capacity_range is None:
+        q_max = max((extent[2] for extent in extents), default=1.0)
+        capacity_range = (0.0, q_max)
+    
+    voltage_grid = np.arange(voltage_range[0], voltage_range[1] + voltage_step / 2, voltage_step)
+    capacity_grid = np.linspace(capacity_range[0], capacity_range[1], capacity_points)
+    return voltage_grid, capacity_grid
+
+
+def _compute_dqdv_batch(data, segments, grids, smooth, params, signatures, extents):
+    """pending 채널 전체를 방향별로 한 번에 계산하여 채널 캐시에 저장"""
+    voltage_grid, capacity_grid = grids
+    keys = list(segments)
+    results = {key: [] for key in keys}
+    
+    for d, direction in enumerate(params['directions']):
+        parts = [segments[key][d] for key in keys]
+        curves = [p[0] for p in parts]
+        voltage = np.concatenate([p[1] for p in parts])
+        capacity = np.concatenate([p[2] for p in parts])
+        lengths = np.concatenate([p[3] for p in parts]).astype(np.int64)
+        
+        # Q(V): 충전은 전압 증가, 방전은 전압 감소 구간 → -V로 증가 배열
+        decreasing = direction == 'discharge'
+        envelope = _monotone_envelope(voltage, lengths, decreasing)
+        sign = -1.0 if decreasing else 1.0
+        q_of_v = _batched_interp(sign * envelope, capacity, lengths, sign * voltage_grid)
+        q_of_v = _moving_average(q_of_v, smooth)
+        dqdv = np.gradient(q_of_v, voltage_grid, axis=1) if len(voltage_grid) > 1 else q_of_v * np.nan
+        
+        # V(Q): 누적 용량은 구간 안에서 비감소
+        v_of_q = _moving_average(_batched_interp(capacity, voltage, lengths, capacity_grid), smooth)
+        dvdq = np.gradient(v_of_q, capacity_grid, axis=1) if len(capacity_grid) > 1 else v_of_q * np.nan
+        
+        position = 0
+        for key, curve in zip(keys, curves):
+            n = len(curve)
+            results[key].append((curve, q_of_v[position:position + n], dqdv[position:position + n],
+                                 v_of_q[position:position + n], dvdq[position:position + n]))
+            position += n
+    
+    for key in keys:
+        parts = results[key]
+        data['channels'][key]['dqdv'] = {
+            'params': params,
+            'signature': signatures[key],
+            'extent': extents[key],
+            'curves': pd.concat([p[0] for p in parts], ignore_index=True),
+            'voltage_mV': voltage_grid,
+            'Q_mAh': np.vstack([p[1] for p in parts]),
+            'dQdV': np.vstack([p[2] for p in parts]),
+            'capacity_mAh': capacity_grid,
+            'V_mV': np.vstack([p[3] for p in parts]),
+            'dVdQ': np.vstack([p[4] for p in parts]),
+        }
+
+
+def _collect_dqdv(data, selections, grids):
+    """채널 캐시를 모아 전체 결과 생성 (모든 캐시는 grids로 계산된 상태)"""
+    caches = [data['channels'][key]['dqdv'] for key in selections]
+    if not caches:
+        empty = np.empty((0, 0))
+        return {'curves': pd.DataFrame(columns=['channel', 'cycle_index', 'Cycle', 'direction']),
+                'voltage_mV': np.empty(0), 'Q_mAh': empty, 'dQdV': empty,
+                'capacity_mAh': np.empty(0), 'V_mV': empty, 'dVdQ': empty}
+    return {
+        'curves': pd.concat([c['curves'] for c in caches], ignore_index=True),
+        'voltage_mV': grids[0],
+        'Q_mAh': np.vstack([c['Q_mAh'] for c in caches]),
+        'dQdV': np.vstack([c['dQdV'] for c in caches]),
+        'capacity_mAh': grids[1],
+        'V_mV': np.vstack([c['V_mV'] for c in caches]),
+        'dVdQ': np.vstack([c['dVdQ'] for c in caches]),
+    }
+
+
+# ============================================================================
+# 펄스 저항 (DCIR)
+# ============================================================================
+
+# 기본 측정 시점 (펄스 시작 후 초)
+_DCIR_OFFSETS_S = (0.1, 1.0, 10.0)
+
+# 경과 시간 비교 허용 오차 (초)
+_DCIR_TIME_RESOLUTION = 1e-6
+
+DCIR_COLUMNS = ['channel', 'cycle_index', 'Cycle', 'pulse', 'step', 'direction', 'start_s',
+                'I0_mA', 'V0_mV', 'offset_s', 'I_mA', 'V_mV', 'dI_mA', 'dV_mV', 'R_mOhm']
+
+
+def _dcir_arrays(cycle_list, indices, mincapa):
+    """채널 하나의 선택 사이클 행에서 펄스 검출에 필요한 열 (없는 열은 NaN)"""
+    frame = cycle_list.frame
+    rows, lengths = _category_rows(cycle_list, np.asarray(indices, dtype=np.int64))
+    
+    def column(name):
+        if name not in frame.columns:
+            return np.full(len(rows), np.nan)
+        return frame[name].to_numpy(dtype=np.float64)[rows]
+    
+    return {
+        'time': column('time_cyc'),
+        'voltage': column('Voltage_V'),
+        'current': column('Current_mA'),
+        'steptime': column('Steptime_s'),
+        'step': column('step'),
+        'mincapa': np.full(len(rows), float(mincapa)),
+        'lengths': lengths,
+    }
+
+
+def _dcir_pulses(arrays, min_step_crate):
+    """
+    전류 스텝 경계와 펄스(전류 변화가 min_step_crate 이상인 경계) 위치
+    
+    경계는 같은 사이클 안에서 step 번호가 바뀌거나, Steptime_s가 다시 0부터
+    시작하거나, 전류가 min_step_crate × mincapa 이상 변하는 행입니다.
+    펄스 구간은 펄스 경계부터 다음 경계(또는 사이클 끝) 직전까지입니다.
+    
+    Returns:
+    --------
+    tuple : (펄스 시작 행, 펄스 구간 끝 행(제외), 행별 사이클 번호)
+    """
+    current, step, steptime = arrays['current'], arrays['step'], arrays['steptime']
+    lengths = arrays['lengths']
+    cycle_of_row = np.repeat(np.arange(len(lengths)), lengths)
+    
+    same_cycle = cycle_of_row[1:] == cycle_of_row[:-1]
+    step_changed = (step[1:] != step[:-1]) & ~np.isnan(step[1:]) & ~np.isnan(step[:-1])
+    steptime_reset = steptime[1:] < steptime[:-1]
+    jump = np.abs(current[1:] - current[:-1]) >= min_step_crate * np.abs(arrays['mincapa'][1:])
+    
+    boundary = same_cycle & (step_changed | steptime_reset | jump)
+    pulse = boundary & jump
+    
+    cycle_starts = np.cumsum(lengths) - lengths
+    bounds = np.union1d(np.flatnonzero(boundary) + 1, np.append(cycle_starts, len(current)))
+    starts = np.flatnonzero(pulse) + 1
+    ends = bounds[np.searchsorted(bounds, starts, side='right')]
+    return starts, ends, cycle_of_row
+
+
+def compute_dcir(data, category='Resistance_Measurement', offsets_s=_DCIR_OFFSETS_S,
+                 min_step_crate=0.05):
+    """
+    모든 채널의 카테고리 사이클에서 전류 펄스를 찾아 시점별 저항 ΔV/ΔI 계산
+    
+    선택한 사이클의 행을 채널 전체에 걸쳐 하나의 배열로 모은 뒤, 전류 스텝 경계를
+    배열 비교로 찾고, 모든 펄스 × 측정 시점을 한 번의 보간으로 계산합니다.
+    
+        R(t) = (V(t) - V0) / (I(t) - I0)
+    
+    V0, I0는 펄스 직전 마지막 측정값, V(t), I(t)는 펄스 시작 후 t초의 값
+    (구간 안 선형 보간)입니다. 펄스 시작 시각은 Steptime_s가 있으면 첫 측정
+    시각 - Steptime_s, 없으면 직전 측정 시각입니다. t가 펄스 구간의 측정 범위를
+    벗어나면 NaN입니다. 펄스가 끝나는 경계(휴지 전환)도 펄스로 포함되며
+    direction이 'rest'입니다.
+    
+    Parameters:
+    -----------
+    data : dict
+        categorize_all_channels()의 출력 (profile은 CycleList, time_cyc 필요)
+    category : str or None
+        대상 카테고리 (None이면 모든 사이클)
+    offsets_s : sequence of float
+        측정 시점 (펄스 시작 후 초)
+    min_step_crate : float
+        펄스로 볼 최소 전류 변화 (C-rate, 채널 mincapa 기준)
+    
+    Returns:
+    --------
+    pd.DataFrame : 펄스 × 측정 시점당 1행 (DCIR_COLUMNS, 저항은 mΩ)
+    """
+    offsets_s = np.sort(np.asarray(offsets_s, dtype=np.float64))
+    parts, cycles = [], []
+    for channel_key, channel_data in data['channels'].items():
+        cycle_list = channel_data.get('profile')
+        if not isinstance(cycle_list, CycleList):
+            continue
+        if category is None:
+            indices = list(range(len(cycle_list)))
+        else:
+            indices = list((channel_data.get('cycle_list') or {}).get(category) or [])
+        if not indices:
+            continue
+        mincapa = _channel_mincapa(channel_data.get('cycle'), channel_data['capacity_mAh'])
+        parts.append(_dcir_arrays(cycle_list, indices, mincapa))
+        cycles.append(pd.DataFrame({
+            'channel': channel_key,
+            'cycle_index': indices,
+            'Cycle': np.asarray(cycle_list.cycle_numbers)[indices],
+        }))
+    
+    if not parts:
+        return pd.DataFrame(columns=DCIR_COLUMNS)
+    
+    arrays = {name: np.concatenate([p[name] for p in parts]) for name in parts[0]}
+    cycles = pd.concat(cycles, ignore_index=True)
+    starts, ends, cycle_of_row = _dcir_pulses(arrays, min_step_crate)
+    if len(starts) == 0:
+        return pd.DataFrame(columns=DCIR_COLUMNS)
+    
+    time, voltage, current = arrays['time'], arrays['voltage'], arrays['current']
+    before = starts - 1
+    first_dt = time[starts] - time[before]
+    steptime = arrays['steptime'][starts]
+    # Steptime_s가 첫 측정 간격 안에 있으면 실제 스텝 시작 시각을 사용
+    use_steptime = (steptime >= 0) & (steptime <= first_dt + _DCIR_TIME_RESOLUTION)
+    start_time = np.where(use_steptime, time[starts] - steptime, time[before])
+    
+    lengths = ends - starts
+    rows = np.arange(int(lengths.sum())) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    # 시간 차의 부동소수 오차로 구간 끝 시점(예: 10초 펄스의 10초)이 범위 밖이 되지 않도록
+    elapsed = np.round(time[rows] - np.repeat(start_time, lengths), 6)
+    v_t = _batched_interp(elapsed, voltage[rows], lengths, offsets_s)
+    i_t = _batched_interp(elapsed, current[rows], lengths, offsets_s)
+    
+    v0, i0 = voltage[before], current[before]
+    d_v = v_t - v0[:, None]
+    d_i = i_t - i0[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        resistance = np.where(d_i != 0, d_v / d_i * 1000, np.nan)
+    
+    pulse_cycles = cycle_of_row[starts]
+    pulse_no = np.arange(len(starts)) - np.searchsorted(pulse_cycles, pulse_cycles, side='left')
+    pulse_current = current[starts]
+    direction = np.where(np.abs(pulse_current) < min_step_crate * np.abs(arrays['mincapa'][starts]),
+                         'rest', np.where(pulse_current > 0, 'charge', 'discharge'))
+    
+    n_offsets = len(offsets_s)
+    table = cycles.iloc[np.repeat(pulse_cycles, n_offsets)].reset_index(drop=True)
+    per_pulse = {
+        'pulse': pulse_no,
+        'step': arrays['step'][starts],
+        'direction': direction,
+        'start_s': start_time,
+        'I0_mA': i0,
+        'V0_mV': v0,
+    }
+    for name, values in per_pulse.items():
+        table[name] = np.repeat(values, n_offsets)
+    table['offset_s'] = np.tile(offsets_s, len(starts))
+    table['I_mA'] = i_t.ravel()
+    table['V_mV'] = v_t.ravel()
+    table['dI_mA'] = d_i.ravel()
+    table['dV_mV'] = d_v.ravel()
+    table['R_mOhm'] = resistance.ravel()
+    return table[DCIR_COLUMNS]
+
+
+# ============================================================================
+# 수명(SOH) / 효율 지표
+# ============================================================================
+
+CYCLE_PANEL_COLUMNS = ['channel', 'cycler_type', 'Cycle', 'DchgCap_mAh', 'ChgCap_mAh',
+                       'DchgEnergy_mWh', 'ChgEnergy_mWh', 'Temp_C']
+
+FLEET_METRIC_COLUMNS = ['retention', 'coulombic_efficiency', 'energy_efficiency']
+
+# Toyo capacity.log의 Condition (1: 충전, 2: 방전)
+_TOYO_CHARGE_CONDITION = 1
+_TOYO_DISCHARGE_CONDITION = 2
+
+
+# 패널 열 ← PNE cycle_summary 열 (에너지는 ChgPow/DchgPow)
+_PNE_PANEL_SOURCES = {'Cycle': 'Cycle', 'DchgCap_mAh': 'DchgCap_mAh', 'ChgCap_mAh': 'ChgCap_mAh',
+                      'DchgEnergy_mWh': 'DchgPow_mW', 'ChgEnergy_mWh': 'ChgPow_mW',
+                      'Temp_C': 'Temp_C'}
+
+
+def _pne_panel_columns(cycle_summary):
+    """PNE cycle_summary (Condition == 8) → 패널 열 (사이클당 1행, 없는 열은 NaN)"""
+    # 채널이 많을 때 열마다 꺼내는 오버헤드가 크므로 프레임 전체를 한 번에 2차원 배열로 변환
+    try:
+        values = cycle_summary.to_numpy(dtype=np.float64)
+        position = {name: i for i, name in enumerate(cycle_summary.columns)}
+    except (TypeError, ValueError):
+        values = cycle_summary.reindex(columns=list(_PNE_PANEL_SOURCES.values())).to_numpy(
+            dtype=np.float64)
+        position = {name: i for i, name in enumerate(_PNE_PANEL_SOURCES.values())}
+    missing = np.full(len(values), np.nan)
+    return {name: values[:, position[source]] if source in position else missing
+            for name, source in _PNE_PANEL_SOURCES.items()}
+
+
+def _toyo_panel_columns(cycle_df):
+    """
+    Toyo capacity.log → 패널 열
+    
+    충전(Condition 1)/방전(Condition 2) 행을 사이클 번호로 맞추며,
+    에너지는 Capacity_mAh × AvgVolt_V (mWh)입니다.
+    """
+    cycle = cycle_df['Cycle'].to_numpy(dtype=np.float64)
+    condition = (cycle_df['Condition'].to_numpy(dtype=np.float64) if 'Condition' in cycle_df.columns
+                 else np.full(len(cycle), _TOYO_DISCHARGE_CONDITION))
+    capacity = cycle_df['Capacity_mAh'].to_numpy(dtype=np.float64)
+    volt = (cycle_df['AvgVolt_V'].to_numpy(dtype=np.float64) if 'AvgVolt_V' in cycle_df.columns
+            else np.full(len(cycle), np.nan))
+    temp = (cycle_df['Temp_C'].to_numpy(dtype=np.float64) if 'Temp_C' in cycle_df.columns
+            else np.full(len(cycle), np.nan))
+    
+    valid = ~np.isnan(cycle)
+    cycles = np.sort(cycle[valid])
+    cycles = cycles[np.r_[True, cycles[1:] != cycles[:-1]]] if len(cycles) else cycles
+    out = {'Cycle': cycles}
+    for prefix, cond in (('Dchg', _TOYO_DISCHARGE_CONDITION), ('Chg', _TOYO_CHARGE_CONDITION)):
+        rows = np.flatnonzero(valid & (condition == cond))
+        # 같은 사이클에 여러 행이면 마지막 행 (searchsorted 위치에 순서대로 덮어씀)
+        position = np.searchsorted(cycles, cycle[rows])
+        cap = np.full(len(cycles), np.nan)
+        energy = np.full(len(cycles), np.nan)
+        cap[position] = capacity[rows]
+        energy[position] = capacity[rows] * volt[rows]
+        out[f'{prefix}Cap_mAh'] = cap
+        out[f'{prefix}Energy_mWh'] = energy
+        if cond == _TOYO_DISCHARGE_CONDITION:
+            out['Temp_C'] = np.full(len(cycles), np.nan)
+            out['Temp_C'][position] = temp[rows]
+    return out
+
+
+def build_cycle_panel(data):
+    """
+    모든 채널의 사이클 요약을 하나의 열 중심 패널로 쌓기 (채널 × 사이클당 1행)
+    
+    PNE는 cycle_summary (Condition == 8), Toyo는 capacity.log의 충전/방전 행을
+    사용합니다. channel 열은 category dtype이며, 채널 순서는 data['channels'] 순서,
+    채널 안에서는 Cycle 순으로 정렬됩니다 (중복 사이클은 마지막 행).
+    
+    Returns:
+    --------
+    pd.DataFrame : CYCLE_PANEL_COLUMNS
+    """
+    keys, cycler_types, parts = [], [], []
+    in_order = True
+    for channel_key, channel_data in data['channels'].items():
+        if channel_data['cycler_type'] == 'PNE':
+            summary = channel_data.get('cycle_summary')
+            if summary is None or summary.empty:
+                continue
+            columns = _pne_panel_columns(summary)
+        else:
+            cycle_df = channel_data.get('cycle')
+            if cycle_df is None or cycle_df.empty or 'Capacity_mAh' not in cycle_df.columns:
+                continue
+            columns = _toyo_panel_columns(cycle_df)
+        cycle = columns['Cycle']
+        in_order &= len(cycle) == 0 or bool(~np.isnan(cycle[0]) and (np.diff(cycle) > 0).all())
+        keys.append(channel_key)
+        cycler_types.append(CYCLER_TYPES.index(channel_data['cycler_type']))
+        parts.append(columns)
+    
+    lengths = np.array([len(p['Cycle']) for p in parts], dtype=np.int64)
+    codes = np.repeat(np.arange(len(parts)), lengths)
+    panel = {name: np.concatenate([p[name] for p in parts]) if parts else np.empty(0)
+             for name in CYCLE_PANEL_COLUMNS[2:]}
+    
+    if not in_order:
+        # 채널 순서 → Cycle 순 (안정 정렬), 같은 (채널, Cycle)은 마지막 행만
+        order = np.lexsort((panel['Cycle'], codes))
+        codes = codes[order]
+        panel = {name: values[order] for name, values in panel.items()}
+        keep = ~np.isnan(panel['Cycle'])
+        keep[:-1] &= ~((codes[1:] == codes[:-1]) & (panel['Cycle'][1:] == panel['Cycle'][:-1]))
+        codes = codes[keep]
+        panel = {name: values[keep] for name, values in panel.items()}
+    
+    frame = pd.DataFrame({
+        'channel': pd.Categorical.from_codes(codes, categories=pd.Index(keys, dtype=object)),
+        'cycler_type': pd.Categorical.from_codes(np.asarray(cycler_types, dtype=np.int64)[codes],
+                                                 categories=list(CYCLER_TYPES)),
+        **panel,
+    })
+    frame['Cycle'] = frame['Cycle'].astype(np.int64)
+    return frame
+
+
+def _segment_first_valid(values, valid, starts):
+    """구간(starts 경계)별 첫 유효값 (없으면 NaN)"""
+    positions = np.where(valid, np.arange(len(values)), len(values))
+    first = np.minimum.reduceat(positions, starts) if len(starts) else np.empty(0, dtype=np.int64)
+    padded = np.append(values, np.nan)
+    return padded[first]
+
+
+def _segmented_linear_fit(x, y, codes, n_segments):
+    """
+    구간(채널)별 최소제곱 직선 y = intercept + slope·x (NaN 점 제외)
+    
+    bincount 가중합으로 모든 채널을 한 번에 계산합니다.
+    
+    Returns:
+    --------
+    tuple : (slope, intercept, r2, 점 수) - 채널별 배열
+    """
+    valid = ~(np.isnan(x) | np.isnan(y))
+    c, x, y = codes[valid], x[valid], y[valid]
+    
+    def total(weights=None):
+        return np.bincount(c, weights=weights, minlength=n_segments).astype(np.float64)
+    
+    n = total()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x = total(x) / n
+        mean_y = total(y) / n
+        dx = x - mean_x[c]
+        dy = y - mean_y[c]
+        sxx, sxy, syy = total(dx * dx), total(dx * dy), total(dy * dy)
+        slope = np.where((n >= 2) & (sxx > 0), sxy / sxx, np.nan)
+        intercept = mean_y - slope * mean_x
+        r2 = np.where(syy > 0, sxy * sxy / (sxx * syy), np.nan)
+    r2[np.isnan(slope)] = np.nan
+    return slope, intercept, r2, n.astype(np.int64)
+
+
+def compute_fleet_metrics(data=None, panel=None, eol_retention=0.8):
+    """
+    전체 채널의 용량 유지율, 쿨롱/에너지 효율, 용량 감소 fit을 한 번에 계산
+    
+    build_cycle_panel()의 패널에 사이클별 지표 열을 추가하고, 채널별
+    직선 fit (retention ~ Cycle)과 제곱근 fit (retention ~ √Cycle)을
+    bincount 가중합으로 모든 채널에 대해 한 번에 계산합니다.
+    
+    - retention : DchgCap_mAh / 채널의 첫 유효(>0) 방전 용량
+    - coulombic_efficiency : DchgCap_mAh / ChgCap_mAh
+    - energy_efficiency : DchgEnergy_mWh / ChgEnergy_mWh
+    
+    Parameters:
+    -----------
+    data : dict, optional
+        process_and_combine()의 출력 (panel이 없을 때 패널 생성)
+    panel : pd.DataFrame, optional
+        build_cycle_panel() 결과 (여러 번 계산할 때 재사용)
+    eol_retention : float
+        수명 종료 기준 유지율 (직선 fit으로 도달 사이클 추정)
+    
+    Returns:
+    --------
+    dict :
+        'panel' : 패널 + FLEET_METRIC_COLUMNS
+        'channels' : 채널당 1행 (사이클 수, 초기 용량, 최근 유지율, 평균 효율,
+                     linear_* / sqrt_* fit 계수와 R², eol_cycle)
+    """
+    if panel is None:
+        panel = build_cycle_panel(data)
+    
+    # 채널 → Cycle 순으로 연속 (build_cycle_panel 결과는 이미 정렬됨)
+    codes = panel['channel'].cat.codes.to_numpy()
+    cycle = panel['Cycle'].to_numpy()
+    step = np.diff(codes)
+    if not ((step > 0) | ((step == 0) & (np.diff(cycle) > 0))).all():
+        panel = panel.iloc[np.lexsort((cycle, codes))]
+    panel = panel.reset_index(drop=True)
+    
+    codes = panel['channel'].cat.codes.to_numpy().astype(np.int64)
+    n_channels = len(panel['channel'].cat.categories)
+    dchg = panel['DchgCap_mAh'].to_numpy(dtype=np.float64)
+    chg = panel['ChgCap_mAh'].to_numpy(dtype=np.float64)
+    dchg_energy = panel['DchgEnergy_mWh'].to_numpy(dtype=np.float64)
+    chg_energy = panel['ChgEnergy_mWh'].to_numpy(dtype=np.float64)
+    cycle = panel['Cycle'].to_numpy(dtype=np.float64)
+    
+    present = np.bincount(codes, minlength=n_channels) > 0
+    starts = np.searchsorted(codes, np.flatnonzero(present))
+    initial = np.full(n_channels, np.nan)
+    initial[present] = _segment_first_valid(dchg, dchg > 0, starts)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        retention = np.where(dchg > 0, dchg / initial[codes], np.nan)
+        coulombic = np.where(chg > 0, dchg / chg, np.nan)
+        energy = np.where(chg_energy > 0, dchg_energy / chg_energy, np.nan)
+    panel['retention'] = retention
+    panel['coulombic_efficiency'] = coulombic
+    panel['energy_efficiency'] = energy
+    
+    def channel_mean(values):
+        valid = ~np.isnan(values)
+        with np.errstate(invalid='ignore'):
+            return (np.bincount(codes[valid], weights=values[valid], minlength=n_channels)
+                    / np.bincount(codes[valid], minlength=n_channels))
+    
+    last = np.full(n_channels, np.nan)
+    valid = ~np.isnan(retention)
+    last[codes[valid]] = retention[valid]   # 채널 안에서 Cycle 순이므로 마지막 값이 남음
+    
+    channels = pd.DataFrame({
+        'channel': panel['channel'].cat.categories,
+        'cycles': np.bincount(codes, minlength=n_channels),
+        'initial_capacity_mAh': initial,
+        'last_retention': last,
+        'mean_coulombic_efficiency': channel_mean(coulombic),
+        'mean_energy_efficiency': channel_mean(energy),
+    })
+    for name, x in (('linear', cycle), ('sqrt', np.sqrt(cycle))):
+        slope, intercept, r2, n = _segmented_linear_fit(x, retention, codes, n_channels)
+        channels[f'{name}_slope'] = slope
+        channels[f'{name}_intercept'] = intercept
+        channels[f'{name}_r2'] = r2
+    channels['fit_points'] = n
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        eol = (eol_retention - channels['linear_intercept']) / channels['linear_slope']
+    channels['eol_cycle'] = eol.where(channels['linear_slope'] < 0)
+    return {'panel': panel, 'channels': channels}
+
+
+# ============================================================================
+# 사이클 리샘플링 (채널 × 사이클 × grid 텐서)
+# ============================================================================
+
+# 기본 리샘플링 열 (Voltage_V는 mV 단위)
+RESAMPLE_COLUMNS = ('Voltage_V', 'Current_mA', 'Temp_C')
+# x축: 'time' (사이클 시작 후 초), 'capacity' (사이클 시작 후 누적 |전류| 용량, mAh)
+RESAMPLE_AXES = ('time', 'capacity')
+# 사이클 축 정렬: 'ordinal' (채널별 k번째 선택 사이클), 'cycle' (같은 Cycle 번호)
+RESAMPLE_ALIGNS = ('ordinal', 'cycle')
+
+# 디스크 출력 디렉토리 구성 (axes 파일은 values를 다 쓴 뒤 마지막에 기록)
+_RESAMPLE_VALUES_FILE = 'values.npy'
+_RESAMPLE_AXES_FILE = 'axes.npz'
+
+
+def _resample_selection(channel_data, categories, cycles):
+    """
+    채널의 리샘플링 대상 사이클 인덱스 (CycleList 순서)
+    
+    categories의 사이클을 합친 뒤 cycles 조건을 적용합니다
+    (None: 전체, slice: 선택 사이클 순서, (시작, 끝): Cycle 번호 범위, 그 외: Cycle 번호 목록).
+    
+    Returns:
+    --------
+    tuple : (CycleList 또는 None, 사이클 인덱스 배열)
+    """
+    cycle_list = channel_data.get('profile')
+    if not isinstance(cycle_list, CycleList):
+        return None, np.empty(0, dtype=np.int64)
+    
+    if categories is None:
+        indices = np.arange(len(cycle_list), dtype=np.int64)
+    else:
+        labels = channel_data.get('cycle_list') or {}
+        indices = np.array(sorted({int(i) for category in categories
+                                   for i in labels.get(category) or []}), dtype=np.int64)
+    
+    if cycles is None:
+        return cycle_list, indices
+    if isinstance(cycles, slice):
+        return cycle_list, indices[cycles]
+    numbers = np.asarray(cycle_list.cycle_numbers, dtype=np.float64)[indices]
+    if isinstance(cycles, tuple) and len(cycles) == 2:
+        first, last = cycles
+        keep = np.ones(len(indices), dtype=bool)
+        if first is not None:
+            keep &= numbers >= first
+        if last is not None:
+            keep &= numbers <= last
+    else:
+        keep = np.isin(numbers, np.asarray(list(cycles), dtype=np.float64))
+    return cycle_list, indices[keep]
+
+
+def _resample_axis(cycle_list, indices, x, normalize):
+    """
+    선택 사이클의 x축 값 (구간마다 0부터, 비감소)
+    
+    time_s가 없는 행은 제외하고, 시간 역행은 구간별 누적 최대로 평탄화합니다.
+    보간할 수 없는 구간(2점 미만, normalize=True에서 x 범위 0)은 제외합니다.
+    
+    Returns:
+    --------
+    tuple : (frame 행 위치, x 값, 구간 길이, 구간의 indices 내 위치)
+    """
+    frame = cycle_list.frame
+    rows, lengths = _category_rows(cycle_list, indices)
+    segment = np.repeat(np.arange(len(indices)), lengths)
+    time_s = frame['time_s'].to_numpy(dtype=np.float64)[rows]
+    keep = ~np.isnan(time_s)
+    rows, time_s, segment = rows[keep], time_s[keep], segment[keep]
+    
+    counts = np.bincount(segment, minlength=len(indices))
+    present = np.flatnonzero(counts)
+    lengths = counts[present]
+    starts = np.cumsum(lengths) - lengths
+    first = np.zeros(len(time_s), dtype=bool)
+    first[starts] = True
+    
+    elapsed = time_s - np.repeat(time_s[starts], lengths)
+    elapsed = _monotone_envelope(elapsed, lengths)
+    if x == 'time':
+        values = elapsed
+    else:
+        current = frame['Current_mA'].to_numpy(dtype=np.float64)[rows]
+        time_diff = np.diff(elapsed, prepend=0.0)
+        time_diff[first] = 0.0
+        dq = np.abs(current) * time_diff / 3600
+        dq[np.isnan(dq)] = 0.0
+        values = _segmented_cumsum(dq, np.append(starts, len(dq)))
+    
+    span = np.maximum.reduceat(values, starts) if len(values) else values
+    valid = lengths >= 2
+    if normalize:
+        valid &= span > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = values / np.repeat(span, lengths)
+    
+    keep = np.repeat(valid, lengths)
+    return rows[keep], values[keep], lengths[valid], present[valid]
+
+
+def _resample_grid(grid, selections, x, normalize):
+    """grid가 점 수이면 0 ~ (1 또는 선택 사이클 전체의 최대 x) 균등 grid 생성"""
+    if not np.isscalar(grid):
+        grid = np.asarray(grid, dtype=np.float64)
+        if grid.ndim != 1 or len(grid) == 0 or (np.diff(grid) < 0).any():
+            raise ValueError("grid는 비어 있지 않은 비감소 1차원 배열이어야 합니다")
+        return grid
+    if normalize:
+        return np.linspace(0.0, 1.0, int(grid))
+    
+    x_max = 0.0
+    for cycle_list, indices in selections.values():
+        if len(indices):
+            _, values, _, _ = _resample_axis(cycle_list, indices, x, normalize)
+            if len(values):
+                x_max = max(x_max, float(values.max()))
+    return np.linspace(0.0, x_max, int(grid))
+
+
+def resample_cycles(data, channels=None, categories=('RPT',), cycles=None, x='time',
+                    grid=200, normalize=True, columns=RESAMPLE_COLUMNS, align='ordinal',
+                    path=None, dtype=np.float32):
+    """
+    채널 × 사이클 선택을 공통 grid에 보간하여 하나의 (열, 채널, 사이클, grid) 배열로 만들기
+    
+    get_category_cycles()로 사이클 DataFrame을 하나씩 꺼내 보간하는 대신, 채널마다
+    선택 사이클 전체를 열별로 한 번의 보간(_batched_interp)으로 계산해 미리 할당한
+    배열의 채널 위치에 채웁니다. path를 주면 배열을 디스크의 .npy memmap으로 만들어
+    채널 수와 관계없이 메모리에는 채널 하나의 결과만 올라갑니다.
+    
+    Parameters:
+    -----------
+    data : dict
+        categorize_all_channels()의 출력 (profile은 CycleList)
+    channels : list of str, optional
+        채널 키 (None이면 선택 사이클이 있는 모든 채널, 지정하면 그 순서)
+    categories : str or list of str or None
+        대상 카테고리 (None이면 모든 사이클)
+    cycles : slice, tuple or list, optional
+        카테고리 사이클 중 선택 (slice: 순서, (시작, 끝): Cycle 범위, list: Cycle 번호)
+    x : str
+        'time' (사이클 시작 후 초) 또는 'capacity' (누적 |전류| 용량, mAh)
+    grid : int or array
+        grid 점 수 또는 grid 값 (x 단위, normalize=True면 0~1)
+    normalize : bool
+        True면 사이클마다 x를 최댓값으로 나눠 0~1로 정규화
+        (False이고 grid가 점 수이면 범위를 정하기 위해 선택 사이클을 한 번 더 읽음)
+    columns : sequence of str
+        보간할 열 (채널에 없는 열은 NaN)
+    align : str
+        'ordinal' (채널별 k번째 선택 사이클) 또는 'cycle' (같은 Cycle 번호끼리)
+    path : str, optional
+        출력 디렉토리 (values.npy memmap + axes.npz, open_resampled_cycles()로 다시 열기)
+    dtype : numpy dtype
+        출력 배열 dtype (기본 float32)
+    
+    Returns:
+    --------
+    dict :
+        'values' : (열, 채널, 사이클, grid) 배열 (path가 있으면 np.memmap)
+                   - 빈 자리와 x 범위 밖은 NaN
+        'columns', 'channels' : 열 / 채널 축 이름
+        'grid' : grid 값, 'x' / 'normalize' / 'align' : 설정
+        'cycles' : (채널, 사이클) Cycle 번호 (빈 자리 NaN)
+        'cycle_index' : (채널, 사이클) CycleList 인덱스 (빈 자리 -1)
+    """
+    if x not in RESAMPLE_AXES:
+        raise ValueError(f"지원하지 않는 x축: {x} (가능: {', '.join(RESAMPLE_AXES)})")
+    if align not in RESAMPLE_ALIGNS:
+        raise ValueError(f"지원하지 않는 정렬: {align} (가능: {', '.join(RESAMPLE_ALIGNS)})")
+    if isinstance(categories, str):
+        categories = (categories,)
+    columns = list(columns)
+    
+    keys = list(data['channels'].keys()) if channels is None else list(channels)
+    selections = {}
+    for channel_key in keys:
+        selections[channel_key] = _resample_selection(data['channels'][channel_key],
+                                                      categories, cycles)
+    if channels is None:
+        selections = {key: value for key, value in selections.items() if len(value[1])}
+        keys = list(selections)
+    
+    # 사이클 축: 채널별 선택 사이클의 자리
+    numbers = {key: (np.asarray(cycle_list.cycle_numbers, dtype=np.float64)[indices]
+                     if cycle_list is not None else np.empty(0))
+               for key, (cycle_list, indices) in selections.items()}
+    if align == 'cycle':
+        union = np.sort(np.concatenate([np.empty(0)] + list(numbers.values())))
+        union = union[np.r_[True, union[1:] != union[:-1]]] if len(union) else union
+        slots = {key: np.searchsorted(union, values) for key, values in numbers.items()}
+        n_slots = len(union)
+    else:
+        slots = {key: np.arange(len(values)) for key, values in numbers.items()}
+        n_slots = max((len(values) for values in numbers.values()), default=0)
+    
+    grid = _resample_grid(grid, selections, x, normalize)
+    cycle_numbers = np.full((len(keys), n_slots), np.nan)
+    cycle_index = np.full((len(keys), n_slots), -1, dtype=np.int64)
+    shape = (len(columns), len(keys), n_slots, len(grid))
+    
+    if path is None:
+        values = np.empty(shape, dtype=dtype)
+    else:
+        os.makedirs(path, exist_ok=True)
+        axes_path = os.path.join(path, _RESAMPLE_AXES_FILE)
+        # 이전 결과의 axes가 새 values와 짝지어지지 않도록 먼저 삭제
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(axes_path)
+        values = np.lib.format.open_memmap(os.path.join(path, _RESAMPLE_VALUES_FILE),
+                                           mode='w+', dtype=dtype, shape=shape)
+    
+    for position, channel_key in enumerate(keys):
+        cycle_list, indices = selections[channel_key]
+        block = np.full((len(columns), n_slots, len(grid)), np.nan)
+        if len(indices):
+            channel_slots = slots[channel_key]
+            cycle_numbers[position, channel_slots] = numbers[channel_key]
+            cycle_index[position, channel_slots] = indices
+            
+            rows, x_values, lengths, segments = _resample_axis(cycle_list, indices, x, normalize)
+            frame = cycle_list.frame
+            for c, column in enumerate(columns):
+                if column not in frame.columns or not len(lengths):
+                    continue
+                y = frame[column].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+                block[c, channel_slots[segments]] = _batched_interp(x_values, y, lengths, grid)
+        values[:, position] = block
+    
+    result = {'values': values, 'columns': columns, 'channels': keys, 'grid': grid,
+              'x': x, 'normalize': normalize, 'align': align,
+              'cycles': cycle_numbers, 'cycle_index': cycle_index}
+    
+    if path is not None:
+        values.flush()
+        buffer = io.BytesIO()
+        np.savez(buffer, columns=np.array(columns, dtype=str), channels=np.array(keys, dtype=str),
+                 grid=grid, x=np.array(x), normalize=np.array(normalize), align=np.array(align),
+                 cycles=cycle_numbers, cycle_index=cycle_index)
+        _write_atomic(axes_path, buffer.getvalue())
+    return result
+
+
+def open_resampled_cycles(path, mode='r'):
+    """
+    resample_cycles(path=...)로 저장한 결과를 memmap으로 다시 열기
+    
+    Parameters:
+    -----------
+    path : str
+        resample_cycles()의 출력 디렉토리
+    mode : str
+        np.load의 mmap_mode ('r': 읽기 전용, 'r+': 수정 가능, 'c': copy-on-write)
+    
+    Returns:
+    --------
+    dict : resample_cycles()와 같은 구조
+    """
+    axes_path = os.path.join(path, _RESAMPLE_AXES_FILE)
+    if not os.path.isfile(axes_path):
+        raise FileNotFoundError(f"리샘플링 결과가 없거나 기록이 끝나지 않았습니다: {path}")
+    with np.load(axes_path, allow_pickle=False) as axes:
+        result = {
+            'values': np.load(os.path.join(path, _RESAMPLE_VALUES_FILE), mmap_mode=mode),
+            'columns': axes['columns'].tolist(),
+            'channels': axes['channels'].tolist(),
+            'grid': axes['grid'],
+            'x': str(axes['x']),
+            'normalize': bool(axes['normalize']),
+            'align': str(axes['align']),
+            'cycles': axes['cycles'],
+            'cycle_index': axes['cycle_index'],
+        }
+    return result
+
+
+# ============================================================================
+# 데이터 통합 및 변환
+# ============================================================================
+
+def process_and_combine(paths, workers=None, use_processes=True, compact=False,
+                        toyo_max_cycles=3):
+    """paths를 입력받아 데이터 로드 및 통합 (workers > 1이면 채널 병렬 로딩)"""
+    df_results, loaded_data = process_battery_data(paths, workers=workers,
+                                                   use_processes=use_processes,
+                                                   compact=compact,
+                                                   toyo_max_cycles=toyo_max_cycles)
+    
+    return _build_combined_result(paths, loaded_data)
+
+
+def process_and_combine_incremental(paths, previous=None, workers=None, use_processes=True,
+                                    compact=False, toyo_max_cycles=3):
+    """
+    증분 모드 데이터 로드 및 통합
+    
+    채널별 manifest(파일 크기, 수정 시각, 읽은 위치, 행 수)를 기록하고,
+    다음 실행에서는 새 파일과 기존 파일에 추가된 부분만 파싱하여
+    이전 채널 데이터에 병합합니다.
+    
+    Parameters:
+    -----------
+    paths : list of str
+        분석할 경로 리스트
+    previous : dict or str, optional
+        이전 process_and_combine_incremental() 결과 또는 save_data()로 저장한 파일 경로.
+        None이면 전체를 파싱하고 manifest만 새로 기록합니다.
+    workers, use_processes, compact, toyo_max_cycles :
+        process_battery_data()와 동일
+    
+    Returns:
+    --------
+    dict : process_and_combine()과 같은 구조 (채널마다 'manifest' 포함)
+    """
+    if isinstance(previous, str):
+        previous = load_data(previous)
+    previous_channels = previous['channels'] if previous is not None else {}
+    
+    df_results, loaded_data = process_battery_data(paths, workers=workers,
+                                                   use_processes=use_processes,
+                                                   previous=previous_channels,
+                                                   compact=compact,
+                                                   toyo_max_cycles=toyo_max_cycles)
+    
+    return _build_combined_result(paths, loaded_data)
+
+
+def _build_combined_result(paths, loaded_data):
+    """loaded_data로 metadata/channels 구조 생성"""
+    cycler_types = {}
+    for channel_data in loaded_data.values():
+        cycler_type = channel_data['cycler_type']
+        cycler_types[cycler_type] = cycler_types.get(cycler_type, 0) + 1
+    
+    result = {
+        'metadata': {
+            'total_channels': len(loaded_data),
+            'total_paths': len(paths),
+            'cycler_types': cycler_types,
+            'paths': paths
+        },
+        'channels': loaded_data
+    }
+    
+    return result
+
+
+def _channel_frames(value):
+    """채널 필드 값 (DataFrame / CycleList / DataFrame list)의 DataFrame 조각 순회"""
+    if isinstance(value, CycleList):
+        yield value.frame
+    elif isinstance(value, list):
+        for item in value:
+            if item is not None and len(item) > 0:
+                yield item
+    elif isinstance(value, pd.DataFrame):
+        yield value
+
+
+def _channel_meta_values(channel_key, channel_data):
+    """내보내기 메타데이터 열 값 (채널당 한 번)"""
+    return {
+        'channel': channel_key,
+        'cycler_type': channel_data['cycler_type'],
+        'folder_name': channel_data['folder_name'],
+        'capacity_mAh_meta': channel_data['capacity_mAh'],
+    }
+
+
+def _categorical_column(value, n_rows):
+    """값 하나를 n_rows 길이 categorical로 (행마다 문자열을 만들지 않음)"""
+    return pd.Categorical.from_codes(np.zeros(n_rows, dtype=np.int8), categories=[value])
+
+
+def combine_to_dataframe(loaded_data):
+    """
+    채널 기반 loaded_data를 통합 DataFrame으로 변환
+    
+    cycle list로 처리된 프로파일(CycleList / DataFrame list)도 이어 붙이며,
+    메타데이터 열은 categorical로 추가합니다. 전체 데이터가 메모리에 올라가므로
+    큰 데이터는 export_stream()으로 파일에 바로 내보내세요.
+    """
+    all_data = []
+    
+    for channel_key, channel_data in loaded_data.items():
+        meta = _channel_meta_values(channel_key, channel_data)
+        for data_type in ('cycle', 'profile'):
+            for frame in _channel_frames(channel_data.get(data_type)):
+                if len(frame) == 0:
+                    continue
+                df_temp = frame.copy()
+                for column in ('channel', 'cycler_type', 'folder_name'):
+                    df_temp[column] = _categorical_column(meta[column], len(df_temp))
+                df_temp['capacity_mAh_meta'] = meta['capacity_mAh_meta']
+                df_temp['data_type'] = _categorical_column(data_type, len(df_temp))
+                all_data.append(df_temp)
+    
+    if all_data:
+        combined_df = pd.concat(all_data, ignore_index=True)
+        
+        meta_cols = ['channel', 'cycler_type', 'data_type', 'folder_name']
+        # 채널마다 카테고리가 달라 concat에서 object가 된 메타 열을 다시 categorical로
+        for column in meta_cols:
+            combined_df[column] = combined_df[column].astype('category')
+        if 'Cycle' in combined_df.columns:
+            meta_cols.append('Cycle')
+        
+        other_cols = [col for col in combined_df.columns if col not in meta_cols]
+        combined_df = combined_df[meta_cols + other_cols]
+        
+        return combined_df
+    else:
+        return pd.DataFrame()
+
+
+# ============================================================================
+# 스트리밍 내보내기 (청크 단위 Parquet / CSV)
+# ============================================================================
+
+EXPORT_META_COLUMNS = ('channel', 'cycler_type', 'folder_name', 'capacity_mAh_meta')
+
+# 한 번에 변환/기록하는 최대 행 수 (메모리 사용량 상한의 기준)
+_EXPORT_CHUNK_ROWS = 500_000
+
+# Parquet 파일 key-value 메타데이터 키
+_EXPORT_METADATA_KEY = b'battery_data_processor'
+
+
+def _export_chunks(value, chunk_rows):
+    """
+    채널 필드 값을 chunk_rows 단위 DataFrame으로 순회
+    
+    큰 프레임은 잘라서, 사이클별 작은 프레임은 chunk_rows까지 모아서 반환합니다.
+    """
+    pending, pending_rows = [], 0
+    for frame in _channel_frames(value):
+        for start in range(0, len(frame), chunk_rows):
+            piece = frame.iloc[start:start + chunk_rows]
+            pending.append(piece)
+            pending_rows += len(piece)
+            if pending_rows >= chunk_rows:
+                yield pd.concat(pending) if len(pending) > 1 else pending[0]
+                pending, pending_rows = [], 0
+    if pending:
+        yield pd.concat(pending) if len(pending) > 1 else pending[0]
+
+
+def _merge_export_dtype(current, dtype):
+    """채널 간 같은 열의 dtype 통합 (숫자끼리는 승격, 그 외는 문자열)"""
+    if current is None:
+        return dtype
+    if current == dtype:
+        return current
+    numeric = (pd.api.types.is_numeric_dtype(current) and pd.api.types.is_numeric_dtype(dtype)
+               and not isinstance(current, pd.CategoricalDtype)
+               and not isinstance(dtype, pd.CategoricalDtype))
+    if numeric:
+        return np.result_type(current, dtype)
+    return np.dtype(object)
+
+
+def _export_columns(channels, data_type):
+    """모든 채널의 data_type 열 이름과 통합 dtype (처음 나온 순서)"""
+    columns = {}
+    for channel_data in channels.values():
+        for frame in _channel_frames(channel_data.get(data_type)):
+            for column, dtype in frame.dtypes.items():
+                columns[column] = _merge_export_dtype(columns.get(column), dtype)
+            # 같은 채널의 조각들은 열 구성이 같음
+            break
+    order = [c for c in ('Cycle',) if c in columns] + [c for c in columns if c != 'Cycle']
+    return {column: columns[column] for column in order}
+
+
+def _arrow_type(dtype):
+    """pandas dtype → Arrow 타입 (숫자/bool 외에는 문자열)"""
+    import pyarrow as pa
+    
+    if (not isinstance(dtype, pd.CategoricalDtype)
+            and (pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype))):
+        return pa.from_numpy_dtype(np.dtype(dtype))
+    return pa.string()
+
+
+def _export_schema(columns, metadata):
+    """메타데이터 열(dictionary 인코딩) + 데이터 열 Arrow schema"""
+    import pyarrow as pa
+    
+    fields = [pa.field(name, pa.dictionary(pa.int32(), pa.string()))
+              for name in EXPORT_META_COLUMNS if name != 'capacity_mAh_meta']
+    fields.append(pa.field('capacity_mAh_meta', pa.dictionary(pa.int32(), pa.float64())))
+    fields += [pa.field(name, _arrow_type(dtype)) for name, dtype in columns.items()]
+    return pa.schema(fields, metadata={_EXPORT_METADATA_KEY: json.dumps(metadata, default=_json_default)})
+
+
+def _arrow_chunk(chunk, meta, schema):
+    """DataFrame 청크 → schema에 맞춘 Arrow Table (메타데이터는 값 하나짜리 dictionary)"""
+    import pyarrow as pa
+    
+    n_rows = len(chunk)
+    codes = pa.array(np.zeros(n_rows, dtype=np.int32))
+    arrays = []
+    for field in schema:
+        if field.name in EXPORT_META_COLUMNS:
+            value = meta[field.name]
+            dictionary = pa.array([value], type=field.type.value_type)
+            arrays.append(pa.DictionaryArray.from_arrays(codes, dictionary))
+        elif field.name in chunk.columns:
+            array = pa.array(chunk[field.name], from_pandas=True)
+            arrays.append(array if array.type == field.type else array.cast(field.type))
+        else:
+            arrays.append(pa.nulls(n_rows, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _csv_chunk(chunk, meta, columns):
+    """DataFrame 청크 → 메타데이터 categorical 열을 앞에 둔 CSV용 DataFrame"""
+    out = pd.DataFrame({name: _categorical_column(meta[name], len(chunk))
+                        for name in EXPORT_META_COLUMNS}, index=chunk.index)
+    return pd.concat([out, chunk.reindex(columns=list(columns))], axis=1)
+
+
+@_timed_stage('export_stream')
+def export_stream(data, filepath, data_type='profile', format=None, chunk_rows=_EXPORT_CHUNK_ROWS,
+                  columns=None):
+    """
+    채널 데이터를 통합 DataFrame 없이 청크 단위로 파일에 내보내기
+    
+    채널마다(큰 프레임은 chunk_rows 행마다) 변환하여 바로 기록하므로 최대 메모리
+    사용량은 청크 하나 크기로 제한됩니다. cycle list로 처리된 프로파일(CycleList /
+    DataFrame list)도 그대로 내보냅니다.
+    
+    Parquet은 채널/사이클러/폴더/용량 메타데이터 열을 dictionary 인코딩으로 저장하고
+    (pandas로 읽으면 categorical), 청크마다 row group 하나를 씁니다. 채널별 메타데이터
+    전체는 파일 key-value 메타데이터('battery_data_processor')에도 한 번 기록합니다.
+    CSV는 메타데이터 열을 앞에 두고 청크마다 이어 씁니다.
+    
+    Parameters:
+    -----------
+    data : dict
+        process_and_combine() / process_all_channels()의 출력
+    filepath : str
+        출력 파일 경로
+    data_type : str
+        내보낼 데이터 타입 ('profile', 'cycle', 'cycle_summary', 'cycle_steps')
+    format : str, optional
+        'parquet' 또는 'csv' (None이면 확장자로 판단, 기본 parquet)
+    chunk_rows : int
+        청크 최대 행 수
+    columns : dict, optional
+        {열 이름: dtype} - 지정하면 열 구성을 미리 훑는 단계를 건너뜀
+        (지연 로딩 채널에서 채널을 두 번 읽지 않도록)
+    
+    Returns:
+    --------
+    int : 기록한 행 수
+    """
+    if format is None:
+        format = 'csv' if filepath.lower().endswith(('.csv', '.csv.gz')) else 'parquet'
+    if format not in ('parquet', 'csv'):
+        raise ValueError(f"지원하지 않는 형식: {format}")
+    
+    channels = data['channels']
+    if columns is None:
+        columns = _export_columns(channels, data_type)
+    
+    _log(f"📤 스트리밍 내보내기 ({data_type}, {format}): {filepath}")
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    total_rows = 0
+    writer = None
+    header = True
+    try:
+        if format == 'parquet':
+            _require_pyarrow()
+            import pyarrow.parquet as pq
+            
+            metadata = {'data_type': data_type, 'channels': {}}
+            for channel_key, channel_data in channels.items():
+                meta = _channel_meta_values(channel_key, channel_data)
+                meta.pop('channel')
+                metadata['channels'][channel_key] = meta
+            schema = _export_schema(columns, metadata)
+            writer = pq.ParquetWriter(filepath, schema)
+        elif os.path.exists(filepath):
+            os.remove(filepath)
+        
+        for channel_key, channel_data in channels.items():
+            meta = _channel_meta_values(channel_key, channel_data)
+            channel_start = time.perf_counter()
+            channel_rows = 0
+            for chunk in _export_chunks(channel_data.get(data_type), chunk_rows):
+                if format == 'parquet':
+                    writer.write_table(_arrow_chunk(chunk, meta, schema), row_group_size=len(chunk))
+                else:
+                    _csv_chunk(chunk, meta, columns).to_csv(filepath, mode='a', header=header, index=False)
+                    header = False
+                channel_rows += len(chunk)
+            total_rows += channel_rows
+            _record_channel('export_channel', channel_key, time.perf_counter() - channel_start,
+                            rows=channel_rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    
+    if format == 'csv' and header:
+        # 내보낼 행이 없어도 헤더는 기록
+        pd.DataFrame(columns=list(EXPORT_META_COLUMNS) + list(columns)).to_csv(filepath, index=False)
+    
+    _log(f"✅ 내보내기 완료: {total_rows:,}행 ({os.path.getsize(filepath) / 1024**2:.1f} MB)")
+    return total_rows
+
+
+# ============================================================================
+# 데이터 저장/로드
+# ============================================================================
+
+def _generate_filename_from_metadata(data):
+    """metadata에서 자동으로 파일명 생성"""
+    metadata = data['metadata']
+    
+    cycler_types = sorted(metadata['cycler_types'].keys())
+    cycler_str = '_'.join(cycler_types)
+    
+    if metadata['paths']:
+        first_path = metadata['paths'][0]
+        folder_name = os.path.basename(first_path.rstrip('/\\'))
+    else:
+        folder_name = 'unknown'
     
     filename = f"{cycler_str}_{folder_name}"
     
-    return filename
+    return filename
+
+
+def save_data(data, filepath=None, format='pickle'):
+    """
+    통합 데이터 저장
+    
+    Parameters:
+    -----------
+    data : dict
+        process_and_combine()의 출력
+    filepath : str, optional
+        저장 경로 (None이면 metadata로 자동 생성)
+    format : str
+        'pickle' (단일 파일) 또는 'columnar' (폴더/채널/데이터 타입별 Parquet 디렉토리)
+    """
+    if format == 'columnar':
+        return save_columnar(data, filepath)
+    if format != 'pickle':
+        raise ValueError(f"지원하지 않는 저장 형식입니다: {format}")
+    
+    if filepath is None:
+        filename = _generate_filename_from_metadata(data)
+        filepath = f"{filename}.pkl"
+    
+    _log(f"💾 데이터 저장 중: {filepath}")
+    
+    with open(filepath, 'wb') as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    file_size = os.path.getsize(filepath) / (1024 * 1024)
+    _log(f"✅ 저장 완료! 파일: {filepath} ({file_size:.2f} MB)")
+    
+    return filepath
+
+
+def load_data(filepath, **kwargs):
+    """
+    저장된 데이터 로드
+    
+    filepath가 save_columnar()로 만든 디렉토리면 load_columnar()로 읽으며,
+    kwargs (channels, data_types, columns, cycles)가 그대로 전달됩니다.
+    """
+    if os.path.isdir(filepath):
+        return load_columnar(filepath, **kwargs)
+    
+    _log(f"📂 데이터 로드 중: {filepath}")
+    
+    with open(filepath, 'rb') as f:
+        data = pickle.load(f)
+    
+    channels_count = len(data['channels'])
+    _log(f"✅ 로드 완료! 채널 수: {channels_count}")
+    
+    return data
+
+
+# ============================================================================
+# 컬럼형 저장소 (Parquet)
+# ============================================================================
+
+COLUMNAR_DATA_TYPES = ('cycle', 'cycle_summary', 'cycle_steps', 'profile')
+
+# 채널 항목의 분석 결과 캐시 (pickle 저장에는 포함, 컬럼형 저장소에서는 제외하고 다시 계산)
+CHANNEL_CACHE_FIELDS = ('dqdv',)
+
+_COLUMNAR_METADATA_FILE = 'metadata.json'
+
+# Parquet row group 크기 (Cycle 범위 필터 시 row group 통계로 건너뛰는 단위)
+_COLUMNAR_ROW_GROUP_SIZE = 100_000
+
+# 원본 DataFrame index를 저장하는 열 (필터 읽기에서도 index가 유지되도록 일반 열로 저장)
+_COLUMNAR_INDEX_COLUMN = '_row'
+
+
+def _require_pyarrow():
+    """pyarrow CSV 백엔드 / 컬럼형 저장소에 필요한 pyarrow 확인 (선택 의존성 'columnar')"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("pyarrow CSV 백엔드와 컬럼형 저장소(Parquet)에는 pyarrow가 필요합니다: "
+                          "pip install 'dataprocess-2601[columnar]'") from e
+
+
+def _json_default(value):
+    """numpy 스칼라 등 JSON 기본 타입이 아닌 값 변환"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"JSON으로 변환할 수 없는 값: {value!r}")
+
+
+def _columnar_partition(root, channel_data):
+    """채널의 파티션 디렉토리 (root/folder_name/channel_name)"""
+    return os.path.join(root, channel_data['folder_name'], channel_data['channel_name'])
+
+
+def save_columnar(data, root=None, pyramid=False):
+    """
+    통합 데이터를 컬럼형 디렉토리로 저장
+    
+    구조:
+        root/metadata.json
+        root/<folder_name>/<channel_name>/{cycle,cycle_summary,cycle_steps,profile}.parquet
+        root/<folder_name>/<channel_name>/profile_pyramid.parquet (pyramid=True)
+    
+    cycle list로 처리된 프로파일은 하나의 프레임으로 이어 붙여 저장하고,
+    카테고리(cycle_list)와 manifest는 metadata.json에 기록합니다.
+    pyramid=True면 플롯용 다운샘플 피라미드(build_profile_pyramid)도 함께
+    저장하며, load_profile_pyramid()로 읽습니다.
+    
+    Returns:
+    --------
+    str : 저장 디렉토리 경로
+    """
+    _require_pyarrow()
+    
+    if root is None:
+        root = _generate_filename_from_metadata(data)
+    
+    _log(f"💾 컬럼형 데이터 저장 중: {root}")
+    os.makedirs(root, exist_ok=True)
+    
+    channels_meta = {}
+    total_bytes = 0
+    
+    for channel_key, channel_data in data['channels'].items():
+        partition = _columnar_partition(root, channel_data)
+        os.makedirs(partition, exist_ok=True)
+        
+        meta = {k: channel_data[k] for k in channel_data
+                if k not in COLUMNAR_DATA_TYPES and k not in CHANNEL_CACHE_FIELDS}
+        meta['partition'] = os.path.relpath(partition, root)
+        meta['data_types'] = []
+        meta['profile_format'] = 'frame'
+        
+        for data_type in COLUMNAR_DATA_TYPES:
+            df = channel_data.get(data_type)
+            if isinstance(df, list):
+                meta['profile_format'] = 'cycle_list'
+                if isinstance(df, CycleList):
+                    df = df.frame
+                else:
+                    df = pd.concat(df) if df else None
+            if df is None:
+                continue
+            
+            file_path = os.path.join(partition, f"{data_type}.parquet")
+            df = df.rename_axis(_COLUMNAR_INDEX_COLUMN).reset_index()
+            df.to_parquet(file_path, engine='pyarrow', index=False,
+                          row_group_size=_COLUMNAR_ROW_GROUP_SIZE)
+            total_bytes += os.path.getsize(file_path)
+            meta['data_types'].append(data_type)
+            
+            if pyramid and data_type == 'profile':
+                total_bytes += _save_profile_pyramid(partition, df, meta)
+        
+        channels_meta[channel_key] = meta
+    
+    with open(os.path.join(root, _COLUMNAR_METADATA_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'metadata': data['metadata'], 'channels': channels_meta}, f,
+                  ensure_ascii=False, indent=1, default=_json_default)
+    
+    _log(f"✅ 저장 완료! 디렉토리: {root} ({total_bytes / (1024 * 1024):.2f} MB, "
+          f"채널 {len(channels_meta)}개)")
+    
+    return root
+
+
+def _read_columnar_metadata(root):
+    """컬럼형 저장소의 metadata.json 읽기"""
+    with open(os.path.join(root, _COLUMNAR_METADATA_FILE), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_channel_frame(root, channel_key, data_type='cycle_summary', columns=None, cycles=None,
+                       _meta=None):
+    """
+    컬럼형 저장소에서 채널 하나의 데이터 타입 하나만 읽기
+    
+    Parameters:
+    -----------
+    root : str
+        save_columnar()로 저장한 디렉토리
+    channel_key : str
+        채널 키 (예: 'A1_MP1_4500mAh_T23_1_M01Ch001[001]')
+    data_type : str
+        'cycle', 'cycle_summary', 'cycle_steps', 'profile' 중 하나
+    columns : list of str, optional
+        읽을 열 (None이면 전체). 지정한 열의 바이트만 읽습니다.
+    cycles : tuple, optional
+        (시작, 끝) Cycle 범위 (양 끝 포함). Parquet row group 통계로
+        범위 밖의 row group은 읽지 않습니다.
+    
+    Returns:
+    --------
+    pd.DataFrame 또는 None (해당 데이터가 없으면)
+    """
+    _require_pyarrow()
+    
+    if data_type not in COLUMNAR_DATA_TYPES:
+        raise ValueError(f"지원하지 않는 데이터 타입입니다: {data_type}")
+    
+    meta = _meta if _meta is not None else _read_columnar_metadata(root)['channels']
+    if channel_key not in meta:
+        raise ValueError(f"채널 {channel_key}가 저장소에 없습니다.")
+    if data_type not in meta[channel_key]['data_types']:
+        return None
+    
+    file_path = os.path.join(root, meta[channel_key]['partition'], f"{data_type}.parquet")
+    filters = None
+    if cycles is not None:
+        start, stop = cycles
+        filters = [('Cycle', '>=', start), ('Cycle', '<=', stop)]
+    
+    if columns is not None:
+        columns = [_COLUMNAR_INDEX_COLUMN] + [c for c in columns if c != _COLUMNAR_INDEX_COLUMN]
+    
+    df = pd.read_parquet(file_path, engine='pyarrow', columns=columns, filters=filters)
+    df = df.set_index(_COLUMNAR_INDEX_COLUMN)
+    df.index.name = None
+    return df
+
+
+def load_columnar(root, channels=None, data_types=COLUMNAR_DATA_TYPES, columns=None, cycles=None):
+    """
+    컬럼형 저장소에서 데이터 로드 (process_and_combine() 출력과 같은 구조)
+    
+    Parameters:
+    -----------
+    root : str
+        save_columnar()로 저장한 디렉토리
+    channels : list of str, optional
+        읽을 채널 키 (None이면 전체)
+    data_types : tuple of str
+        읽을 데이터 타입. 제외한 타입은 None으로 채워집니다.
+    columns : list of str, optional
+        데이터 타입별로 읽을 열 (각 파일에 존재하는 열만 적용)
+    cycles : tuple, optional
+        (시작, 끝) Cycle 범위 (양 끝 포함)
+    
+    Returns:
+    --------
+    dict : {'metadata': ..., 'channels': ...}
+        열/사이클 필터 없이 전체 프로파일을 읽은 경우에만 cycle list로 복원하고
+        저장된 카테고리(cycle_list)를 붙입니다.
+    """
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+    
+    _log(f"📂 컬럼형 데이터 로드 중: {root}")
+    
+    stored = _read_columnar_metadata(root)
+    channels_meta = stored['channels']
+    keys = list(channels_meta.keys()) if channels is None else list(channels)
+    full_read = columns is None and cycles is None
+    
+    loaded_data = {}
+    for channel_key in keys:
+        meta = channels_meta[channel_key]
+        channel_data = {k: v for k, v in meta.items()
+                        if k not in ('partition', 'data_types', 'profile_format')}
+        if meta['cycler_type'] == 'Toyo':
+            channel_data.update({'cycle': None, 'profile': None})
+        else:
+            channel_data.update({data_type: None for data_type in COLUMNAR_DATA_TYPES})
+        
+        for data_type in data_types:
+            if data_type not in meta['data_types']:
+                continue
+            
+            read_columns = None
+            if columns is not None:
+                file_path = os.path.join(root, meta['partition'], f"{data_type}.parquet")
+                schema_names = set(pq.read_schema(file_path).names)
+                read_columns = [c for c in columns if c in schema_names]
+            
+            df = read_channel_frame(root, channel_key, data_type, read_columns, cycles,
+                                    _meta=channels_meta)
+            if data_type == 'profile' and meta['profile_format'] == 'cycle_list' and full_read:
+                df = CycleList.from_frame(df)
+            channel_data[data_type] = df
+        
+        if not (full_read and isinstance(channel_data.get('profile'), list)):
+            channel_data.pop('cycle_list', None)
+        
+        loaded_data[channel_key] = channel_data
+    
+    _log(f"✅ 로드 완료! 채널 수: {len(loaded_data)}")
+    
+    return {'metadata': stored['metadata'], 'channels': loaded_data}
+
+
+# ============================================================================
+# 프로파일 피라미드 (플롯용 다중 해상도)
+# ============================================================================
+
+# 피라미드에 보존할 기본 열 (x축은 별도 지정)
+PYRAMID_COLUMNS = ('Voltage_V', 'Current_mA')
+_PYRAMID_FILE = 'profile_pyramid.parquet'
+_PYRAMID_ROW_COLUMN = '_row'
+
+
+def _m4_positions(columns, starts):
+    """
+    bucket마다 처음/마지막 점과 각 열의 최소/최대 점 위치 (M4 decimation)
+    
+    선 그래프에서 bucket 하나가 픽셀 하나 이하로 그려지면 이 네 점만으로
+    원본과 같은 모양이 나옵니다. NaN은 최소/최대 계산에서 무시합니다.
+    
+    Parameters:
+    -----------
+    columns : list of np.ndarray
+        같은 길이의 float64 배열
+    starts : np.ndarray
+        bucket 시작 위치 (오름차순, 첫 값 0)
+    
+    Returns:
+    --------
+    np.ndarray : 남길 위치 (정렬, 중복 없음)
+    """
+    n = len(columns[0]) if columns else int(starts[-1]) + 1
+    lengths = np.diff(np.append(starts, n))
+    keep = np.zeros(n, dtype=bool)
+    keep[starts] = True
+    keep[starts + lengths - 1] = True
+    
+    for values in columns:
+        for reduce in (np.fmin, np.fmax):
+            extreme = np.repeat(reduce.reduceat(values, starts), lengths)
+            positions = np.flatnonzero(values == extreme)
+            # bucket마다 첫 번째 최소/최대 점 (positions는 정렬되어 있음)
+            buckets = np.searchsorted(starts, positions, side='right') - 1
+            first = np.r_[True, buckets[1:] != buckets[:-1]] if len(buckets) else buckets.astype(bool)
+            keep[positions[first]] = True
+    
+    return np.flatnonzero(keep)
+
+
+class ProfilePyramid:
+    """
+    채널 프로파일의 다중 해상도 다운샘플
+    
+    level k(1부터)는 원본 bucket_rows[k-1]행마다 M4 decimation한 행만
+    가집니다 (원본 행 위치 '_row' 포함). level 0은 원본이며, get()에서
+    요청한 구간과 픽셀 폭에 원본이 필요할 때만 읽습니다.
+    
+    Attributes:
+    -----------
+    x : str
+        x축 열 (기본 'time_hour', 오름차순이어야 함)
+    columns : list of str
+        보존한 y 열
+    bucket_rows : list of int
+        level별 bucket 크기 (원본 행 수)
+    levels : list of pd.DataFrame
+        level 1..N 프레임 (_row, x, columns, Cycle)
+    n_rows : int
+        원본 행 수
+    """
+    
+    def __init__(self, x, columns, bucket_rows, levels, n_rows, raw=None):
+        self.x = x
+        self.columns = list(columns)
+        self.bucket_rows = list(bucket_rows)
+        self.levels = levels
+        self.n_rows = n_rows
+        # 원본: DataFrame 또는 callable(cycles) -> DataFrame
+        # (cycles는 (첫 Cycle, 마지막 Cycle) 범위, 범위를 정할 수 없으면 None = 전체)
+        self._raw = raw
+    
+    def __repr__(self):
+        sizes = ', '.join(f"{len(level):,}" for level in self.levels)
+        return f"ProfilePyramid(x={self.x!r}, rows={self.n_rows:,}, levels=[{sizes}])"
+    
+    def _window(self, frame, start, end):
+        """frame에서 x가 [start, end]인 행 범위 (iloc 시작, 끝)"""
+        x = frame[self.x].to_numpy()
+        lo = 0 if start is None else int(np.searchsorted(x, start, side='left'))
+        hi = len(x) if end is None else int(np.searchsorted(x, end, side='right'))
+        return lo, hi
+    
+    def level_for(self, start=None, end=None, width=1000):
+        """
+        구간 [start, end]를 width 픽셀로 그릴 때 사용할 level
+        
+        bucket 하나가 한 픽셀 이하가 되는 가장 거친 level을 고르며,
+        그런 level이 없으면 0 (원본)입니다.
+        """
+        if not self.levels:
+            return 0
+        finest = self.levels[0]
+        lo, hi = self._window(finest, start, end)
+        if hi <= lo:
+            return 1
+        rows = finest[_PYRAMID_ROW_COLUMN].to_numpy()
+        # 구간 양 끝 bucket까지 포함한 원본 행 수
+        span = rows[min(hi, len(rows) - 1)] - rows[max(lo - 1, 0)] + 1
+        rows_per_pixel = span / max(int(width), 1)
+        
+        level = 0
+        for k, bucket in enumerate(self.bucket_rows, 1):
+            if bucket <= rows_per_pixel:
+                level = k
+        return level
+    
+    def get(self, start=None, end=None, width=1000, level=None):
+        """
+        구간 [start, end] (x축 단위)를 width 픽셀로 그리기 위한 행
+        
+        Parameters:
+        -----------
+        start, end : float, optional
+            x축 구간 (None이면 처음/끝까지)
+        width : int
+            그래프 픽셀 폭
+        level : int, optional
+            직접 지정할 level (None이면 level_for()로 선택)
+        
+        Returns:
+        --------
+        pd.DataFrame : x, columns (attrs['level']에 사용한 level)
+        """
+        if level is None:
+            level = self.level_for(start, end, width)
+        
+        if level == 0:
+            df = self._raw_window(start, end)
+        else:
+            frame = self.levels[level - 1]
+            lo, hi = self._window(frame, start, end)
+            df = frame.iloc[lo:hi]
+        
+        df = df[[self.x] + [c for c in self.columns if c in df.columns]]
+        df.attrs['level'] = level
+        return df
+    
+    def _raw_window(self, start, end):
+        """원본에서 구간 읽기 (저장소 원본은 구간의 사이클 범위만 읽음)"""
+        if self._raw is None:
+            raise ValueError("원본 프로파일이 없어 level 0을 읽을 수 없습니다.")
+        
+        if callable(self._raw):
+            cycles = None
+            if self.levels and 'Cycle' in self.levels[0].columns:
+                finest = self.levels[0]
+                lo, hi = self._window(finest, start, end)
+                # 구간 경계 바깥 한 점씩 포함 (경계 bucket의 사이클)
+                window = finest['Cycle'].iloc[max(lo - 1, 0):min(hi + 1, len(finest))]
+                if len(window):
+                    cycles = (int(window.min()), int(window.max()))
+            frame = self._raw(cycles)
+        else:
+            frame = self._raw
+        
+        lo, hi = self._window(frame, start, end)
+        return frame.iloc[lo:hi]
+
+
+def build_profile_pyramid(profile, x='time_hour', columns=PYRAMID_COLUMNS, base_bucket=16,
+                          factor=4, min_points=2000):
+    """
+    프로파일 DataFrame (또는 CycleList)로 ProfilePyramid 생성
+    
+    level 1은 base_bucket행, 이후 level은 factor배씩 bucket을 키우며
+    level 행 수가 min_points 이하가 될 때까지 만듭니다. 각 level은 바로
+    아래 level의 행만으로 계산합니다 (M4 점은 상위 bucket에서도 보존됨).
+    
+    Parameters:
+    -----------
+    profile : pd.DataFrame or CycleList
+        채널 프로파일 (x 열 오름차순)
+    x : str
+        x축 열
+    columns : tuple of str
+        모양을 보존할 y 열 (없는 열은 건너뜀)
+    base_bucket, factor, min_points : int
+        level 구성
+    
+    Returns:
+    --------
+    ProfilePyramid : raw는 입력 프레임
+    """
+    frame = profile.frame if isinstance(profile, CycleList) else profile
+    columns = [c for c in columns if c in frame.columns]
+    extra = ['Cycle'] if 'Cycle' in frame.columns else []
+    n_rows = len(frame)
+    
+    values = [frame[c].to_numpy(dtype=np.float64) for c in columns]
+    levels, bucket_rows = [], []
+    positions = None
+    bucket = base_bucket
+    
+    while n_rows > min_points and bucket < n_rows:
+        if positions is None:
+            keep = _m4_positions(values, np.arange(0, n_rows, bucket))
+            positions = keep
+        else:
+            ids = positions // bucket
+            starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+            keep = _m4_positions([v[positions] for v in values], starts)
+            positions = positions[keep]
+        
+        bucket_rows.append(bucket)
+        levels.append(positions)
+        if len(positions) <= min_points:
+            break
+        bucket *= factor
+    
+    level_frames = []
+    for positions in levels:
+        level = frame[[x] + columns + extra].iloc[positions].reset_index(drop=True)
+        level.insert(0, _PYRAMID_ROW_COLUMN, positions)
+        level_frames.append(level)
+    
+    return ProfilePyramid(x, columns, bucket_rows, level_frames, n_rows, raw=frame)
+
+
+def _save_profile_pyramid(partition, profile_df, meta, **kwargs):
+    """채널 파티션에 피라미드 저장 (level 열로 구분), 저장한 bytes 반환"""
+    x = kwargs.pop('x', 'time_hour')
+    if x not in profile_df.columns:
+        return 0
+    pyramid = build_profile_pyramid(profile_df, x=x, **kwargs)
+    if not pyramid.levels:
+        return 0
+    
+    frames = [level.assign(level=k) for k, level in enumerate(pyramid.levels, 1)]
+    file_path = os.path.join(partition, _PYRAMID_FILE)
+    pd.concat(frames, ignore_index=True).to_parquet(file_path, engine='pyarrow', index=False)
+    meta['pyramid'] = {'x': pyramid.x, 'columns': pyramid.columns,
+                       'bucket_rows': pyramid.bucket_rows, 'n_rows': pyramid.n_rows}
+    return os.path.getsize(file_path)
+
+
+def load_profile_pyramid(root, channel_key):
+    """
+    save_columnar(pyramid=True)로 저장한 채널 피라미드 읽기
+    
+    level 파일만 읽으며, 원본(level 0)은 get()에서 필요할 때 구간의
+    사이클 범위만 profile.parquet에서 읽습니다.
+    
+    Returns:
+    --------
+    ProfilePyramid or None : 피라미드가 없으면 None
+    """
+    _require_pyarrow()
+    meta = _read_columnar_metadata(root)['channels']
+    if channel_key not in meta:
+        raise ValueError(f"채널 {channel_key}가 저장소에 없습니다.")
+    info = meta[channel_key].get('pyramid')
+    if info is None:
+        return None
+    
+    df = pd.read_parquet(os.path.join(root, meta[channel_key]['partition'], _PYRAMID_FILE),
+                         engine='pyarrow')
+    levels = [df[df['level'] == k].drop(columns='level').reset_index(drop=True)
+              for k in range(1, len(info['bucket_rows']) + 1)]
+    
+    columns = [info['x']] + info['columns']
+    
+    def read_raw(cycles):
+        return read_channel_frame(root, channel_key, 'profile', columns=columns + ['Cycle'],
+                                  cycles=cycles, _meta=meta)
+    
+    return ProfilePyramid(info['x'], info['columns'], info['bucket_rows'], levels,
+                          info['n_rows'], raw=read_raw)
+
+
+# ============================================================================
+# 대용량 프로파일 스트리밍 (out-of-core)
+# ============================================================================
+
+# 스트리밍 파싱 단위 (bytes, 줄 경계로 자름)
+_STREAM_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def _line_fields(line):
+    """CSV 한 줄의 필드 수 (숫자 전용 PNE 파일: 따옴표 없음)"""
+    return line.count(b',') + 1
+
+
+def _iter_line_blocks(file_path, chunk_bytes):
+    """
+    파일을 약 chunk_bytes 크기의 줄 단위 블록으로 순회
+    
+    pandas 파서는 파일 첫 줄의 필드 수로 잘못된 행을 판단하므로, 블록이 잘못된 행이나
+    빈 줄로 시작하지 않도록 그런 줄은 앞 블록 끝에 붙입니다. 이렇게 하면 블록별
+    파싱 결과를 이어 붙인 것이 파일 전체를 한 번에 파싱한 결과와 같습니다.
+    """
+    expected = None
+    held = b''
+    pending = b''
+    with open(file_path, 'rb') as f:
+        while True:
+            data = f.read(chunk_bytes)
+            if not data:
+                break
+            buffer = pending + data
+            cut = buffer.rfind(b'\n') + 1
+            if cut == 0:
+                pending = buffer
+                continue
+            block, pending = buffer[:cut], buffer[cut:]
+            
+            if expected is None:
+                first = next((line for line in block.split(b'\n', 64) if line.strip()), None)
+                expected = _line_fields(first) if first is not None else None
+            
+            position = 0
+            if held:
+                # 블록 앞의 빈 줄/잘못된 행은 앞 블록으로
+                while position < len(block):
+                    end = block.find(b'\n', position) + 1
+                    line = block[position:end].rstrip(b'\r\n')
+                    if line.strip() and _line_fields(line) == expected:
+                        break
+                    position = end
+                held += block[:position]
+                if position < len(block):
+                    yield held
+                    held = b''
+            held += block[position:]
+    
+    held += pending
+    if held:
+        yield held
+
+
+def _iter_pne_raw_blocks(channel_path, chunk_bytes):
+    """
+    PNE SaveData*.csv를 순서대로 블록 단위 원시 DataFrame으로 순회
+    
+    index는 load_pne_profile_data()와 같은 전체 원시 행 번호입니다.
+    """
+    restore_path = os.path.join(channel_path, "Restore")
+    if not os.path.isdir(restore_path):
+        return
+    _, profile_files = _pne_restore_files(restore_path)
+    
+    row = 0
+    for name in profile_files:
+        file_path = os.path.join(restore_path, name)
+        try:
+            for block in _iter_line_blocks(file_path, chunk_bytes):
+                try:
+                    df = read_cycler_csv(block, 'pne_profile')
+                except pd.errors.EmptyDataError:
+                    continue
+                df.index = pd.RangeIndex(row, row + len(df))
+                row += len(df)
+                yield df
+        except OSError as e:
+            _log(f"  ⚠️  프로파일 파일 읽기 실패 - 건너뜀: {name} ({e})")
+
+
+def _cycle_list_in_order(frame):
+    """Cycle 값이 바뀌는 위치로 분할한 CycleList (정렬하지 않음 - 파일 순서 유지)"""
+    values = frame['Cycle'].to_numpy()
+    starts = np.flatnonzero(values[1:] != values[:-1]) + 1
+    offsets = np.concatenate(([0], starts, [len(values)]))
+    return CycleList(frame, offsets, values[offsets[:-1]])
+
+
+def iter_pne_profile_chunks(channel_path, chunk_bytes=_STREAM_CHUNK_BYTES, mincapa=None,
+                            compact=False, rules=None, categorize=False):
+    """
+    PNE 프로파일을 청크 단위로 읽어 완결된 사이클 묶음을 순서대로 반환 (generator)
+    
+    SaveData*.csv를 한 번에 모두 읽지 않고 chunk_bytes씩 파싱하여 단위 변환과
+    Condition 8 제거를 적용합니다. 청크 경계에 걸친 마지막 사이클은 다음 청크와
+    이어 붙인 뒤 완결되면 반환하므로, 메모리 사용량은 테스트 기간과 관계없이
+    청크 하나와 사이클 하나 정도로 유지됩니다.
+    
+    반환되는 프레임은 load_pne_profile_data() + process_all_channels() 결과의
+    해당 사이클 행과 같습니다 (time_cyc, Capa_cyc, Crate 포함, index는 원시 행 번호).
+    단, 열 수가 모자란 행이 있는 청크는 그 청크에서만 정수 열이 float가 됩니다.
+    
+    Parameters:
+    -----------
+    channel_path : str
+        PNE 채널 폴더 경로
+    chunk_bytes : int
+        한 번에 파싱할 원시 파일 크기
+    mincapa : float, optional
+        C-rate 기준 용량 (None이면 process_all_channels()와 같은 방식으로 결정)
+    compact : bool
+        True면 반환 프레임에 compact_frame() 적용
+    categorize : bool
+        True면 사이클별 분류 라벨을 'category' 열로 추가 (rules는 분류 규칙)
+    
+    Yields:
+    -------
+    pd.DataFrame : 완결된 사이클 1개 이상 (Cycle 순)
+    """
+    if mincapa is None:
+        info = get_directory_info(os.path.dirname(os.path.normpath(channel_path)))
+        mincapa = _channel_mincapa(load_pne_cycle_data(channel_path), info['capacity_mAh'])
+    rules = _normalize_rules(rules) if categorize else None
+    
+    # 아직 끝나지 않은 마지막 사이클의 청크별 조각 (사이클이 끝날 때 한 번만 이어 붙임)
+    carry = []
+    last_cycle = None
+    warned = False
+    # 앞 청크까지 반환한 사이클 수 (분류 특성 cycle_index를 채널 전체 위치로 맞춤)
+    cycles_done = 0
+    
+    def finish(pieces):
+        nonlocal cycles_done
+        frame = pieces[0].copy() if len(pieces) == 1 else pd.concat(pieces)
+        cycle_list = _cycle_list_in_order(frame)
+        add_cycle_columns(cycle_list.frame, cycle_list.offsets, mincapa)
+        if categorize:
+            features = compute_cycle_features(cycle_list)
+            features['cycle_index'] += cycles_done
+            _apply_category_labels(cycle_list, classify_cycle_features(features, rules))
+        cycles_done += len(cycle_list)
+        return compact_frame(cycle_list.frame) if compact else cycle_list.frame
+    
+    for raw in _iter_pne_raw_blocks(channel_path, chunk_bytes):
+        df = _transform_pne_profile(raw)
+        df = df[df['Cycle'].notna()]
+        if df.empty:
+            continue
+        
+        cycles = df['Cycle'].to_numpy()
+        if not warned and ((last_cycle is not None and cycles[0] < last_cycle)
+                           or (np.diff(cycles) < 0).any()):
+            # 전체 로딩(CycleList.from_frame)은 Cycle로 정렬하지만 스트리밍은 파일 순서 유지
+            _log("  ⚠️  Cycle 번호가 감소하는 구간이 있습니다 - 파일 순서대로 별도 사이클로 처리합니다")
+            warned = True
+        
+        # 사이클이 바뀌는 위치 (보류 중인 사이클과 이 청크 첫 행 사이 포함)
+        boundary = np.flatnonzero(cycles[1:] != cycles[:-1]) + 1
+        if carry and cycles[0] != last_cycle:
+            boundary = np.r_[0, boundary]
+        last_cycle = cycles[-1]
+        if len(boundary) == 0:
+            # 마지막 사이클은 다음 청크에서 이어질 수 있으므로 보류
+            carry.append(df)
+            continue
+        
+        cut = boundary[-1]
+        pieces = carry + ([df.iloc[:cut]] if cut else [])
+        carry = [df.iloc[cut:]]
+        yield finish(pieces)
+    
+    if carry:
+        yield finish(carry)
+
+
+def iter_pne_profile_cycles(channel_path, chunk_bytes=_STREAM_CHUNK_BYTES, mincapa=None,
+                            compact=False, rules=None, categorize=False):
+    """
+    iter_pne_profile_chunks()를 사이클 단위로 나누어 반환 (generator)
+    
+    Yields:
+    -------
+    tuple : (Cycle 번호, 사이클 DataFrame)
+    """
+    for frame in iter_pne_profile_chunks(channel_path, chunk_bytes, mincapa, compact,
+                                         rules, categorize):
+        cycle_list = _cycle_list_in_order(frame)
+        for cycle, view in zip(cycle_list.cycle_numbers, cycle_list):
+            yield cycle, view.frame
+
+
+def save_pne_channel_stream(channel_path, root, chunk_bytes=_STREAM_CHUNK_BYTES, rules=None,
+                            categorize=True):
+    """
+    PNE 채널 하나를 메모리에 모두 올리지 않고 컬럼형 저장소로 바로 저장
+    
+    사이클 데이터(SaveEndData)는 그대로 저장하고, 프로파일은 iter_pne_profile_chunks()의
+    완결된 사이클 묶음을 Parquet row group으로 이어 씁니다. root/metadata.json에
+    채널 항목을 추가(또는 교체)하므로 load_columnar() / read_channel_frame() /
+    load_columnar_lazy()로 그대로 읽을 수 있습니다 (프로파일은 cycle list로 복원).
+    
+    Parameters:
+    -----------
+    channel_path : str
+        PNE 채널 폴더 경로 (상위 폴더명에서 용량 등 메타데이터 추출)
+    root : str
+        컬럼형 저장소 디렉토리
+    categorize : bool
+        True면 사이클 분류 결과를 'category' 열과 메타데이터(cycle_list)로 저장
+    
+    Returns:
+    --------
+    str : 저장한 채널 키
+    """
+    _require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    channel_path = os.path.normpath(channel_path)
+    folder_path = os.path.dirname(channel_path)
+    info = get_directory_info(folder_path)
+    key, channel_data = _new_channel_entry('PNE', info, os.path.basename(channel_path))
+    
+    partition = _columnar_partition(root, channel_data)
+    os.makedirs(partition, exist_ok=True)
+    _log(f"💾 스트리밍 저장 중: {key}")
+    
+    cycle_df = load_pne_cycle_data(channel_path)
+    meta = {k: v for k, v in channel_data.items() if k not in COLUMNAR_DATA_TYPES}
+    meta.update({'partition': os.path.relpath(partition, root), 'data_types': [],
+                 'profile_format': 'cycle_list'})
+    
+    if cycle_df is not None and not cycle_df.empty:
+        for data_type, df in _pne_cycle_fields(cycle_df).items():
+            df.rename_axis(_COLUMNAR_INDEX_COLUMN).reset_index().to_parquet(
+                os.path.join(partition, f"{data_type}.parquet"), engine='pyarrow', index=False,
+                row_group_size=_COLUMNAR_ROW_GROUP_SIZE)
+            meta['data_types'].append(data_type)
+    
+    names = _category_names(_normalize_rules(rules))
+    categories = {name: [] for name in names}
+    n_cycles = 0
+    rows = 0
+    writer = None
+    schema = None
+    file_path = os.path.join(partition, 'profile.parquet')
+    start = time.perf_counter()
+    try:
+        for frame in iter_pne_profile_chunks(channel_path, chunk_bytes,
+                                             _channel_mincapa(cycle_df, info['capacity_mAh']),
+                                             rules=rules, categorize=categorize):
+            table_df = frame.rename_axis(_COLUMNAR_INDEX_COLUMN).reset_index()
+            if writer is None:
+                # 원시 정수 열은 다른 청크에서 결측이 생겨도 같은 schema로 쓸 수 있음 (nullable)
+                schema = pa.Schema.from_pandas(table_df, preserve_index=False)
+                writer = pq.ParquetWriter(file_path, schema)
+            writer.write_table(pa.Table.from_pandas(table_df, schema=schema, preserve_index=False),
+                               row_group_size=_COLUMNAR_ROW_GROUP_SIZE)
+            
+            cycle_values = frame['Cycle'].to_numpy()
+            starts = np.concatenate(([0], np.flatnonzero(cycle_values[1:] != cycle_values[:-1]) + 1))
+            if categorize:
+                labels = frame['category'].to_numpy()[starts]
+                for name in names:
+                    categories[name].extend((np.flatnonzero(labels == name) + n_cycles).tolist())
+            n_cycles += len(starts)
+            rows += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    
+    if writer is not None:
+        meta['data_types'].append('profile')
+    if categorize:
+        meta['cycle_list'] = categories
+    _record_channel('stream_channel', key, time.perf_counter() - start, rows=rows)
+    
+    metadata_path = os.path.join(root, _COLUMNAR_METADATA_FILE)
+    if os.path.exists(metadata_path):
+        stored = _read_columnar_metadata(root)
+    else:
+        stored = {'metadata': {'total_channels': 0, 'total_paths': 0, 'cycler_types': {},
+                               'paths': []},
+                  'channels': {}}
+    stored['channels'][key] = meta
+    metadata = stored['metadata']
+    if folder_path not in metadata['paths']:
+        metadata['paths'].append(folder_path)
+    metadata['total_paths'] = len(metadata['paths'])
+    metadata['total_channels'] = len(stored['channels'])
+    cycler_types = {}
+    for channel_meta in stored['channels'].values():
+        cycler_types[channel_meta['cycler_type']] = cycler_types.get(channel_meta['cycler_type'], 0) + 1
+    metadata['cycler_types'] = cycler_types
+    with open(metadata_path, 'w', encoding='utf-8') as f:
+        json.dump(stored, f, ensure_ascii=False, indent=1, default=_json_default)
+    
+    _log(f"  ✅ {n_cycles:,}개 사이클, {rows:,}행 저장")
+    return key
+
+
+# ============================================================================
+# 실시간 추적 (follow 모드)
+# ============================================================================
+
+class _ChannelFollowState:
+    """
+    채널 하나의 추적 상태
+    
+    읽은 위치(PNE는 증분 manifest, Toyo는 capacity.log offset과 마지막 사이클 파일),
+    C-rate 기준 용량, 아직 끝나지 않은 마지막 사이클의 행(carry)만 보관합니다.
+    """
+    
+    def __init__(self, key, cycler_type, channel_path, capacity_mAh):
+        self.key = key
+        self.cycler_type = cycler_type
+        self.channel_path = channel_path
+        self.capacity_mAh = capacity_mAh
+        self.reset()
+    
+    def reset(self):
+        self.manifest = None
+        self.mincapa = None
+        # 아직 끝나지 않은 마지막 사이클의 polling별 조각
+        self.carry = []
+        # Toyo
+        self.log_state = None
+        self.log_header = None
+        self.last_cycle = None
+        self.time_state = None
+        self.profile_rows = 0
+    
+    def poll(self, final=False):
+        """
+        새로 추가된 데이터 읽기 (final=True면 Toyo의 기록 중인 마지막 사이클 파일도 읽음)
+        
+        Returns:
+        --------
+        tuple : (처음부터 다시 읽었는지, 새 cycle_summary 행, 새 프로파일 행) - 없으면 None
+        """
+        if self.cycler_type == 'PNE':
+            return self._poll_pne()
+        return self._poll_toyo(final)
+    
+    def _poll_pne(self):
+        delta = _load_pne_channel_delta(self.channel_path, self.manifest)
+        reset = delta['reset'] and self.manifest is not None
+        if reset:
+            self.reset()
+        self.manifest = delta['manifest']
+        
+        summary = None
+        if delta['cycle'] is not None and len(delta['cycle']):
+            if self.mincapa is None:
+                self.mincapa = _channel_mincapa(delta['cycle'], self.capacity_mAh)
+            summary = _pne_cycle_fields(delta['cycle'])['cycle_summary']
+        return reset, summary, delta['profile']
+    
+    def _poll_toyo(self, final=False):
+        reset = False
+        summary = self._poll_toyo_log()
+        if summary is _FOLLOW_RESET:
+            self.reset()
+            reset = True
+            summary = self._poll_toyo_log()
+        
+        files = _toyo_profile_files(self.channel_path) if os.path.isdir(self.channel_path) else []
+        if self.last_cycle is not None and files and files[-1][0] < self.last_cycle:
+            # 사이클 파일이 사라짐 - 처음부터 다시
+            self.reset()
+            return True, self._poll_toyo_log(), None
+        # 가장 최근 파일은 기록 중일 수 있으므로 새 파일이 생길 때까지 보류
+        ready = [(c, n) for c, n in (files if final else files[:-1])
+                 if self.last_cycle is None or c > self.last_cycle]
+        if not ready:
+            return reset, summary, None
+        
+        frames = [df for i in range(0, len(ready), _TOYO_BATCH_SIZE)
+                  for df in _read_toyo_batch(self.channel_path, ready[i:i + _TOYO_BATCH_SIZE])
+                  if len(df)]
+        self.last_cycle = ready[-1][0]
+        if not frames:
+            return reset, summary, None
+        profile = _concat_preallocated(frames)
+        profile.index = pd.RangeIndex(self.profile_rows, self.profile_rows + len(profile))
+        self.profile_rows += len(profile)
+        profile = _transform_toyo_profile(profile, self.time_state)
+        if 'time_s' in profile.columns and len(profile):
+            self.time_state = (profile['Steptime_s'].iloc[-1], profile['time_s'].iloc[-1])
+        return reset, summary, profile
+    
+    def _poll_toyo_log(self):
+        """capacity.log에 추가된 완결된 행 (파일이 줄어들거나 바뀌면 _FOLLOW_RESET)"""
+        log_path = os.path.join(self.channel_path, 'capacity.log')
+        if not os.path.isfile(log_path):
+            return None
+        state = _file_state(log_path)
+        old = self.log_state
+        if old is not None:
+            if state['size'] < old['size'] or (state['size'] == old['size']
+                                               and state['mtime'] != old['mtime']):
+                return _FOLLOW_RESET
+            if state['size'] == old['size']:
+                return None
+        
+        offset = old['offset'] if old is not None else 0
+        rows = old['rows'] if old is not None else 0
+        with open(log_path, 'rb') as f:
+            f.seek(offset)
+            chunk = f.read(state['size'] - offset)
+        if self.log_header is None:
+            header, newline, chunk = chunk.partition(b'\n')
+            if not newline:
+                # 헤더도 아직 완결되지 않음
+                self.log_state = {**state, 'offset': 0, 'rows': 0}
+                return None
+            self.log_header = header + newline
+            offset += len(self.log_header)
+        
+        end = chunk.rfind(b'\n') + 1
+        self.log_state = {**state, 'offset': offset + end, 'rows': rows}
+        if end == 0:
+            return None
+        try:
+            df = read_cycler_csv(self.log_header + chunk[:end], 'toyo_cycle')
+        except pd.errors.EmptyDataError:
+            return None
+        # 행 번호는 파일 전체를 읽은 것과 같게 이어서
+        df.index = pd.RangeIndex(rows, rows + len(df))
+        self.log_state['rows'] = rows + len(df)
+        df = _transform_toyo_cycle(df)
+        if self.mincapa is None and len(df):
+            self.mincapa = _channel_mincapa(df, self.capacity_mAh)
+        return df
+    
+    def complete_cycles(self, profile, final=False):
+        """
+        carry와 새 프로파일 행을 합쳐 끝난 사이클만 파생 열을 붙여 반환
+        
+        마지막 사이클은 다음 사이클 행이 나타날 때까지 carry로 보류합니다
+        (final=True면 모두 반환). carry는 polling별 조각 목록이며 사이클이 끝날 때
+        한 번만 이어 붙입니다.
+        """
+        pieces = self.carry
+        if profile is not None and len(profile):
+            profile = profile[profile['Cycle'].notna()]
+        if profile is None or not len(profile):
+            if not final or not pieces:
+                return None
+            self.carry = []
+        else:
+            # 사이클이 바뀌는 위치 (보류 중인 사이클과 새 행의 첫 행 사이 포함)
+            cycles = profile['Cycle'].to_numpy()
+            boundary = np.flatnonzero(cycles[1:] != cycles[:-1]) + 1
+            if pieces and cycles[0] != pieces[-1]['Cycle'].iat[-1]:
+                boundary = np.r_[0, boundary]
+            if final:
+                cut = len(profile)
+            elif len(boundary) == 0:
+                self.carry = pieces + [profile]
+                return None
+            else:
+                cut = boundary[-1]
+            pieces = pieces + ([profile.iloc[:cut]] if cut else [])
+            self.carry = [profile.iloc[cut:]] if cut < len(profile) else []
+        
+        frame = pieces[0].copy() if len(pieces) == 1 else pd.concat(pieces)
+        cycle_list = _cycle_list_in_order(frame)
+        add_cycle_columns(cycle_list.frame, cycle_list.offsets,
+                          self.mincapa if self.mincapa is not None else (self.capacity_mAh or 1000))
+        return cycle_list
+
+
+# Toyo capacity.log가 append가 아닌 방식으로 바뀌었음을 나타내는 표식
+_FOLLOW_RESET = object()
+
+
+class LiveFollower:
+    """
+    시험 중인 채널의 새 데이터를 파일 크기 polling으로 추적하여 구독자에게 전달
+    
+    PNE는 Restore/ 폴더(SaveEndData.csv, SaveData*.csv)의 추가된 bytes만,
+    Toyo는 capacity.log의 추가된 행과 새로 끝난 사이클 파일만 파싱합니다.
+    줄바꿈으로 끝나지 않은 마지막 행은 다음 polling에서 읽고, 사이클은 다음 사이클의
+    행이 나타나야 끝난 것으로 보고 전달합니다. 기존 데이터가 바뀌면(파일 축소/교체)
+    채널을 처음부터 다시 읽고 reset=True 이벤트를 보냅니다.
+    
+    polling 사이에는 대기(threading.Event.wait)만 하므로 새 데이터가 없을 때
+    CPU를 거의 쓰지 않으며, 지연 시간은 interval + 파싱 시간 이내입니다.
+    
+    이벤트 (dict):
+        'channel'       : 채널 키
+        'cycler_type'   : 'PNE' 또는 'Toyo'
+        'reset'         : 처음부터 다시 읽은 경우 True (이전에 받은 데이터 폐기)
+        'cycle_summary' : 새 사이클 대표 행 (PNE Condition==8 / Toyo capacity.log) 또는 None
+        'cycles'        : 새로 끝난 프로파일 사이클 CycleList (time_cyc, Capa_cyc, Crate 포함) 또는 None
+        'timestamp'     : 이벤트 생성 시각
+    
+    Example:
+    --------
+    >>> follower = LiveFollower(paths, interval=5)
+    >>> follower.subscribe(lambda event: print(event['channel'], event['cycle_summary']))
+    >>> follower.start()
+    ...
+    >>> follower.stop()
+    """
+    
+    def __init__(self, paths, interval=2.0, compact=False, emit_history=True, rescan_every=30):
+        """
+        Parameters:
+        -----------
+        paths : list of str
+            추적할 경로 리스트 (process_and_combine()과 같은 폴더)
+        interval : float
+            polling 간격 (초)
+        compact : bool
+            True면 전달하는 DataFrame에 compact_frame() 적용
+        emit_history : bool
+            False면 시작 시점까지의 기존 데이터는 전달하지 않고 이후 추가분만 전달
+        rescan_every : int
+            새 채널 폴더를 찾는 주기 (polling 횟수)
+        """
+        self.paths = list(paths)
+        self.interval = interval
+        self.compact = compact
+        self.emit_history = emit_history
+        self.rescan_every = rescan_every
+        self.channels = OrderedDict()
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._polls = 0
+    
+    def subscribe(self, callback):
+        """이벤트마다 callback(event) 호출 (polling 스레드에서 실행), callback 반환"""
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+    
+    def unsubscribe(self, callback):
+        """구독 해제"""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+    
+    def _discover(self):
+        """paths에서 채널 폴더 탐색 (새 채널만 추가)"""
+        for path in self.paths:
+            info = get_directory_info(path)
+            if info['cycler_type'] == 'PNE':
+                folders = find_pne_channel_folders(path)
+            elif info['cycler_type'] == 'Toyo':
+                folders = find_toyo_channel_folders(path)
+            else:
+                continue
+            for channel_path in folders:
+                key, entry = _new_channel_entry(info['cycler_type'], info,
+                                                os.path.basename(channel_path))
+                if key not in self.channels:
+                    self.channels[key] = _ChannelFollowState(key, info['cycler_type'], channel_path,
+                                                             info['capacity_mAh'])
+    
+    def poll(self, final=False):
+        """
+        모든 채널을 한 번 확인하고 새 데이터 이벤트를 구독자에게 전달
+        
+        final=True면 기록 중으로 보류하던 마지막 사이클도 전달합니다 (flush()).
+        
+        Returns:
+        --------
+        list : 이번 polling의 이벤트
+        """
+        if self._polls % max(self.rescan_every, 1) == 0:
+            self._discover()
+        first = self._polls == 0
+        self._polls += 1
+        
+        events = []
+        for key, state in list(self.channels.items()):
+            start = time.perf_counter()
+            try:
+                reset, summary, profile = state.poll(final)
+                cycles = state.complete_cycles(profile, final)
+            except Exception as e:
+                _log(f"  ⚠️  {key} 추적 실패 - 다음 polling에서 재시도: {e}")
+                continue
+            
+            has_summary = summary is not None and len(summary) > 0
+            if not (reset or has_summary or cycles is not None):
+                continue
+            rows = (len(summary) if has_summary else 0) + (len(cycles.frame) if cycles is not None else 0)
+            _record_channel('follow_channel', key, time.perf_counter() - start, rows=rows)
+            if first and not self.emit_history:
+                continue
+            
+            if self.compact:
+                summary = compact_frame(summary) if has_summary else summary
+                if cycles is not None:
+                    cycles = CycleList(compact_frame(cycles.frame), cycles.offsets, cycles.cycle_numbers)
+            events.append({'channel': key, 'cycler_type': state.cycler_type, 'reset': reset,
+                           'cycle_summary': summary if has_summary else None,
+                           'cycles': cycles, 'timestamp': time.time()})
+        
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for event in events:
+            for callback in subscribers:
+                try:
+                    callback(event)
+                except Exception as e:
+                    _log(f"  ⚠️  follow 구독자 오류 ({event['channel']}): {e}")
+        return events
+    
+    def flush(self):
+        """남은 데이터를 읽고 보류 중인 마지막 사이클까지 끝난 것으로 보고 전달 (시험 종료 시)"""
+        return self.poll(final=True)
+    
+    def run(self):
+        """stop()이 호출될 때까지 interval마다 poll() (현재 스레드에서 실행)"""
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(self.interval)
+    
+    def start(self):
+        """백그라운드 스레드에서 추적 시작"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        # start()를 호출한 곳의 instrument() 설정(quiet 등)을 추적 스레드에서도 사용
+        self._thread = threading.Thread(target=contextvars.copy_context().run, args=(self.run,),
+                                        name='LiveFollower', daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self, timeout=None):
+        """추적 중지 (진행 중인 polling이 끝날 때까지 대기)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+# ============================================================================
+# 지연 로딩 채널 (메모리 한도)
+# ============================================================================
+
+def _frame_nbytes(value):
+    """DataFrame / CycleList / DataFrame list의 메모리 사용량 (bytes, 얕은 계산)"""
+    if value is None:
+        return 0
+    if isinstance(value, CycleList):
+        return int(value.frame.memory_usage(index=True).sum()) + value.offsets.nbytes
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, list):
+        return sum(_frame_nbytes(item) for item in value)
+    return 0
+
+
+def _load_raw_channel_unit(cycler_type, channel_path, unit, compact=False, toyo_max_cycles=3):
+    """원시 파일에서 채널의 로딩 단위 하나 읽기 ('cycle' 또는 'profile')"""
+    if unit == 'profile':
+        if cycler_type == 'PNE':
+            df = load_pne_profile_data(channel_path, compact=compact)
+        else:
+            df = load_toyo_profile_history(
+                channel_path, cycles=_toyo_cycle_selection(toyo_max_cycles), compact=compact)
+        return {'profile': df if df is not None and not df.empty else None}
+    
+    if cycler_type == 'PNE':
+        cycle_df = load_pne_cycle_data(channel_path, compact=compact)
+        if cycle_df is None or cycle_df.empty:
+            return {'cycle': None, 'cycle_summary': None, 'cycle_steps': None}
+        return _pne_cycle_fields(cycle_df)
+    
+    cycle_df = load_toyo_cycle_data(channel_path, compact=compact)
+    return {'cycle': cycle_df if cycle_df is not None and not cycle_df.empty else None}
+
+
+def _load_columnar_unit(root, channel_key, channels_meta, unit):
+    """컬럼형 저장소에서 채널의 데이터 타입 하나 읽기"""
+    df = read_channel_frame(root, channel_key, unit, _meta=channels_meta)
+    if unit == 'profile' and df is not None and channels_meta[channel_key]['profile_format'] == 'cycle_list':
+        df = CycleList.from_frame(df)
+    return {unit: df}
+
+
+class LazyChannelData(MutableMapping):
+    """
+    지연 로딩되는 채널 항목 (dict 인터페이스)
+    
+    cycler_type, channel_name, cycle_list 같은 가벼운 값은 항상 메모리에 두고,
+    DataFrame 필드는 처음 접근할 때 로딩 단위(unit)별로 읽습니다. 메모리 관리는
+    소속된 LazyChannels가 담당합니다.
+    """
+    
+    def __init__(self, owner, key, light, field_units, loader):
+        self._owner = owner
+        self.key = key
+        self._light = dict(light)
+        self._order = list(light.keys()) + [f for f in field_units if f not in light]
+        self._field_units = dict(field_units)
+        self._loader = loader
+        self._frames = {}
+        self._loaded_units = set()
+        self._persistent_units = set()
+        self._spilled = {}
+    
+    def _unit_fields(self, unit):
+        return [f for f, u in self._field_units.items() if u == unit]
+    
+    def is_loaded(self, field):
+        """field가 현재 메모리에 올라와 있는지 (로딩하지 않고 확인)"""
+        return field in self._light or self._field_units.get(field) in self._loaded_units
+    
+    def __getitem__(self, field):
+        if field in self._field_units:
+            self._owner._ensure_loaded(self, self._field_units[field])
+            return self._frames.get(field)
+        return self._light[field]
+    
+    def __setitem__(self, field, value):
+        if field in self._field_units:
+            unit = self._field_units[field]
+            if len(self._unit_fields(unit)) > 1:
+                self._owner._ensure_loaded(self, unit)
+            else:
+                self._loaded_units.add(unit)
+            self._frames[field] = value
+            # 대입된 데이터는 원본에서 다시 읽을 수 없으므로 제거 시 디스크로 내보냄
+            self._persistent_units.add(unit)
+            self._spilled.pop(unit, None)
+            self._owner._account(self, unit)
+            return
+        if field not in self._order:
+            self._order.append(field)
+        self._light[field] = value
+    
+    def __delitem__(self, field):
+        if field in self._field_units:
+            raise KeyError(f"DataFrame 필드 '{field}'는 삭제할 수 없습니다. None을 대입하세요.")
+        del self._light[field]
+        self._order.remove(field)
+    
+    def __contains__(self, field):
+        return field in self._order
+    
+    def __iter__(self):
+        return iter(self._order)
+    
+    def __len__(self):
+        return len(self._order)
+    
+    def __repr__(self):
+        loaded = [f for f in self._field_units if self.is_loaded(f)]
+        return f"LazyChannelData({self.key!r}, loaded={loaded})"
 
 
-def save_data(data, filepath=None):
-    """통합 데이터를 Pickle 파일로 저장"""
-    if filepath is None:
-        filename = _generate_filename_from_metadata(data)
-        filepath = f"{filename}.pkl"
+class LazyChannels(MutableMapping):
+    """
+    메모리 한도가 있는 지연 로딩 채널 dict (data['channels'] 대체)
+    
+    채널의 DataFrame은 처음 접근할 때 로딩되며, 로딩된 데이터가 memory_budget_mb를
+    넘으면 가장 오래 사용하지 않은 로딩 단위부터 메모리에서 내립니다.
+    원본 파일/저장소에서 다시 읽을 수 있는 데이터는 그냥 버리고, 대입되거나
+    처리된 데이터(process_all_channels의 cycle list 등)는 spill_dir에 pickle로
+    내보냈다가 다음 접근 때 다시 읽습니다.
+    """
     
-    print(f"💾 데이터 저장 중: {filepath}")
+    def __init__(self, memory_budget_mb=1024, spill_dir=None):
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        if spill_dir is None:
+            spill_dir = tempfile.mkdtemp(prefix='battery_spill_')
+            self._cleanup = weakref.finalize(self, shutil.rmtree, spill_dir, True)
+        else:
+            os.makedirs(spill_dir, exist_ok=True)
+        self.spill_dir = spill_dir
+        self._entries = {}
+        self._lru = OrderedDict()
+        self._loaded_total = 0
+        self._spill_ids = {}
     
-    with open(filepath, 'wb') as f:
-        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    def register(self, key, light, field_units, loader):
+        """원본에서 읽을 채널 등록 (loader(unit) -> {field: DataFrame})"""
+        self._entries[key] = LazyChannelData(self, key, light, field_units, loader)
+        self._spill_ids[key] = len(self._spill_ids)
+        return self._entries[key]
     
-    file_size = os.path.getsize(filepath) / (1024 * 1024)
-    print(f"✅ 저장 완료! 파일: {filepath} ({file_size:.2f} MB)")
+    @property
+    def loaded_nbytes(self):
+        """현재 메모리에 올라온 DataFrame 크기 합 (bytes)"""
+        return self._loaded_total
     
-    return filepath
+    def _ensure_loaded(self, entry, unit):
+        """로딩 단위를 메모리에 올리고 LRU 순서 갱신"""
+        lru_key = (entry.key, unit)
+        if unit in entry._loaded_units:
+            if lru_key in self._lru:
+                self._lru.move_to_end(lru_key)
+            return
+        
+        if unit in entry._spilled:
+            with open(entry._spilled[unit], 'rb') as f:
+                values = pickle.load(f)
+        elif entry._loader is not None:
+            values = entry._loader(unit)
+        else:
+            values = {}
+        
+        for field in entry._unit_fields(unit):
+            entry._frames[field] = values.get(field)
+        entry._loaded_units.add(unit)
+        self._account(entry, unit)
+    
+    def _account(self, entry, unit):
+        """
+        로딩 단위 크기 기록 후 메모리 한도 적용 (같은 채널은 내리지 않음)
+        
+        로딩/대입으로 바뀐 단위만 다시 측정하고 합계는 누적값으로 갱신합니다.
+        """
+        lru_key = (entry.key, unit)
+        nbytes = sum(_frame_nbytes(entry._frames.get(f)) for f in entry._unit_fields(unit))
+        self._loaded_total += nbytes - self._lru.get(lru_key, 0)
+        self._lru[lru_key] = nbytes
+        self._lru.move_to_end(lru_key)
+        if self._loaded_total <= self.memory_budget:
+            return
+        
+        for key, loaded_unit in list(self._lru):
+            if self._loaded_total <= self.memory_budget:
+                break
+            if key != entry.key:
+                self._evict(self._entries[key], loaded_unit)
+    
+    def _evict(self, entry, unit):
+        """로딩 단위를 메모리에서 내림 (대입된 데이터는 spill_dir에 저장)"""
+        fields = entry._unit_fields(unit)
+        if unit in entry._persistent_units:
+            spill_path = os.path.join(self.spill_dir, f"{self._spill_ids[entry.key]}_{unit}.pkl")
+            with open(spill_path, 'wb') as f:
+                pickle.dump({field: entry._frames.get(field) for field in fields}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            entry._spilled[unit] = spill_path
+        
+        for field in fields:
+            entry._frames.pop(field, None)
+        entry._loaded_units.discard(unit)
+        self._loaded_total -= self._lru.pop((entry.key, unit), 0)
+    
+    def evict_all(self):
+        """로딩된 모든 데이터를 메모리에서 내림"""
+        for key, unit in list(self._lru):
+            self._evict(self._entries[key], unit)
+    
+    def __getitem__(self, key):
+        return self._entries[key]
+    
+    def __setitem__(self, key, value):
+        if isinstance(value, LazyChannelData):
+            self._entries[key] = value
+            self._spill_ids.setdefault(key, len(self._spill_ids))
+            return
+        
+        cycler_type = value.get('cycler_type')
+        frame_fields = CHANNEL_FRAME_FIELDS.get(cycler_type, ())
+        light = {k: v for k, v in value.items() if k not in frame_fields}
+        entry = self.register(key, light, {field: field for field in frame_fields}, None)
+        for field in frame_fields:
+            entry[field] = value.get(field)
+    
+    def __delitem__(self, key):
+        entry = self._entries.pop(key)
+        for unit in list(entry._loaded_units):
+            self._loaded_total -= self._lru.pop((key, unit), 0)
+    
+    def __iter__(self):
+        return iter(self._entries)
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __repr__(self):
+        return (f"LazyChannels({len(self)}개 채널, 로딩 {self.loaded_nbytes / (1024 * 1024):.1f} MB"
+                f" / 한도 {self.memory_budget / (1024 * 1024):.0f} MB)")
 
 
-def load_data(filepath):
-    """Pickle 파일에서 데이터 로드"""
-    print(f"📂 데이터 로드 중: {filepath}")
+def process_and_combine_lazy(paths, memory_budget_mb=1024, spill_dir=None, compact=False,
+                             toyo_max_cycles=3):
+    """
+    채널 데이터를 읽지 않고 등록만 하는 지연 로딩 버전의 process_and_combine()
     
-    with open(filepath, 'rb') as f:
-        data = pickle.load(f)
+    data['channels']는 LazyChannels이며, 각 채널의 DataFrame은 처음 접근할 때
+    원시 파일에서 읽습니다. get_cycle_summary(), process_all_channels(),
+    categorize_all_channels() 등 기존 함수를 그대로 사용할 수 있습니다.
     
-    channels_count = len(data['channels'])
-    print(f"✅ 로드 완료! 채널 수: {channels_count}")
+    Parameters:
+    -----------
+    paths : list of str
+        분석할 경로 리스트
+    memory_budget_mb : float
+        로딩된 DataFrame이 차지할 수 있는 메모리 한도 (MB)
+    spill_dir : str, optional
+        처리된 데이터를 내보낼 디렉토리 (None이면 임시 디렉토리)
+    compact : bool
+        True면 로딩 시 compact_frame() 적용
+    toyo_max_cycles : int or None
+        Toyo 채널에서 읽을 프로파일 사이클 파일 수 (None이면 전체 이력)
+    """
+    channels = LazyChannels(memory_budget_mb, spill_dir)
+    
+    for path in paths:
+        info = get_directory_info(path)
+        if not info['exists']:
+            _log(f"  ⚠️  경로가 존재하지 않습니다: {path}")
+            continue
+        
+        cycler_type = info['cycler_type']
+        if cycler_type == 'PNE':
+            channel_folders = find_pne_channel_folders(path)
+        else:
+            channel_folders = find_toyo_channel_folders(path)
+        
+        for channel_path in channel_folders:
+            key, entry = _new_channel_entry(cycler_type, info, os.path.basename(channel_path))
+            frame_fields = CHANNEL_FRAME_FIELDS[cycler_type]
+            light = {k: v for k, v in entry.items() if k not in frame_fields}
+            field_units = {field: 'profile' if field == 'profile' else 'cycle' for field in frame_fields}
+            channels.register(key, light, field_units,
+                              partial(_load_raw_channel_unit, cycler_type, channel_path,
+                                      compact=compact, toyo_max_cycles=toyo_max_cycles))
+    
+    _log(f"🔋 지연 로딩 채널 등록: {len(channels)}개 (메모리 한도 {memory_budget_mb} MB)")
+    
+    return _build_combined_result(paths, channels)
+
+
+def load_columnar_lazy(root, memory_budget_mb=1024, spill_dir=None):
+    """
+    컬럼형 저장소를 지연 로딩 채널 dict로 열기
+    
+    데이터 타입(cycle, cycle_summary, cycle_steps, profile)마다 처음 접근할 때
+    해당 Parquet 파일만 읽습니다.
+    """
+    _require_pyarrow()
+    
+    stored = _read_columnar_metadata(root)
+    channels_meta = stored['channels']
+    channels = LazyChannels(memory_budget_mb, spill_dir)
+    
+    for channel_key, meta in channels_meta.items():
+        light = {k: v for k, v in meta.items()
+                 if k not in ('partition', 'data_types', 'profile_format')}
+        frame_fields = CHANNEL_FRAME_FIELDS.get(meta['cycler_type'], COLUMNAR_DATA_TYPES)
+        channels.register(channel_key, light, {field: field for field in frame_fields},
+                          partial(_load_columnar_unit, root, channel_key, channels_meta))
+    
+    _log(f"📂 컬럼형 저장소 지연 로딩: {root} (채널 {len(channels)}개, "
+          f"메모리 한도 {memory_budget_mb} MB)")
+    
+    return {'metadata': stored['metadata'], 'channels': channels}
+
+
+# ============================================================================
+# 실험 카탈로그 (SQLite)
+# ============================================================================
+
+_CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS folders (
+    folder_id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    folder_name TEXT NOT NULL,
+    cycler_type TEXT,
+    capacity_mAh REAL,
+    n_channels INTEGER,
+    scanned_at REAL
+);
+CREATE TABLE IF NOT EXISTS channels (
+    channel_id INTEGER PRIMARY KEY,
+    folder_id INTEGER NOT NULL REFERENCES folders(folder_id) ON DELETE CASCADE,
+    channel_key TEXT NOT NULL,
+    channel_name TEXT NOT NULL,
+    channel_path TEXT NOT NULL,
+    cycler_type TEXT,
+    capacity_mAh REAL,
+    n_cycles INTEGER,
+    first_cycle INTEGER,
+    last_cycle INTEGER,
+    initial_capacity_mAh REAL,
+    last_capacity_mAh REAL,
+    retention REAL,
+    source_size INTEGER,
+    source_mtime REAL,
+    updated_at REAL,
+    UNIQUE (folder_id, channel_key)
+);
+CREATE TABLE IF NOT EXISTS cycle_summary (
+    channel_id INTEGER NOT NULL REFERENCES channels(channel_id) ON DELETE CASCADE,
+    cycle INTEGER NOT NULL,
+    capacity_mAh REAL,
+    chg_capacity_mAh REAL,
+    retention REAL,
+    ocv_mV REAL,
+    temp_C REAL,
+    PRIMARY KEY (channel_id, cycle)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_channels_folder ON channels(folder_id);
+CREATE INDEX IF NOT EXISTS idx_channels_retention ON channels(retention);
+CREATE INDEX IF NOT EXISTS idx_channels_capacity ON channels(capacity_mAh, cycler_type);
+CREATE INDEX IF NOT EXISTS idx_cycle_summary_cycle ON cycle_summary(cycle, retention);
+CREATE INDEX IF NOT EXISTS idx_cycle_summary_retention ON cycle_summary(retention);
+"""
+
+_CATALOG_SUMMARY_COLUMNS = ['cycle', 'capacity_mAh', 'chg_capacity_mAh', 'retention', 'ocv_mV', 'temp_C']
+
+
+def _catalog_source_file(cycler_type, channel_path):
+    """
+    카탈로그에 쓰는 사이클 파일 (PNE: 이름에 SaveEndData가 있는 파일, Toyo: capacity.log)
+    
+    PNE는 load_pne_cycle_data()와 같은 파일을 고르며, 없으면 None입니다.
+    """
+    if cycler_type == 'PNE':
+        restore_path = os.path.join(channel_path, 'Restore')
+        if not os.path.isdir(restore_path):
+            return None
+        end_data_file, _ = _pne_restore_files(restore_path)
+        return os.path.join(restore_path, end_data_file) if end_data_file else None
+    return os.path.join(channel_path, 'capacity.log')
+
+
+def _catalog_cycle_rows(cycler_type, cycle_df):
+    """
+    사이클 데이터에서 카탈로그용 사이클 요약 행 생성 (사이클당 1행)
+    
+    PNE는 Condition == 8 행의 방전 용량, Toyo는 방전(Condition == 2) 행의
+    Capacity_mAh를 사용합니다. retention은 첫 유효(>0) 용량 대비 비율입니다.
+    """
+    if cycle_df is None or cycle_df.empty:
+        return pd.DataFrame(columns=_CATALOG_SUMMARY_COLUMNS)
+    
+    if cycler_type == 'PNE':
+        df = cycle_df[cycle_df['Condition'] == 8]
+        rows = pd.DataFrame({'cycle': df['Cycle'], 'capacity_mAh': df['DchgCap_mAh'],
+                             'chg_capacity_mAh': df['ChgCap_mAh'], 'ocv_mV': df['OCV_mV'],
+                             'temp_C': df['Temp_C']})
+    else:
+        df = cycle_df
+        if 'Condition' in df.columns and (df['Condition'] == 2).any():
+            df = df[df['Condition'] == 2]
+        rows = pd.DataFrame({'cycle': df['Cycle'], 'capacity_mAh': df['Capacity_mAh'],
+                             'chg_capacity_mAh': np.nan, 'ocv_mV': df['OCV_V'] * 1000,
+                             'temp_C': df['Temp_C']})
+    
+    rows = rows.dropna(subset=['cycle']).drop_duplicates('cycle', keep='last')
+    rows['cycle'] = rows['cycle'].astype(np.int64)
+    rows = rows.sort_values('cycle', kind='stable')
+    
+    valid = rows['capacity_mAh'][rows['capacity_mAh'] > 0]
+    initial = valid.iloc[0] if len(valid) else np.nan
+    rows['retention'] = rows['capacity_mAh'] / initial
+    return rows[_CATALOG_SUMMARY_COLUMNS].reset_index(drop=True)
+
+
+def _sql_value(value):
+    """numpy/pandas 값 → sqlite3 값 (NaN은 NULL)"""
+    if value is None:
+        return None
+    if isinstance(value, (np.integer,)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return None if np.isnan(value) else float(value)
+    return value
+
+
+class ExperimentCatalog:
+    """
+    실험 폴더/채널/사이클 요약을 SQLite에 색인하는 카탈로그
+    
+    원시 CSV는 update()에서 사이클 파일(SaveEndData.csv / capacity.log)만
+    읽으며, 파일 크기/수정 시각이 그대로인 채널은 다시 읽지 않습니다.
+    이후 조회는 원시 파일 없이 색인된 테이블만 사용합니다.
+    채널 키는 process_and_combine()의 data['channels'] 키와 같습니다.
+    
+    테이블:
+    - folders: path, folder_name, cycler_type, capacity_mAh, n_channels
+    - channels: channel_key, channel_name, cycler_type, capacity_mAh, n_cycles,
+      initial_capacity_mAh, last_capacity_mAh, retention (마지막 사이클 기준)
+    - cycle_summary: channel_id, cycle, capacity_mAh, chg_capacity_mAh, retention, ocv_mV, temp_C
+    
+    Example:
+    --------
+    >>> with ExperimentCatalog('battery_catalog.sqlite') as catalog:
+    ...     catalog.update(paths)
+    ...     catalog.channels_below_retention(0.8)
+    """
+    
+    def __init__(self, db_path='battery_catalog.sqlite'):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(_CATALOG_SCHEMA)
+    
+    def close(self):
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+        return False
+    
+    def update(self, paths=None):
+        """
+        폴더 색인 추가/갱신
+        
+        Parameters:
+        -----------
+        paths : list of str, optional
+            색인할 실험 폴더 (None이면 이미 색인된 폴더만 다시 확인)
+        
+        Returns:
+        --------
+        dict : {'folders', 'channels_updated', 'channels_unchanged', 'channels_removed', 'cycles'}
+        """
+        known = [row[0] for row in self.conn.execute("SELECT path FROM folders")]
+        paths = list(dict.fromkeys(known + list(paths or [])))
+        stats = {'folders': 0, 'channels_updated': 0, 'channels_unchanged': 0,
+                 'channels_removed': 0, 'cycles': 0}
+        
+        _log("=" * 70)
+        _log(f"🗂️  카탈로그 갱신: {self.db_path}")
+        _log("=" * 70)
+        
+        with self.conn:
+            for path in paths:
+                self._update_folder(path, stats)
+        
+        _log(f"  폴더 {stats['folders']}개, 갱신 채널 {stats['channels_updated']}개 "
+             f"(변경 없음 {stats['channels_unchanged']}개, 삭제 {stats['channels_removed']}개), "
+             f"사이클 {stats['cycles']:,}행")
+        return stats
+    
+    def _update_folder(self, path, stats):
+        """폴더 하나 색인 (사라진 폴더/채널은 삭제)"""
+        info = get_directory_info(path)
+        if not info['exists']:
+            _log(f"  ⚠️  경로가 존재하지 않아 색인에서 제거: {path}")
+            self.conn.execute("DELETE FROM folders WHERE path = ?", (path,))
+            return
+        
+        cycler_type = info['cycler_type']
+        if cycler_type == 'PNE':
+            channel_folders = find_pne_channel_folders(path)
+        else:
+            channel_folders = find_toyo_channel_folders(path)
+        
+        self.conn.execute(
+            "INSERT INTO folders (path, folder_name, cycler_type, capacity_mAh, n_channels, scanned_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(path) DO UPDATE SET "
+            "folder_name = excluded.folder_name, cycler_type = excluded.cycler_type, "
+            "capacity_mAh = excluded.capacity_mAh, n_channels = excluded.n_channels, "
+            "scanned_at = excluded.scanned_at",
+            (path, info['folder_name'], cycler_type, info['capacity_mAh'],
+             len(channel_folders), time.time()))
+        folder_id = self.conn.execute("SELECT folder_id FROM folders WHERE path = ?",
+                                      (path,)).fetchone()[0]
+        stats['folders'] += 1
+        _log(f"  📁 {info['folder_name']} ({cycler_type}, 채널 {len(channel_folders)}개)")
+        
+        existing = {row[0]: (row[1], row[2], row[3]) for row in self.conn.execute(
+            "SELECT channel_key, channel_id, source_size, source_mtime FROM channels "
+            "WHERE folder_id = ?", (folder_id,))}
+        seen = set()
+        
+        for channel_path in channel_folders:
+            key, entry = _new_channel_entry(cycler_type, info, os.path.basename(channel_path))
+            seen.add(key)
+            source = _catalog_source_file(cycler_type, channel_path)
+            if source is not None and os.path.isfile(source):
+                state = _file_state(source)
+            else:
+                state = {'size': None, 'mtime': None}
+            
+            if key in existing and existing[key][1:] == (state['size'], state['mtime']):
+                stats['channels_unchanged'] += 1
+                continue
+            
+            if cycler_type == 'PNE':
+                cycle_df = load_pne_cycle_data(channel_path)
+            else:
+                cycle_df = load_toyo_cycle_data(channel_path)
+            rows = _catalog_cycle_rows(cycler_type, cycle_df)
+            self._store_channel(folder_id, key, entry, channel_path, state, rows,
+                                existing.get(key, (None,))[0])
+            stats['channels_updated'] += 1
+            stats['cycles'] += len(rows)
+        
+        for key in set(existing) - seen:
+            self.conn.execute("DELETE FROM channels WHERE channel_id = ?", (existing[key][0],))
+            stats['channels_removed'] += 1
+    
+    def _store_channel(self, folder_id, key, entry, channel_path, state, rows, channel_id=None):
+        """채널 행과 사이클 요약 행 교체"""
+        valid = rows[rows['capacity_mAh'] > 0]
+        values = (
+            folder_id, key, entry['channel_name'], channel_path, entry['cycler_type'],
+            entry['capacity_mAh'], len(rows),
+            int(rows['cycle'].iloc[0]) if len(rows) else None,
+            int(rows['cycle'].iloc[-1]) if len(rows) else None,
+            _sql_value(valid['capacity_mAh'].iloc[0]) if len(valid) else None,
+            _sql_value(rows['capacity_mAh'].iloc[-1]) if len(rows) else None,
+            _sql_value(rows['retention'].iloc[-1]) if len(rows) else None,
+            state['size'], state['mtime'], time.time(),
+        )
+        columns = ("folder_id, channel_key, channel_name, channel_path, cycler_type, capacity_mAh, "
+                   "n_cycles, first_cycle, last_cycle, initial_capacity_mAh, last_capacity_mAh, "
+                   "retention, source_size, source_mtime, updated_at")
+        
+        if channel_id is None:
+            cursor = self.conn.execute(
+                f"INSERT INTO channels ({columns}) VALUES ({', '.join('?' * len(values))})", values)
+            channel_id = cursor.lastrowid
+        else:
+            assignments = ', '.join(f"{name.strip()} = ?" for name in columns.split(','))
+            self.conn.execute(f"UPDATE channels SET {assignments} WHERE channel_id = ?",
+                              values + (channel_id,))
+            self.conn.execute("DELETE FROM cycle_summary WHERE channel_id = ?", (channel_id,))
+        
+        self.conn.executemany(
+            "INSERT INTO cycle_summary (channel_id, cycle, capacity_mAh, chg_capacity_mAh, "
+            "retention, ocv_mV, temp_C) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((channel_id, int(row[0])) + tuple(_sql_value(v) for v in row[1:])
+             for row in rows[['cycle', 'capacity_mAh', 'chg_capacity_mAh', 'retention',
+                              'ocv_mV', 'temp_C']].itertuples(index=False)))
+    
+    def query(self, sql, params=()):
+        """임의 SQL 조회 결과를 DataFrame으로 반환"""
+        return pd.read_sql_query(sql, self.conn, params=params)
+    
+    def folders(self):
+        """색인된 폴더 목록"""
+        return self.query("SELECT * FROM folders ORDER BY folder_name")
+    
+    def channels(self, cycler_type=None, capacity_mAh=None, folder_name=None):
+        """
+        채널 목록 (조건은 모두 선택)
+        
+        Returns:
+        --------
+        pd.DataFrame : channels 테이블 + folder_name
+        """
+        conditions, params = [], []
+        for column, value in (('c.cycler_type', cycler_type), ('c.capacity_mAh', capacity_mAh),
+                              ('f.folder_name', folder_name)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.query(
+            "SELECT c.*, f.folder_name FROM channels c JOIN folders f USING (folder_id) "
+            f"{where} ORDER BY c.channel_key", params)
+    
+    def channels_below_retention(self, threshold=0.8, cycle=None):
+        """
+        용량 유지율이 threshold 미만인 채널
+        
+        Parameters:
+        -----------
+        threshold : float
+            기준 유지율 (0.8 = 80%)
+        cycle : int, optional
+            이 사이클의 유지율로 판단 (None이면 마지막 사이클)
+        """
+        if cycle is None:
+            return self.query(
+                "SELECT c.channel_key, f.folder_name, c.cycler_type, c.capacity_mAh, "
+                "c.last_cycle AS cycle, c.retention FROM channels c JOIN folders f USING (folder_id) "
+                "WHERE c.retention < ? ORDER BY c.retention", (threshold,))
+        return self.query(
+            "SELECT c.channel_key, f.folder_name, c.cycler_type, c.capacity_mAh, s.cycle, s.retention "
+            "FROM cycle_summary s JOIN channels c USING (channel_id) JOIN folders f USING (folder_id) "
+            "WHERE s.cycle = ? AND s.retention < ? ORDER BY s.retention", (int(cycle), threshold))
+    
+    def cycle_summary(self, channel_keys=None, cycles=None):
+        """
+        사이클 요약 행 조회
+        
+        Parameters:
+        -----------
+        channel_keys : list of str, optional
+            채널 키 (None이면 전체)
+        cycles : tuple, optional
+            (시작, 끝) 사이클 범위 (양 끝 포함)
+        """
+        conditions, params = [], []
+        if channel_keys is not None:
+            channel_keys = list(channel_keys)
+            conditions.append(f"c.channel_key IN ({', '.join('?' * len(channel_keys))})")
+            params.extend(channel_keys)
+        if cycles is not None:
+            conditions.append("s.cycle BETWEEN ? AND ?")
+            params.extend([int(cycles[0]), int(cycles[1])])
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.query(
+            "SELECT c.channel_key, s.cycle, s.capacity_mAh, s.chg_capacity_mAh, s.retention, "
+            "s.ocv_mV, s.temp_C FROM cycle_summary s JOIN channels c USING (channel_id) "
+            f"{where} ORDER BY c.channel_key, s.cycle", params)
+
+
+# ============================================================================
+# 배치 실행 (샤딩 / 체크포인트)
+# ============================================================================
+
+# 작업 디렉토리 구성
+#   job.json                  경로 목록, 샤드 구성, 로딩 옵션
+#   claims/<샤드>.json        처리 중인 샤드 (호스트, pid) - 주기적으로 mtime 갱신
+#   checkpoints/<샤드>/*.pkl  샤드 처리 중 완료된 채널 항목 (manifest 포함)
+#   results/<샤드>.pkl        샤드 결과 (save_data 형식)
+#   done/<샤드>.json          샤드 완료 기록 (채널 수, 실패 채널)
+_BATCH_JOB_FILE = 'job.json'
+
+# 이 시간(초) 동안 갱신되지 않은 claim은 중단된 것으로 보고 다른 worker가 가져감
+_BATCH_STALE_AFTER = 600
+
+
+def find_tester_folders(root):
+    """root 바로 아래에서 채널 폴더가 있는 시험 폴더(PNE/Toyo) 목록"""
+    folders = []
+    for item in sorted(os.listdir(root)):
+        path = os.path.join(root, item)
+        if not os.path.isdir(path):
+            continue
+        if check_cycler(path) == 'PNE':
+            has_channels = bool(find_pne_channel_folders(path))
+        else:
+            has_channels = bool(find_toyo_channel_folders(path))
+        if has_channels:
+            folders.append(path)
+    return folders
+
+
+def _shard_name(shard_id):
+    return f"{shard_id:04d}"
+
+
+def _write_atomic(path, payload):
+    """같은 디렉토리의 임시 파일에 쓴 뒤 교체 (읽는 쪽은 완성된 파일만 봄)"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_json_atomic(path, value):
+    _write_atomic(path, json.dumps(value, ensure_ascii=False, indent=2,
+                                   default=_json_default).encode('utf-8'))
+
+
+def _read_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def create_batch_job(job_dir, paths=None, root=None, shard_size=4, compact=False,
+                     toyo_max_cycles=3, process=False):
+    """
+    배치 작업 디렉토리 생성 (이미 있으면 기존 작업 설정을 그대로 사용)
+    
+    여러 머신이 같은 명령으로 동시에 시작해도 job.json은 한 번만 만들어집니다.
+    
+    Parameters:
+    -----------
+    job_dir : str
+        작업 디렉토리 (공유 파일 시스템)
+    paths : list of str, optional
+        처리할 시험 폴더 경로
+    root : str, optional
+        시험 폴더들의 상위 폴더 (find_tester_folders로 paths에 추가)
+    shard_size : int
+        샤드 하나에 넣을 시험 폴더 수
+    compact, toyo_max_cycles :
+        process_battery_data()와 동일
+    process : bool
+        True면 샤드마다 process_all_channels / categorize_all_channels까지 실행
+    
+    Returns:
+    --------
+    dict : 작업 설정 (job.json 내용)
+    """
+    job_path = os.path.join(job_dir, _BATCH_JOB_FILE)
+    if os.path.exists(job_path):
+        return _read_json(job_path)
+    
+    paths = [os.path.abspath(path) for path in (paths or [])]
+    if root is not None:
+        paths.extend(find_tester_folders(os.path.abspath(root)))
+    paths = list(dict.fromkeys(paths))
+    if not paths:
+        raise ValueError("처리할 경로가 없습니다 (paths 또는 root 지정)")
+    if shard_size < 1:
+        raise ValueError(f"shard_size는 1 이상이어야 합니다: {shard_size}")
+    
+    job = {
+        'paths': paths,
+        'shards': [paths[i:i + shard_size] for i in range(0, len(paths), shard_size)],
+        'options': {'compact': compact, 'toyo_max_cycles': toyo_max_cycles, 'process': process},
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    for sub in ('claims', 'checkpoints', 'results', 'done'):
+        os.makedirs(os.path.join(job_dir, sub), exist_ok=True)
+    
+    # job.json은 링크로 만들어 먼저 만든 쪽만 성공 (나머지는 기존 설정 사용)
+    fd, tmp_path = tempfile.mkstemp(dir=job_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False, indent=2)
+        try:
+            os.link(tmp_path, job_path)
+        except FileExistsError:
+            return _read_json(job_path)
+    finally:
+        os.remove(tmp_path)
+    
+    _log(f"🗂️  배치 작업 생성: {job_dir} ({len(paths)}개 경로, 샤드 {len(job['shards'])}개)")
+    return job
+
+
+def _claim_owner():
+    return {'host': socket.gethostname(), 'pid': os.getpid()}
+
+
+def _claim_is_stale(claim_path, stale_after):
+    """claim이 오래 갱신되지 않았거나, 같은 호스트의 프로세스가 이미 종료되었는지"""
+    try:
+        age = time.time() - os.path.getmtime(claim_path)
+        owner = _read_json(claim_path)
+    except (OSError, ValueError):
+        return False
+    if age > stale_after:
+        return True
+    if owner.get('host') == socket.gethostname() and owner.get('pid') != os.getpid():
+        try:
+            os.kill(owner['pid'], 0)
+        except ProcessLookupError:
+            return True
+        except (OSError, KeyError, TypeError):
+            return False
+    return False
+
+
+def _try_claim(claim_path, stale_after):
+    """
+    샤드 claim 획득 (O_EXCL 생성)
+    
+    중단된 claim은 고유한 이름으로 rename한 뒤 (한 worker만 성공) 다시 생성합니다.
+    """
+    for _ in range(2):
+        try:
+            fd = os.open(claim_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if not _claim_is_stale(claim_path, stale_after):
+                return False
+            owner = _claim_owner()
+            stale_path = f"{claim_path}.{owner['host']}.{owner['pid']}.stale"
+            try:
+                os.rename(claim_path, stale_path)
+            except FileNotFoundError:
+                return False
+            if not _claim_is_stale(stale_path, stale_after):
+                # 확인과 rename 사이에 다른 worker가 새로 가져간 claim - 되돌림
+                with contextlib.suppress(FileExistsError):
+                    os.link(stale_path, claim_path)
+                os.remove(stale_path)
+                return False
+            os.remove(stale_path)
+            _log(f"  ↻ 중단된 claim 회수: {os.path.basename(claim_path)}")
+            continue
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({**_claim_owner(), 'claimed_at': time.strftime('%Y-%m-%dT%H:%M:%S')}, f)
+        return True
+    return False
+
+
+class _ClaimHeartbeat:
+    """샤드 처리 중 claim 파일 mtime을 주기적으로 갱신하는 daemon 스레드"""
+    
+    def __init__(self, claim_path, interval):
+        self.claim_path = claim_path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='batch-heartbeat', daemon=True)
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            with contextlib.suppress(OSError):
+                os.utime(self.claim_path)
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def _shard_previous_channels(job_dir, name):
+    """
+    샤드의 이전 채널 항목 (results 파일 + checkpoint)
+    
+    증분 로딩의 previous로 사용하여 파일이 바뀌지 않은 채널은 다시 파싱하지 않습니다.
+    """
+    previous = {}
+    result_path = os.path.join(job_dir, 'results', f"{name}.pkl")
+    if os.path.exists(result_path):
+        with open(result_path, 'rb') as f:
+            previous.update(pickle.load(f)['channels'])
     
+    checkpoint_dir = os.path.join(job_dir, 'checkpoints', name)
+    if os.path.isdir(checkpoint_dir):
+        for entry in sorted(os.listdir(checkpoint_dir)):
+            if not entry.endswith('.pkl'):
+                continue
+            path = os.path.join(checkpoint_dir, entry)
+            try:
+                with open(path, 'rb') as f:
+                    key, channel_data = pickle.load(f)
+            except (pickle.UnpicklingError, EOFError, ValueError):
+                os.remove(path)
+                continue
+            previous[key] = channel_data
+    return previous
+
+
+def _checkpoint_file(key):
+    """채널 키를 checkpoint 파일 이름으로 (경로 구분자 제거, 키는 파일 내용에 저장)"""
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]
+    return f"{re.sub(r'[^0-9A-Za-z_.-]+', '_', key)}-{digest}.pkl"
+
+
+def _run_shard(job_dir, shard_id, paths, options, workers=-1, use_processes=True):
+    """
+    샤드 하나 처리: 채널마다 checkpoint를 남기며 로딩 → (선택) 처리/분류 → 결과 저장
+    
+    Returns:
+    --------
+    dict : 완료 기록 (done/<샤드>.json 내용)
+    """
+    name = _shard_name(shard_id)
+    checkpoint_dir = os.path.join(job_dir, 'checkpoints', name)
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    previous = _shard_previous_channels(job_dir, name)
+    if previous:
+        _log(f"  ♻️ 이전 채널 {len(previous)}개 재사용 (변경된 파일만 다시 파싱)")
+    
+    async def checkpoint(key, channel_data, error):
+        if error is not None:
+            return
+        if channel_data.get('manifest') == previous.get(key, {}).get('manifest'):
+            return
+        payload = pickle.dumps((key, channel_data), protocol=pickle.HIGHEST_PROTOCOL)
+        await asyncio.to_thread(_write_atomic, os.path.join(checkpoint_dir, _checkpoint_file(key)),
+                                payload)
+    
+    start = time.perf_counter()
+    df_results, loaded_data = asyncio.run(aprocess_battery_data(
+        paths, workers=workers, use_processes=use_processes, previous=previous,
+        compact=options['compact'], toyo_max_cycles=options['toyo_max_cycles'],
+        on_channel=checkpoint))
+    data = _build_combined_result(paths, loaded_data)
+    if options['process']:
+        process_all_channels(data)
+        categorize_all_channels(data)
+    
+    _write_atomic(os.path.join(job_dir, 'results', f"{name}.pkl"),
+                  pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+    failed = [{'path': info['path'], **failure}
+              for info in df_results.to_dict('records') for failure in info['failed_channels']]
+    done = {
+        'shard': shard_id,
+        'paths': paths,
+        'channels': len(loaded_data),
+        'failed_channels': failed,
+        'wall_s': time.perf_counter() - start,
+        **_claim_owner(),
+        'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    _write_json_atomic(os.path.join(job_dir, 'done', f"{name}.json"), done)
+    shutil.rmtree(checkpoint_dir, ignore_errors=True)
+    return done
+
+
+def run_batch_job(job_dir, workers=-1, use_processes=True, stale_after=_BATCH_STALE_AFTER,
+                  max_shards=None, retry_failed=False):
+    """
+    배치 작업의 남은 샤드를 가져가며 처리 (여러 머신/프로세스에서 동시에 실행 가능)
+    
+    샤드마다 claim 파일을 O_EXCL로 만들어 한 worker만 처리하고, 처리 중에는
+    채널 단위 checkpoint를 남기므로 중단된 실행은 마지막 채널부터 이어집니다.
+    중단된 worker의 claim은 stale_after초 뒤 (같은 호스트면 프로세스 종료 즉시)
+    다른 worker가 가져갑니다. 결과 파일은 원자적으로 교체되므로 드물게 같은 샤드를
+    두 번 처리해도 결과는 같습니다.
+    
+    Parameters:
+    -----------
+    job_dir : str
+        create_batch_job()으로 만든 작업 디렉토리
+    workers, use_processes :
+        샤드 안의 채널 로딩 worker 수 / 프로세스 풀 사용 여부 (aprocess_battery_data,
+        기본 -1: CPU 코어 수, None 또는 1: 한 채널씩)
+    stale_after : float
+        claim을 중단된 것으로 보는 시간 (초)
+    max_shards : int, optional
+        이번 실행에서 처리할 최대 샤드 수
+    retry_failed : bool
+        True면 실패 채널이 있는 완료 샤드도 다시 처리 (성공한 채널은 재사용)
+    
+    Returns:
+    --------
+    dict : {'processed': [샤드 번호], 'failed_channels': [실패 채널 기록]}
+    """
+    job = _read_json(os.path.join(job_dir, _BATCH_JOB_FILE))
+    summary = {'processed': [], 'failed_channels': []}
+    
+    for shard_id, paths in enumerate(job['shards']):
+        if max_shards is not None and len(summary['processed']) >= max_shards:
+            break
+        name = _shard_name(shard_id)
+        done_path = os.path.join(job_dir, 'done', f"{name}.json")
+        if os.path.exists(done_path):
+            if not (retry_failed and _read_json(done_path)['failed_channels']):
+                continue
+        
+        claim_path = os.path.join(job_dir, 'claims', f"{name}.json")
+        if not _try_claim(claim_path, stale_after):
+            continue
+        
+        try:
+            # claim 획득 전에 다른 worker가 끝냈을 수 있음
+            if os.path.exists(done_path) and not retry_failed:
+                continue
+            _log(f"\n📦 샤드 {name} ({len(paths)}개 경로) 처리 시작")
+            with _ClaimHeartbeat(claim_path, max(stale_after / 4, 1.0)):
+                done = _run_shard(job_dir, shard_id, paths, job['options'], workers, use_processes)
+        except Exception as e:
+            _log(f"  ❌ 샤드 {name} 처리 실패: {e!r} (다음 실행에서 checkpoint부터 재시도)")
+            summary['failed_channels'].append({'shard': shard_id, 'error': repr(e)})
+            continue
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(claim_path)
+        
+        summary['processed'].append(shard_id)
+        summary['failed_channels'].extend(done['failed_channels'])
+        _log(f"  ✅ 샤드 {name} 완료: {done['channels']}개 채널, {done['wall_s']:.1f}s"
+             + (f", 실패 {len(done['failed_channels'])}개" if done['failed_channels'] else ""))
+    
+    return summary
+
+
+def batch_job_status(job_dir, stale_after=_BATCH_STALE_AFTER):
+    """
+    샤드별 진행 상태
+    
+    Returns:
+    --------
+    pd.DataFrame : 샤드당 1행 (shard, state, paths, channels, checkpoints, failed, host)
+        state는 'pending', 'running', 'stale', 'done', 'failed' (실패 채널이 있는 완료)
+    """
+    job = _read_json(os.path.join(job_dir, _BATCH_JOB_FILE))
+    rows = []
+    for shard_id, paths in enumerate(job['shards']):
+        name = _shard_name(shard_id)
+        done_path = os.path.join(job_dir, 'done', f"{name}.json")
+        claim_path = os.path.join(job_dir, 'claims', f"{name}.json")
+        checkpoint_dir = os.path.join(job_dir, 'checkpoints', name)
+        row = {'shard': shard_id, 'state': 'pending', 'paths': len(paths), 'channels': 0,
+               'checkpoints': len([f for f in os.listdir(checkpoint_dir) if f.endswith('.pkl')])
+               if os.path.isdir(checkpoint_dir) else 0,
+               'failed': 0, 'host': None}
+        if os.path.exists(done_path):
+            done = _read_json(done_path)
+            row.update(state='failed' if done['failed_channels'] else 'done',
+                       channels=done['channels'], failed=len(done['failed_channels']),
+                       host=done['host'])
+        elif os.path.exists(claim_path):
+            with contextlib.suppress(OSError, ValueError):
+                row['host'] = _read_json(claim_path)['host']
+            row['state'] = 'stale' if _claim_is_stale(claim_path, stale_after) else 'running'
+        rows.append(row)
+    return pd.DataFrame(rows, columns=['shard', 'state', 'paths', 'channels', 'checkpoints',
+                                       'failed', 'host'])
+
+
+def merge_batch_results(job_dir, output=None, format='pickle'):
+    """
+    완료된 샤드 결과를 process_and_combine() 형식 하나로 합치기
+    
+    채널 항목의 manifest가 유지되므로 결과를 process_and_combine_incremental()의
+    previous로 사용할 수 있습니다.
+    
+    Parameters:
+    -----------
+    output : str, optional
+        저장 경로 (주어지면 save_data(data, output, format))
+    """
+    job = _read_json(os.path.join(job_dir, _BATCH_JOB_FILE))
+    channels, missing = {}, []
+    for shard_id in range(len(job['shards'])):
+        result_path = os.path.join(job_dir, 'results', f"{_shard_name(shard_id)}.pkl")
+        if not os.path.exists(os.path.join(job_dir, 'done', f"{_shard_name(shard_id)}.json")):
+            missing.append(shard_id)
+            continue
+        with open(result_path, 'rb') as f:
+            channels.update(pickle.load(f)['channels'])
+    
+    if missing:
+        _log(f"⚠️  완료되지 않은 샤드 {len(missing)}개 제외: {missing}")
+    data = _build_combined_result(job['paths'], channels)
+    if output is not None:
+        save_data(data, output, format)
     return data
 
 
@@ -861,9 +7037,83 @@ load_from_pickle = load_data
 
 
 # ============================================================================
-# 테스트 코드
+# 명령줄 실행
 # ============================================================================
 
+def main(argv=None):
+    """
+    배치 실행 CLI
+    
+    사용법:
+        python battery_data_processor.py batch JOB_DIR --root /data/testers --shard-size 8 --workers 8
+        python battery_data_processor.py batch JOB_DIR path1 path2 ...
+        python battery_data_processor.py status JOB_DIR
+        python battery_data_processor.py merge JOB_DIR combined.pkl
+    
+    같은 JOB_DIR(공유 파일 시스템)로 여러 머신에서 batch를 실행하면 샤드를 나누어
+    처리하며, 중단 후 같은 명령을 다시 실행하면 완료된 채널부터 이어서 처리합니다.
+    """
+    parser = argparse.ArgumentParser(description="배터리 데이터 배치 처리")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    batch = commands.add_parser('batch', help="샤드를 가져가며 처리 (작업이 없으면 생성)")
+    batch.add_argument('job_dir', help="작업 디렉토리 (공유 파일 시스템)")
+    batch.add_argument('paths', nargs='*', help="시험 폴더 경로")
+    batch.add_argument('--root', default=None, help="시험 폴더들의 상위 폴더")
+    batch.add_argument('--shard-size', type=int, default=4, help="샤드당 시험 폴더 수")
+    batch.add_argument('--workers', type=int, default=-1,
+                       help="샤드 안의 채널 로딩 worker 수 (-1: CPU 코어 수)")
+    batch.add_argument('--threads', action='store_true', help="프로세스 풀 대신 스레드 풀 사용")
+    batch.add_argument('--compact', action='store_true', help="로딩한 DataFrame에 compact_frame 적용")
+    batch.add_argument('--toyo-max-cycles', type=int, default=3,
+                       help="Toyo 프로파일 사이클 파일 수 (0 이하면 전체 이력)")
+    batch.add_argument('--process', action='store_true',
+                       help="샤드마다 cycle list 처리 및 카테고리화까지 실행")
+    batch.add_argument('--csv-backend', default=None, choices=CSV_BACKENDS, help="CSV 파서 백엔드")
+    batch.add_argument('--stale-after', type=float, default=_BATCH_STALE_AFTER,
+                       help="claim을 중단된 것으로 보는 시간 (초)")
+    batch.add_argument('--max-shards', type=int, default=None, help="이번 실행에서 처리할 최대 샤드 수")
+    batch.add_argument('--retry-failed', action='store_true', help="실패 채널이 있는 샤드 다시 처리")
+    
+    status = commands.add_parser('status', help="샤드별 진행 상태")
+    status.add_argument('job_dir')
+    
+    merge = commands.add_parser('merge', help="완료된 샤드 결과 합치기")
+    merge.add_argument('job_dir')
+    merge.add_argument('output', help="저장 경로")
+    merge.add_argument('--format', default='pickle', choices=['pickle', 'columnar'])
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'status':
+        table = batch_job_status(args.job_dir)
+        print(table.to_string(index=False))
+        print("\n" + ", ".join(f"{state}: {count}" for state, count in table['state'].value_counts().items()))
+        return 0
+    
+    if args.command == 'merge':
+        merge_batch_results(args.job_dir, args.output, args.format)
+        return 0
+    
+    create_batch_job(args.job_dir, args.paths, args.root, args.shard_size, args.compact,
+                     args.toyo_max_cycles if args.toyo_max_cycles > 0 else None, args.process)
+    if args.csv_backend is not None:
+        set_csv_backend(args.csv_backend)
+    summary = run_batch_job(args.job_dir, workers=args.workers, use_processes=not args.threads,
+                            stale_after=args.stale_after, max_shards=args.max_shards,
+                            retry_failed=args.retry_failed)
+    
+    table = batch_job_status(args.job_dir, args.stale_after)
+    _log("\n" + "=" * 70)
+    _log(f"📋 이번 실행: 샤드 {len(summary['processed'])}개 처리, "
+         f"실패 {len(summary['failed_channels'])}건")
+    _log("   " + ", ".join(f"{state}: {count}" for state, count in table['state'].value_counts().items()))
+    _log("=" * 70)
+    return 1 if summary['failed_channels'] else 0
+
+
 if __name__ == "__main__":
-    print("배터리 데이터 처리 통합 모듈")
-    print("이 모듈을 import하여 사용하세요.")
+    # 결과 pickle의 클래스(CycleList 등)가 __main__이 아닌 모듈 이름으로 저장되도록
+    # import한 모듈의 main을 실행
+    import battery_data_processor
+    sys.exit(battery_data_processor.main())
@@ -0,0 +1,28 @@
+"""테스트 공용 합성 데이터 (battery_benchmark의 PNE 트리 생성기 사용)"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import battery_benchmark
+import battery_data_processor as bdp
+
+
+@pytest.fixture(scope='session')
+def fleet_root(tmp_path_factory):
+    """RPT / 저항 측정 / 가속 수명 사이클이 모두 있는 2채널 PNE 트리"""
+    root = str(tmp_path_factory.mktemp('fleet') / 'FLEET_PNE_4500mAh')
+    return battery_benchmark.write_pne_tree(root, n_channels=2, n_cycles=210, points_per_step=8,
+                                            seed=7)
+
+
+@pytest.fixture
+def fleet_data(fleet_root):
+    """fleet_root를 로딩 + process_all_channels + categorize_all_channels한 data (테스트마다 새로)"""
+    with bdp.instrument(quiet=True):
+        data = bdp.process_and_combine([fleet_root])
+        bdp.process_all_channels(data)
+        bdp.categorize_all_channels(data)
+    return data
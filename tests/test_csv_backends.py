@@ -0,0 +1,91 @@
+"""pyarrow / numeric CSV 백엔드의 로딩 결과를 기준 pandas 파서와 비교"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import battery_benchmark
+import battery_data_processor as bdp
+
+
+# 원시 파일 중간에 끼워 넣을 잘못된 줄 (정상 행 하나를 받아 변형)
+FAULTS = {
+    'malformed': lambda row: b'### power failure ###',
+    'short': lambda row: b','.join(row.split(b',')[:5]),
+    'long': lambda row: row + b',0,0',
+    'quote': lambda row: b'"' + row,
+}
+
+
+def _inject(path, fault, at=2):
+    with open(path, 'rb') as f:
+        lines = f.read().split(b'\n')
+    lines.insert(at, FAULTS[fault](lines[at]))
+    with open(path, 'wb') as f:
+        f.write(b'\n'.join(lines))
+
+
+def _add_korean_column(path):
+    """cp949로 인코딩된 한글 열 추가 (Toyo 장비의 메모 열)"""
+    with open(path, 'rb') as f:
+        lines = f.read().rstrip(b'\n').split(b'\n')
+    rows = [lines[0] + ',비고'.encode('cp949')]
+    rows += [line + (',충전' if i % 2 else ',방전').encode('cp949')
+             for i, line in enumerate(lines[1:])]
+    with open(path, 'wb') as f:
+        f.write(b'\n'.join(rows) + b'\n')
+
+
+@pytest.fixture(params=[None] + list(FAULTS))
+def raw_channels(request, tmp_path):
+    """(PNE 채널 경로, Toyo 채널 경로) - Toyo는 cp949 한글 열 포함, fault가 있으면 주입"""
+    pne = battery_benchmark.write_pne_tree(str(tmp_path / 'CSV_PNE_4500mAh'), n_channels=1,
+                                           n_cycles=5, points_per_step=5)
+    toyo = battery_benchmark.write_toyo_tree(str(tmp_path / 'CSV_Toyo_4500mAh'), n_channels=1,
+                                             n_cycles=3, points_per_step=5)
+    pne_channel = os.path.join(pne, 'M01Ch001[001]')
+    toyo_channel = os.path.join(toyo, '1')
+    for name in ('capacity.log', 'cycle_00002.csv'):
+        _add_korean_column(os.path.join(toyo_channel, name))
+
+    if request.param is not None:
+        for path in (os.path.join(pne_channel, 'Restore', 'SaveEndData.csv'),
+                     os.path.join(pne_channel, 'Restore', 'SaveData0002.csv'),
+                     os.path.join(toyo_channel, 'capacity.log'),
+                     os.path.join(toyo_channel, 'cycle_00002.csv')):
+            _inject(path, request.param)
+    return pne_channel, toyo_channel
+
+
+def _load_all(pne_channel, toyo_channel, backend):
+    with bdp.instrument(quiet=True), bdp.csv_backend(backend):
+        return {
+            'pne_cycle': bdp.load_pne_cycle_data(pne_channel),
+            'pne_profile': bdp.load_pne_profile_data(pne_channel),
+            'toyo_cycle': bdp.load_toyo_cycle_data(toyo_channel),
+            'toyo_history': bdp.load_toyo_profile_history(toyo_channel),
+            'toyo_raw': bdp.load_toyo_profile_data(toyo_channel, max_cycles=None),
+        }
+
+
+@pytest.mark.parametrize('backend', ['pyarrow', 'numeric'])
+def test_loaders_match_pandas_backend(raw_channels, backend):
+    expected = _load_all(*raw_channels, 'pandas')
+    actual = _load_all(*raw_channels, backend)
+    for name, frame in expected.items():
+        if frame is None:
+            assert actual[name] is None, name
+        else:
+            pd.testing.assert_frame_equal(actual[name], frame, obj=name)
+
+
+@pytest.mark.parametrize('backend', bdp.CSV_BACKENDS)
+def test_cp949_text_is_decoded(backend):
+    source = '사이클,상태,전압\n1,충전,4.2\n2,방전,3.0\n3,휴지\n4,충전,4.2,0\n'.encode('cp949')
+    df = bdp.read_raw_csv(source, backend=backend)
+    pd.testing.assert_frame_equal(df, bdp.read_raw_csv(source, backend='pandas'))
+    assert list(df.columns) == ['사이클', '상태', '전압']
+    assert df['상태'].tolist() == ['충전', '방전', '휴지']
@@ -0,0 +1,92 @@
+"""compute_dcir() 벡터화 결과를 펄스별 반복문 계산과 비교"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import battery_data_processor as bdp
+
+
+def _interp_or_nan(offset, elapsed, values):
+    if not elapsed[0] <= offset <= elapsed[-1]:
+        return np.nan
+    return np.interp(offset, elapsed, values)
+
+
+def _reference_dcir(data, category, offsets_s, min_step_crate):
+    """사이클마다 행을 순회하며 경계/펄스를 찾고 펄스마다 np.interp로 계산"""
+    records = []
+    for channel_key, channel_data in data['channels'].items():
+        cycle_list = channel_data['profile']
+        mincapa = bdp._channel_mincapa(channel_data['cycle'], channel_data['capacity_mAh'])
+        if category is None:
+            indices = range(len(cycle_list))
+        else:
+            indices = channel_data['cycle_list'].get(category) or []
+        for index in indices:
+            start, end = cycle_list.offsets[index], cycle_list.offsets[index + 1]
+            frame = cycle_list.frame.iloc[start:end]
+            time = frame['time_cyc'].to_numpy(dtype=float)
+            voltage = frame['Voltage_V'].to_numpy(dtype=float)
+            current = frame['Current_mA'].to_numpy(dtype=float)
+            steptime = frame['Steptime_s'].to_numpy(dtype=float)
+            step = frame['step'].to_numpy(dtype=float)
+
+            bounds, pulses = [], []
+            for row in range(1, len(frame)):
+                jump = abs(current[row] - current[row - 1]) >= min_step_crate * abs(mincapa)
+                step_changed = (step[row] != step[row - 1] and not np.isnan(step[row])
+                                and not np.isnan(step[row - 1]))
+                if jump or step_changed or steptime[row] < steptime[row - 1]:
+                    bounds.append(row)
+                if jump:
+                    pulses.append(row)
+            bounds.append(len(frame))
+
+            for pulse, first in enumerate(pulses):
+                last = next(b for b in bounds if b > first)
+                before = first - 1
+                if 0 <= steptime[first] <= time[first] - time[before] + 1e-6:
+                    start_s = time[first] - steptime[first]
+                else:
+                    start_s = time[before]
+                elapsed = np.round(time[first:last] - start_s, 6)
+                if abs(current[first]) < min_step_crate * abs(mincapa):
+                    direction = 'rest'
+                else:
+                    direction = 'charge' if current[first] > 0 else 'discharge'
+
+                for offset in sorted(offsets_s):
+                    v_t = _interp_or_nan(offset, elapsed, voltage[first:last])
+                    i_t = _interp_or_nan(offset, elapsed, current[first:last])
+                    d_v, d_i = v_t - voltage[before], i_t - current[before]
+                    records.append({
+                        'channel': channel_key, 'cycle_index': index,
+                        'Cycle': cycle_list.cycle_numbers[index], 'pulse': pulse,
+                        'step': step[first], 'direction': direction, 'start_s': start_s,
+                        'I0_mA': current[before], 'V0_mV': voltage[before],
+                        'offset_s': float(offset), 'I_mA': i_t, 'V_mV': v_t,
+                        'dI_mA': d_i, 'dV_mV': d_v,
+                        'R_mOhm': d_v / d_i * 1000 if d_i != 0 else np.nan,
+                    })
+    return pd.DataFrame(records, columns=bdp.DCIR_COLUMNS)
+
+
+@pytest.mark.parametrize('category, offsets_s, min_step_crate', [
+    ('Resistance_Measurement', (0.1, 1.0, 10.0), 0.05),
+    ('Resistance_Measurement', (10.0, 0.1, 3.0, 30.0), 0.2),
+    (None, (0.1, 10.0), 0.05),
+])
+def test_dcir_matches_per_pulse_loop(fleet_data, category, offsets_s, min_step_crate):
+    result = bdp.compute_dcir(fleet_data, category=category, offsets_s=offsets_s,
+                              min_step_crate=min_step_crate)
+    expected = _reference_dcir(fleet_data, category, offsets_s, min_step_crate)
+
+    assert len(expected) > 0
+    assert result['R_mOhm'].notna().any()
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected,
+                                  check_dtype=False, rtol=1e-9)
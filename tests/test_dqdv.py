@@ -0,0 +1,39 @@
+"""compute_dqdv() 채널 캐시가 호출마다 같은 grid / 최신 입력으로 계산되는지 확인"""
+import numpy as np
+
+import battery_data_processor as bdp
+
+
+def _subset(data, keys):
+    """채널 dict를 공유하는 부분 data (채널 캐시도 공유)"""
+    return {'channels': {key: data['channels'][key] for key in keys}}
+
+
+def _assert_same(result, expected):
+    assert result['curves'].equals(expected['curves'])
+    for name in ('voltage_mV', 'Q_mAh', 'dQdV', 'capacity_mAh', 'V_mV', 'dVdQ'):
+        np.testing.assert_allclose(result[name], expected[name], rtol=1e-9, atol=1e-9)
+
+
+def test_cached_channels_follow_the_batch_grid(fleet_data):
+    first, second = list(fleet_data['channels'])
+    frame = fleet_data['channels'][second]['profile'].frame
+    frame['Voltage_V'] = frame['Voltage_V'] + 12.0
+    
+    alone = [bdp.compute_dqdv(_subset(fleet_data, [key])) for key in (first, second)]
+    assert alone[0]['voltage_mV'][-1] != alone[1]['voltage_mV'][-1]
+    
+    both = bdp.compute_dqdv(_subset(fleet_data, [first, second]))
+    expected = bdp.compute_dqdv(_subset(fleet_data, [first, second]), use_cache=False)
+    _assert_same(both, expected)
+
+
+def test_changed_values_with_same_row_count_are_recomputed(fleet_data):
+    before = bdp.compute_dqdv(fleet_data)
+    for channel_data in fleet_data['channels'].values():
+        frame = channel_data['profile'].frame
+        frame['Voltage_V'] = frame['Voltage_V'] + 1.0
+    
+    after = bdp.compute_dqdv(fleet_data)
+    _assert_same(after, bdp.compute_dqdv(fleet_data, use_cache=False))
+    assert not np.allclose(after['Q_mAh'], before['Q_mAh'], equal_nan=True)
@@ -0,0 +1,67 @@
+"""compute_fleet_metrics() 채널별 fit을 채널마다 np.polyfit으로 계산한 결과와 비교"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import battery_benchmark
+import battery_data_processor as bdp
+
+
+@pytest.fixture(scope='module')
+def mixed_data(fleet_root, tmp_path_factory):
+    """fleet_root(PNE) + Toyo 트리를 함께 로딩한 data"""
+    toyo = battery_benchmark.write_toyo_tree(str(tmp_path_factory.mktemp('fleet_toyo')
+                                                 / 'FLEET_Toyo_4500mAh'),
+                                             n_channels=2, n_cycles=80, points_per_step=5, seed=3)
+    with bdp.instrument(quiet=True):
+        return bdp.process_and_combine([fleet_root, toyo], toyo_max_cycles=2)
+
+
+def _reference_channel(panel, eol_retention):
+    """채널 하나 (Cycle 순) - pandas 연산과 np.polyfit"""
+    dchg = panel['DchgCap_mAh'].to_numpy(dtype=float)
+    initial = dchg[dchg > 0][0] if (dchg > 0).any() else np.nan
+    retention = np.where(dchg > 0, dchg / initial, np.nan)
+    cycle = panel['Cycle'].to_numpy(dtype=float)
+    valid = ~np.isnan(retention)
+
+    row = {'cycles': len(panel), 'initial_capacity_mAh': initial,
+           'last_retention': retention[valid][-1] if valid.any() else np.nan}
+    for name, x in (('linear', cycle), ('sqrt', np.sqrt(cycle))):
+        slope, intercept = np.polyfit(x[valid], retention[valid], 1)
+        row[f'{name}_slope'] = slope
+        row[f'{name}_intercept'] = intercept
+        row[f'{name}_r2'] = np.corrcoef(x[valid], retention[valid])[0, 1] ** 2
+    row['fit_points'] = int(valid.sum())
+    row['eol_cycle'] = ((eol_retention - row['linear_intercept']) / row['linear_slope']
+                        if row['linear_slope'] < 0 else np.nan)
+    return row
+
+
+def test_panel_cycler_types(mixed_data):
+    panel = bdp.build_cycle_panel(mixed_data)
+    assert list(panel['cycler_type'].cat.categories) == list(bdp.CYCLER_TYPES)
+    for channel_key, rows in panel.groupby('channel', observed=True):
+        expected = mixed_data['channels'][channel_key]['cycler_type']
+        assert set(rows['cycler_type']) == {expected}
+    assert set(panel['cycler_type']) == {'PNE', 'Toyo'}
+
+
+@pytest.mark.parametrize('eol_retention', [0.8, 0.99])
+def test_fade_fit_matches_polyfit(mixed_data, eol_retention):
+    result = bdp.compute_fleet_metrics(mixed_data, eol_retention=eol_retention)
+    panel = result['panel']
+
+    expected = pd.DataFrame([
+        {'channel': channel_key, **_reference_channel(rows, eol_retention)}
+        for channel_key, rows in panel.groupby('channel', observed=True, sort=False)
+    ])
+    actual = result['channels'][expected.columns].reset_index(drop=True)
+    actual['channel'] = actual['channel'].astype(object)
+    assert len(expected) == len(mixed_data['channels'])
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, rtol=1e-7)
@@ -0,0 +1,92 @@
+"""resample_cycles() 배치 보간 결과를 사이클마다 np.interp로 계산한 결과와 비교"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import battery_data_processor as bdp
+
+
+def _reference_curve(cycle, x, normalize):
+    """사이클 DataFrame 하나의 x축 (보간할 수 없으면 None)"""
+    cycle = cycle[cycle['time_s'].notna()]
+    if len(cycle) < 2:
+        return None, None
+    time_s = cycle['time_s'].to_numpy(dtype=float)
+    elapsed = np.maximum.accumulate(time_s - time_s[0])
+    if x == 'time':
+        values = elapsed
+    else:
+        dq = np.abs(cycle['Current_mA'].to_numpy(dtype=float)) * np.diff(elapsed, prepend=0.0) / 3600
+        values = np.cumsum(np.nan_to_num(dq))
+    if normalize:
+        if values[-1] <= 0:
+            return None, None
+        values = values / values[-1]
+    return cycle, values
+
+
+def _reference_resample(data, result, categories, cycles, x, normalize, align):
+    """채널마다 선택 사이클을 하나씩 꺼내 열별로 np.interp"""
+    grid = result['grid']
+    columns = result['columns']
+    expected = np.full(result['values'].shape, np.nan)
+    cycle_axis = np.unique(result['cycles'][~np.isnan(result['cycles'])])
+
+    for position, channel_key in enumerate(result['channels']):
+        channel_data = data['channels'][channel_key]
+        cycle_list = channel_data['profile']
+        if categories is None:
+            indices = list(range(len(cycle_list)))
+        else:
+            indices = sorted({i for category in categories
+                              for i in channel_data['cycle_list'].get(category) or []})
+        if cycles is not None:
+            indices = indices[cycles]
+
+        for ordinal, index in enumerate(indices):
+            number = cycle_list.cycle_numbers[index]
+            slot = ordinal if align == 'ordinal' else int(np.searchsorted(cycle_axis, number))
+            assert result['cycle_index'][position, slot] == index
+            start, end = cycle_list.offsets[index], cycle_list.offsets[index + 1]
+            cycle, x_values = _reference_curve(cycle_list.frame.iloc[start:end], x, normalize)
+            if cycle is None:
+                continue
+            outside = (grid < x_values[0]) | (grid > x_values[-1])
+            for c, column in enumerate(columns):
+                curve = np.interp(grid, x_values, cycle[column].to_numpy(dtype=float))
+                curve[outside] = np.nan
+                expected[c, position, slot] = curve
+    return expected
+
+
+@pytest.mark.parametrize('categories, cycles', [
+    (('RPT',), None),
+    (None, slice(95, 130)),
+])
+@pytest.mark.parametrize('x, normalize', [
+    ('time', True),
+    ('time', False),
+    ('capacity', True),
+    ('capacity', False),
+])
+@pytest.mark.parametrize('align', bdp.RESAMPLE_ALIGNS)
+def test_resample_matches_per_cycle_interp(fleet_data, categories, cycles, x, normalize, align):
+    result = bdp.resample_cycles(fleet_data, categories=categories, cycles=cycles, x=x,
+                                 grid=64, normalize=normalize, align=align, dtype=np.float64)
+    expected = _reference_resample(fleet_data, result, categories, cycles, x, normalize, align)
+
+    assert np.isfinite(result['values']).any()
+    np.testing.assert_allclose(result['values'], expected, rtol=1e-9, atol=1e-9)
+
+
+def test_resample_explicit_grid_float32(fleet_data):
+    grid = np.array([0.0, 0.05, 0.3, 0.3, 0.9, 1.0])
+    result = bdp.resample_cycles(fleet_data, grid=grid, columns=('Voltage_V', 'Temp_C'))
+    expected = _reference_resample(fleet_data, result, ('RPT',), None, 'time', True, 'ordinal')
+
+    assert result['values'].dtype == np.float32
+    np.testing.assert_allclose(result['values'], expected, rtol=1e-6)
@@ -0,0 +1,65 @@
+"""iter_pne_profile_chunks() 스트리밍 결과를 전체 로딩 결과와 비교"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import battery_benchmark
+import battery_data_processor as bdp
+
+
+@pytest.fixture(scope='module')
+def pne_tree(tmp_path_factory):
+    root = str(tmp_path_factory.mktemp('stream') / 'STREAM_PNE_4500mAh')
+    return battery_benchmark.write_pne_tree(root, n_channels=1, n_cycles=40, points_per_step=20)
+
+
+def _reference_labels(root, rules):
+    """load + process_all_channels + categorize_all_channels의 사이클별 라벨"""
+    with bdp.instrument(quiet=True):
+        data = bdp.process_and_combine([root])
+        bdp.process_all_channels(data)
+        bdp.categorize_all_channels(data, rules=rules)
+    channel_data = next(iter(data['channels'].values()))
+    labels = np.empty(len(channel_data['profile']), dtype=object)
+    for category, indices in channel_data['cycle_list'].items():
+        labels[list(indices)] = category
+    return labels
+
+
+def _streamed_labels(channel_path, rules, chunk_bytes):
+    labels = []
+    with bdp.instrument(quiet=True):
+        for frame in bdp.iter_pne_profile_chunks(channel_path, chunk_bytes, rules=rules,
+                                                 categorize=True):
+            cycles = frame['Cycle'].to_numpy()
+            starts = np.concatenate(([0], np.flatnonzero(cycles[1:] != cycles[:-1]) + 1))
+            labels.extend(frame['category'].to_numpy()[starts])
+    return np.array(labels, dtype=object)
+
+
+@pytest.mark.parametrize('rules', [
+    None,
+    [{'category': 'RPT', 'conditions': [('cycle_index', '<', 3)]}],
+])
+@pytest.mark.parametrize('chunk_bytes', [2_000, 20_000, 1 << 24])
+def test_streamed_labels_match_full_categorization(pne_tree, rules, chunk_bytes):
+    channel_path = os.path.join(pne_tree, 'M01Ch001[001]')
+    expected = _reference_labels(pne_tree, rules)
+    streamed = _streamed_labels(channel_path, rules, chunk_bytes)
+    assert streamed.tolist() == expected.tolist()
+
+
+def test_streamed_frames_match_full_profile(pne_tree):
+    channel_path = os.path.join(pne_tree, 'M01Ch001[001]')
+    with bdp.instrument(quiet=True):
+        data = bdp.process_and_combine([pne_tree])
+        bdp.process_all_channels(data)
+        frames = list(bdp.iter_pne_profile_chunks(channel_path, 2_000))
+    full = next(iter(data['channels'].values()))['profile'].frame
+    streamed = bdp.pd.concat(frames)
+    assert len(frames) > 1
+    bdp.pd.testing.assert_frame_equal(streamed, full[streamed.columns], check_dtype=False)